@@ -0,0 +1,33 @@
+"""
+Gunicorn settings for projectapprovalsystem.
+
+    gunicorn projectapprovalsystem.wsgi    (picked up from the working directory)
+
+GUNICORN_ASGI=True serves projectapprovalsystem.asgi through uvicorn workers
+instead, which the student status stream (Server-Sent Events) needs; under
+WSGI the dashboards fall back to polling.
+
+Every worker warms the similarity engine (model, dummy batch, approved
+corpus) in a background thread right after it forks, and /ready/ answers
+503 until that is done. On servers where this hook does not run, the first
+/ready/ probe starts the warm-up instead. torch is not fork-safe, so the
+model is never loaded in the master even when preload_app is on -
+preloading only shares Django's imports.
+"""
+import os
+
+# bind and workers keep gunicorn's defaults ($PORT, $WEB_CONCURRENCY)
+preload_app = os.environ.get("GUNICORN_PRELOAD", "False") == "True"
+
+if os.environ.get("GUNICORN_ASGI", "False") == "True":
+    wsgi_app = "projectapprovalsystem.asgi:application"
+    worker_class = "uvicorn_worker.UvicornWorker"
+
+
+def post_fork(server, worker):
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "projectapprovalsystem.settings")
+    import django
+    django.setup()
+
+    from main_app.warmup import warm_in_background
+    warm_in_background()
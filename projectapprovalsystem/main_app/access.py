@@ -0,0 +1,87 @@
+from functools import partial, wraps
+
+from django.conf import settings
+from django.contrib import messages
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.http import HttpResponseForbidden
+from django.shortcuts import redirect
+
+from .models import UserRegistration
+
+
+# -------------------- CURRENT USER --------------------
+# CurrentUserMiddleware puts the signed-in UserRegistration (with its guide)
+# on request.app_user; it is read at most once per request, on first use. A
+# soft-deleted user counts as signed out, whatever their session says.
+#
+# With APP_USER_CACHE_TTL > 0 the row is also kept in the default cache for
+# that many seconds. User saves and the submission pointer updates drop the
+# copy (forget_app_user); a change to the *guide's* row may show for up to
+# the TTL, so keep it short.
+
+CACHE_KEY = "main_app:app_user:{user_id}"
+
+
+def app_user_cache_ttl():
+    return getattr(settings, "APP_USER_CACHE_TTL", 0)
+
+
+def load_app_user(user_id):
+    ttl = app_user_cache_ttl()
+    if ttl:
+        user = cache.get(CACHE_KEY.format(user_id=user_id))
+        if user is not None:
+            return user
+    user = UserRegistration.objects.select_related('assigned_teacher').filter(id=user_id, is_deleted=False).first()
+    if user is not None and ttl:
+        cache.set(CACHE_KEY.format(user_id=user_id), user, ttl)
+    return user
+
+
+def get_app_user(request):
+    """The signed-in UserRegistration, or None. Loaded once per request."""
+    if not hasattr(request, '_app_user'):
+        user_id = request.session.get('user_id')
+        request._app_user = load_app_user(user_id) if user_id else None
+    return request._app_user
+
+
+def forget_app_user(*user_ids):
+    """Drop cached copies now and once the transaction commits (like fragments.bump)."""
+    if not app_user_cache_ttl() or not user_ids:
+        return
+    keys = [CACHE_KEY.format(user_id=user_id) for user_id in user_ids]
+    cache.delete_many(keys)
+    if connection.in_atomic_block:
+        transaction.on_commit(partial(cache.delete_many, keys))
+
+
+# -------------------- ROLE CHECK --------------------
+def role_required(*roles, message="Unauthorized access.", login_message=None, redirect_to='login_page',
+                  forbidden=False):
+    """
+    Let the view run only for a signed-in user with one of ``roles`` (any
+    role when none are given). Signed-out users are sent to the login page
+    with ``login_message`` (``message`` when not given), signed-in users of
+    another role to ``redirect_to`` with ``message``; a message of None
+    flashes nothing. With ``forbidden`` both get a bare 403 (HTML fragments).
+    """
+    if login_message is None:
+        login_message = message
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            user = get_app_user(request)
+            if user is None or (roles and user.role not in roles):
+                if forbidden:
+                    return HttpResponseForbidden()
+                notice, target = (login_message, 'login_page') if user is None else (message, redirect_to)
+                if notice:
+                    messages.error(request, notice)
+                return redirect(target)
+            request.app_user = user  # the instance itself from here on, not the lazy proxy
+            return view(request, *args, **kwargs)
+        return wrapper
+    return decorator
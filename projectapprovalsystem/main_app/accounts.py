@@ -0,0 +1,93 @@
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .access import forget_app_user
+from .fragments import bump_students
+from .models import UserRegistration
+
+
+# -------------------- BULK USER ACTIONS --------------------
+# Used by the admin dashboard's "selected" buttons and the Django admin
+# actions: one statement over the whole selection, however many users it
+# covers. QuerySet.update() sends no post_save, so the dashboard blocks and
+# cached app_user rows that signals.py would refresh are invalidated here.
+# Each returns how many users actually changed.
+
+def _users_changed(user_ids):
+    forget_app_user(*user_ids)
+    # the users' own dashboards, teacher ones included, and their guides'
+    bump_students(user_ids, teacher_ids=user_ids)
+
+
+@transaction.atomic
+def verify_users(user_ids):
+    changed = UserRegistration.objects.filter(id__in=user_ids, is_verified=False, is_deleted=False).update(
+        is_verified=True, verified_at=timezone.now(),
+    )
+    _users_changed(user_ids)
+    return changed
+
+
+@transaction.atomic
+@transaction.atomic
+def reject_users(user_ids):
+    """Remove registrations still awaiting verification; verified accounts are left alone.
+
+    Returns (registrations removed, verified users skipped) so the caller can
+    point the admin at soft delete for the latter.
+    """
+    selected = UserRegistration.objects.filter(id__in=user_ids)
+    skipped = selected.filter(is_verified=True).count()
+    # a single DELETE; its post_delete signals invalidate as for reject_user
+    _, deleted = selected.filter(is_verified=False).delete()
+    return deleted.get(UserRegistration._meta.label, 0), skipped
+
+
+# -------------------- SOFT DELETE / RESTORE --------------------
+# Deleting a teacher unassigns all their students in the same UPDATE that
+# records the teacher as previous_teacher; restoring the teacher puts back
+# every student that has not been given another guide in the meantime.
+
+@transaction.atomic
+def soft_delete_users(user_ids):
+    """Returns (users deleted, students unassigned from deleted teachers)."""
+    now = timezone.now()
+    # lock the rows first: an assign_teacher racing this either commits
+    # before (and is unassigned below) or sees the teacher deleted
+    deleting = list(
+        UserRegistration.objects.select_for_update()
+        .filter(id__in=user_ids, is_deleted=False).values_list('id', 'role')
+    )
+    deleted_ids = [user_id for user_id, _ in deleting]
+    teacher_ids = [user_id for user_id, role in deleting if role == 'teacher']
+    deleted = UserRegistration.objects.filter(id__in=deleted_ids).update(is_deleted=True, deleted_at=now)
+
+    unassigned_ids = []
+    if teacher_ids:
+        students = UserRegistration.objects.filter(assigned_teacher_id__in=teacher_ids)
+        students.update(assigned_teacher=None, previous_teacher=F('assigned_teacher'), unassigned_at=now)
+        unassigned_ids = list(
+            UserRegistration.objects.filter(previous_teacher_id__in=teacher_ids, unassigned_at=now)
+            .values_list('id', flat=True)
+        )
+    _users_changed(deleted_ids + unassigned_ids)
+    return deleted, len(unassigned_ids)
+
+
+@transaction.atomic
+def restore_users(user_ids):
+    """Restore soft-deleted users and reattach the students they guided when deleted."""
+    restoring = list(
+        UserRegistration.objects.select_for_update()
+        .filter(id__in=user_ids, is_deleted=True).values_list('id', flat=True)
+    )
+    restored = UserRegistration.objects.filter(id__in=restoring).update(is_deleted=False, deleted_at=None)
+
+    students = UserRegistration.objects.filter(previous_teacher_id__in=restoring, assigned_teacher=None)
+    reattached_ids = list(students.values_list('id', flat=True))
+    students.filter(id__in=reattached_ids).update(
+        assigned_teacher=F('previous_teacher'), previous_teacher=None, unassigned_at=None,
+    )
+    _users_changed(restoring + reattached_ids)
+    return restored
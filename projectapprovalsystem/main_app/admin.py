@@ -1,3 +1,37 @@
-from django.contrib import admin
+from django.contrib import admin, messages
 
-# Register your models here.
+from .accounts import reject_users, restore_users, verify_users
+from .models import UserRegistration
+
+
+# -------------------- USERS --------------------
+@admin.register(UserRegistration)
+class UserRegistrationAdmin(admin.ModelAdmin):
+    list_display = ('full_name', 'email', 'role', 'is_verified', 'is_deleted', 'assigned_teacher')
+    list_filter = ('role', 'is_verified', 'is_deleted')
+    search_fields = ('full_name', 'email')
+    list_select_related = ('assigned_teacher',)
+    raw_id_fields = ('assigned_teacher',)
+    exclude = ('password',)
+    actions = ('approve_selected', 'reject_selected', 'restore_selected')
+
+    def run_bulk(self, request, queryset, apply, message):
+        count = apply(list(queryset.values_list('id', flat=True)))
+        self.message_user(request, message.format(count=count), messages.SUCCESS)
+
+    @admin.action(description="Approve selected registrations")
+    def approve_selected(self, request, queryset):
+        self.run_bulk(request, queryset, verify_users, "{count} user(s) approved.")
+
+    @admin.action(description="Reject (remove) selected unverified registrations")
+    def reject_selected(self, request, queryset):
+        removed, skipped = reject_users(list(queryset.values_list('id', flat=True)))
+        self.message_user(request, f"{removed} registration(s) rejected and removed.", messages.SUCCESS)
+        if skipped:
+            self.message_user(
+                request, f"{skipped} verified user(s) skipped: delete them instead of rejecting.", messages.WARNING,
+            )
+
+    @admin.action(description="Restore selected deleted users")
+    def restore_selected(self, request, queryset):
+        self.run_bulk(request, queryset, restore_users, "{count} user(s) restored.")
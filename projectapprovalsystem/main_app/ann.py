@@ -0,0 +1,324 @@
+import threading
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+import numpy as np
+from django.conf import settings
+from django.db.models import Count, Max, Q
+
+from .corpus import (
+    corpus_lock,
+    current_corpus,
+    current_version,
+    forget_loaded_corpus,
+    publish_corpus,
+)
+from .embeddings import EMBEDDING_DTYPE, ensure_embeddings
+
+
+# -------------------- IVF INDEX --------------------
+class IVFIndex:
+    """
+    Inverted-file approximate nearest-neighbour index for normalised vectors.
+
+    Vectors are bucketed under the nearest of ``nlist`` spherical k-means
+    centroids; a query only scans the ``nprobe`` closest buckets. Small
+    corpora get a single bucket, which makes the search exact.
+    """
+
+    MIN_POINTS_PER_LIST = 40
+    KMEANS_ITERATIONS = 12
+
+    def __init__(self, nprobe=8, seed=0):
+        self.nprobe = nprobe
+        self.seed = seed
+        self.centroids = None
+        self.trained_size = 0
+        self._ids = []
+        self._vecs = []
+        self._where = {}
+
+    def __len__(self):
+        return len(self._where)
+
+    def __contains__(self, item_id):
+        return item_id in self._where
+
+    # ---- building ----
+    def build(self, ids, vectors):
+        vectors = np.asarray(vectors, dtype=EMBEDDING_DTYPE)
+        ids = np.asarray(ids, dtype=np.int64)
+        self._where = {}
+
+        if not len(ids):
+            self.centroids = None
+            self._ids, self._vecs = [], []
+            self.trained_size = 0
+            return self
+
+        nlist = max(1, min(int(np.sqrt(len(ids))), len(ids) // self.MIN_POINTS_PER_LIST))
+        self.centroids = self._kmeans(vectors, nlist)
+        self.trained_size = len(ids)
+
+        assign = self._assign(vectors)
+        self._ids, self._vecs = [], []
+        for list_no in range(nlist):
+            members = np.flatnonzero(assign == list_no)
+            self._ids.append(ids[members])
+            self._vecs.append(vectors[members])
+            for item_id in ids[members]:
+                self._where[int(item_id)] = list_no
+        return self
+
+    def _kmeans(self, vectors, nlist):
+        rng = np.random.default_rng(self.seed)
+        centroids = vectors[rng.choice(len(vectors), nlist, replace=False)].copy()
+        for _ in range(self.KMEANS_ITERATIONS if nlist > 1 else 0):
+            assign = np.argmax(vectors @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, vectors)
+            empty = ~np.bincount(assign, minlength=nlist).astype(bool)
+            sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()))]
+            centroids = sums / (np.linalg.norm(sums, axis=1, keepdims=True) + 1e-12)
+        return centroids.astype(EMBEDDING_DTYPE)
+
+    def _assign(self, vectors):
+        return np.argmax(np.atleast_2d(vectors) @ self.centroids.T, axis=1)
+
+    # ---- incremental updates ----
+    def add(self, item_id, vector):
+        vector = np.asarray(vector, dtype=EMBEDDING_DTYPE).reshape(1, -1)
+        self.remove(item_id)
+        if self.centroids is None:
+            return self.build([item_id], vector)
+
+        list_no = int(self._assign(vector)[0])
+        self._ids[list_no] = np.append(self._ids[list_no], np.int64(item_id))
+        self._vecs[list_no] = np.vstack([self._vecs[list_no], vector])
+        self._where[int(item_id)] = list_no
+        return self
+
+    def remove(self, item_id):
+        list_no = self._where.pop(int(item_id), None)
+        if list_no is not None:
+            keep = self._ids[list_no] != item_id
+            self._ids[list_no] = self._ids[list_no][keep]
+            self._vecs[list_no] = self._vecs[list_no][keep]
+        return self
+
+    # ---- flat layout (one contiguous slice per bucket), used by corpus.py ----
+    def to_arrays(self):
+        """Return ``(ids, vectors, centroids, offsets)`` with buckets stored back to back."""
+        if self.centroids is None:
+            return (np.zeros(0, dtype=np.int64), np.zeros((0, 0), dtype=EMBEDDING_DTYPE),
+                    np.zeros((0, 0), dtype=EMBEDDING_DTYPE), np.zeros(1, dtype=np.int64))
+        offsets = np.cumsum([0] + [len(chunk) for chunk in self._ids])
+        return np.concatenate(self._ids), np.vstack(self._vecs), self.centroids, offsets
+
+    @classmethod
+    def from_corpus(cls, corpus, **kwargs):
+        """Wrap a (memory-mapped) corpus; buckets are zero-copy slices of it."""
+        index = cls(**kwargs)
+        if not len(corpus.centroids):
+            return index
+        index.centroids = corpus.centroids
+        index.trained_size = corpus.trained_size
+        bounds = list(zip(corpus.offsets[:-1], corpus.offsets[1:]))
+        index._ids = [corpus.ids[a:b] for a, b in bounds]
+        index._vecs = [corpus.vectors[a:b] for a, b in bounds]
+        index._where = {
+            int(item_id): list_no
+            for list_no, chunk in enumerate(index._ids)
+            for item_id in chunk
+        }
+        return index
+
+    @property
+    def needs_rebuild(self):
+        """Buckets drift as the corpus grows; retrain once it has quadrupled."""
+        return len(self) > 4 * max(self.trained_size, self.MIN_POINTS_PER_LIST)
+
+    # ---- search ----
+    def search(self, query, k=10):
+        """Return ``(ids, scores)`` of the ``k`` best cosine matches, best first."""
+        if self.centroids is None or not len(self):
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=EMBEDDING_DTYPE)
+
+        query = np.asarray(query, dtype=EMBEDDING_DTYPE)
+        probe = np.argsort(-(self.centroids @ query))[:self.nprobe]
+        ids = np.concatenate([self._ids[i] for i in probe])
+        vecs = np.vstack([self._vecs[i] for i in probe])
+
+        scores = vecs @ query
+        if len(scores) > k:
+            top = np.argpartition(-scores, k)[:k]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return ids[top], scores[top]
+
+
+# -------------------- APPROVED PROJECT INDEX --------------------
+# Candidates fetched from the index before exact SBERT + RapidFuzz scoring
+ANN_CANDIDATES = 50
+# Changed approved rows patched into the published index before a full rebuild is cheaper
+MAX_PATCHED = 64
+
+_approved_index = None
+_approved_version = None
+_checked_at = None  # time.monotonic() of the last fingerprint check
+_approved_lock = threading.Lock()
+
+
+def recheck_seconds():
+    return getattr(settings, "SIMILARITY_INDEX_RECHECK_SECONDS", 60)
+
+
+def _approved_projects():
+    from .models import Projectsubmission
+    return Projectsubmission.objects.filter(status='Approved')
+
+
+def approved_signature():
+    """
+    Cheap fingerprint of the approved set: (count, latest updated_at in µs).
+
+    Stored with each corpus version as a consistency fallback, so changes
+    sync_approved_project never saw (a restored or flushed database, admin
+    edits, cascade deletes) are noticed.
+    """
+    stats = _approved_projects().aggregate(count=Count('id'), latest=Max('updated_at'))
+    latest = stats['latest']
+    return stats['count'], _micros(latest) if latest else 0
+
+
+def _micros(when):
+    return int(when.timestamp()) * 1_000_000 + when.microsecond
+
+
+def _from_micros(micros):
+    seconds, rest = divmod(micros, 1_000_000)
+    return datetime.fromtimestamp(seconds, tz=dt_timezone.utc) + timedelta(microseconds=rest)
+
+
+def _embedded(projects):
+    return projects.only(
+        'id', 'title', 'description', 'technology_used',
+        'embedding', 'embedding_model', 'content_hash',
+    )
+
+
+def _index_from_db():
+    projects = list(_embedded(_approved_projects()))
+    return IVFIndex().build([p.id for p in projects], ensure_embeddings(projects))
+
+
+def _catch_up(corpus):
+    """
+    ``corpus`` brought in line with the database: approved rows added,
+    updated or dropped since it was published are patched into its index.
+    A missing corpus, an older database (restored) or a large change set
+    is rebuilt from scratch instead.
+    """
+    if corpus is None or corpus.signature[1] < 0:
+        return _index_from_db()
+    approved = _approved_projects()
+    latest = approved.aggregate(latest=Max('updated_at'))['latest']
+    if latest is not None and _micros(latest) < corpus.signature[1]:
+        return _index_from_db()
+
+    index = IVFIndex.from_corpus(corpus)
+    indexed = set(index._where)
+    db_ids = set(approved.values_list('id', flat=True))
+    removed = indexed - db_ids
+    added = db_ids - indexed
+    if len(removed) + len(added) > max(MAX_PATCHED, len(indexed) // 4):
+        return _index_from_db()
+
+    changed = list(_embedded(approved.filter(
+        Q(id__in=added) | Q(updated_at__gt=_from_micros(corpus.signature[1]))
+    )))
+    for project_id in removed:
+        index.remove(project_id)
+    for project, embedding in zip(changed, ensure_embeddings(changed)):
+        index.add(project.id, embedding)
+    return index
+
+
+def _publish(index, signature):
+    """Write ``index`` as the new shared corpus and switch this process to the mapped copy."""
+    global _approved_index, _approved_version
+    if index.needs_rebuild:
+        ids, vectors, _, _ = index.to_arrays()
+        index = IVFIndex().build(ids, vectors)
+    publish_corpus(*index.to_arrays(), trained_size=index.trained_size, signature=signature)
+    corpus = current_corpus()
+    _approved_index = IVFIndex.from_corpus(corpus)
+    _approved_version = corpus.version
+    return _approved_index
+
+
+def approved_index():
+    """
+    The IVF index over approved embeddings, backed by the shared memmap corpus.
+
+    Each call reads the CURRENT pointer, so a version published by another
+    worker is picked up without a restart. Approvals keep the corpus current
+    (sync_approved_project); every SIMILARITY_INDEX_RECHECK_SECONDS the
+    approved set's fingerprint is compared as well, and a corpus that no
+    longer matches the database is caught up and republished.
+    """
+    global _approved_index, _approved_version, _checked_at
+    with _approved_lock:
+        corpus = current_corpus()
+        now = time.monotonic()
+        if corpus is None or _checked_at is None or now - _checked_at >= recheck_seconds():
+            _checked_at = now
+            # taken before the rows are read: a change racing the catch-up
+            # only causes another one on the next check
+            signature = approved_signature()
+            if corpus is None or corpus.signature != signature:
+                with corpus_lock():
+                    corpus = current_corpus()
+                    if corpus is None or corpus.signature != signature:
+                        return _publish(_catch_up(corpus), signature)
+
+        if _approved_index is None or corpus.version != _approved_version:
+            _approved_index = IVFIndex.from_corpus(corpus)
+            _approved_version = corpus.version
+        return _approved_index
+
+
+def approved_candidate_ids(query_emb, k=ANN_CANDIDATES):
+    ids, _ = approved_index().search(query_emb, k)
+    return [int(i) for i in ids]
+
+
+def sync_approved_project(project):
+    """
+    Insert ``project`` into the shared corpus, or drop it once it is no
+    longer Approved. The views run it on commit of the review.
+    """
+    if current_version() is None:
+        return  # built from the database on first use
+    with _approved_lock, corpus_lock():
+        corpus = current_corpus()
+        if corpus is None:
+            return
+        index = IVFIndex.from_corpus(corpus)
+        if project.status == 'Approved':
+            index.add(project.id, ensure_embeddings([project])[0])
+        elif project.id in index:
+            index.remove(project.id)
+        else:
+            return
+        _publish(index, approved_signature())
+
+
+def reset_approved_index():
+    global _approved_index, _approved_version, _checked_at
+    with _approved_lock:
+        _approved_index = None
+        _approved_version = None
+        _checked_at = None
+        forget_loaded_corpus()
@@ -0,0 +1,16 @@
+from django.conf import settings
+
+
+# -------------------- CACHE BACKEND --------------------
+# Local-memory (and dummy) caches live inside one worker process: a delete or
+# a new version token there is never seen by the other workers.
+
+PROCESS_LOCAL_BACKENDS = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+def cache_is_shared(alias="default"):
+    """True when every worker process reads the same ``alias`` cache (files, database, Redis...)."""
+    return settings.CACHES[alias]["BACKEND"] not in PROCESS_LOCAL_BACKENDS
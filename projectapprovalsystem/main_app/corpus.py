@@ -0,0 +1,164 @@
+import hashlib
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import NamedTuple
+
+import numpy as np
+from django.conf import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows dev server: single process, nothing to coordinate
+    fcntl = None
+
+
+# -------------------- SHARED APPROVED CORPUS --------------------
+# The approved embeddings (laid out bucket by bucket for the IVF index) live in
+# versioned .npy files. Workers np.load them with mmap_mode="r", so every
+# process shares the same page-cache copy. CURRENT names the live version and
+# is swapped with os.replace, so readers never see a half-written corpus.
+# Each version records the fingerprint of the approved rows it was built
+# from, which ann.approved_index() compares against the database.
+
+CURRENT_FILE = "CURRENT"
+LOCK_FILE = "LOCK"
+PARTS = ("ids", "vectors", "centroids", "offsets", "meta")
+
+
+class Corpus(NamedTuple):
+    version: str
+    ids: np.ndarray
+    vectors: np.ndarray
+    centroids: np.ndarray
+    offsets: np.ndarray
+    trained_size: int
+    signature: tuple
+
+
+def corpus_dir():
+    """Directory of the corpus for the default database (test databases get their own)."""
+    base = getattr(settings, "SIMILARITY_CORPUS_DIR", os.path.join(settings.BASE_DIR, "similarity_corpus"))
+    db_name = str(settings.DATABASES["default"].get("NAME", ""))
+    return os.path.join(base, hashlib.sha1(db_name.encode("utf-8")).hexdigest()[:12])
+
+
+def corpus_dtype():
+    return np.dtype(getattr(settings, "SIMILARITY_CORPUS_DTYPE", "float32"))
+
+
+def _part_path(version, part):
+    return os.path.join(corpus_dir(), f"corpus-{version}.{part}.npy")
+
+
+def _atomic_write(path, write):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as fh:
+        write(fh)
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp, path)
+
+
+@contextmanager
+def corpus_lock():
+    """Serialise writers across processes (read-modify-publish of the corpus)."""
+    os.makedirs(corpus_dir(), exist_ok=True)
+    if fcntl is None:
+        yield
+        return
+    with open(os.path.join(corpus_dir(), LOCK_FILE), "a") as fh:
+        fcntl.flock(fh, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+def current_version():
+    try:
+        with open(os.path.join(corpus_dir(), CURRENT_FILE)) as fh:
+            return fh.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def publish_corpus(ids, vectors, centroids, offsets, trained_size, signature=(-1, -1)):
+    """
+    Write a new corpus version and make it current. Returns the version string.
+
+    ``signature`` is the (count, latest update) fingerprint of the rows it holds.
+    """
+    os.makedirs(corpus_dir(), exist_ok=True)
+    previous = current_version()
+    version = str(time.time_ns())
+    arrays = {
+        "ids": np.asarray(ids, dtype=np.int64),
+        "vectors": np.asarray(vectors, dtype=corpus_dtype()),
+        "centroids": np.asarray(centroids, dtype=np.float32),
+        "offsets": np.asarray(offsets, dtype=np.int64),
+        "meta": np.asarray([trained_size, *signature], dtype=np.int64),
+    }
+    for part, array in arrays.items():
+        _atomic_write(_part_path(version, part), lambda fh, a=array: np.save(fh, a))
+
+    _atomic_write(
+        os.path.join(corpus_dir(), CURRENT_FILE),
+        lambda fh: fh.write(version.encode("utf-8")),
+    )
+    _prune(keep={version, previous})
+    return version
+
+
+def _prune(keep):
+    # Workers may still map the previous version; unlinking is safe on POSIX.
+    for name in os.listdir(corpus_dir()):
+        if not name.startswith("corpus-"):
+            continue
+        if name.split(".", 1)[0][len("corpus-"):] in keep:
+            continue
+        try:
+            os.remove(os.path.join(corpus_dir(), name))
+        except OSError:
+            pass
+
+
+_loaded = None
+_loaded_lock = threading.Lock()
+
+
+def current_corpus():
+    """The live corpus, memory-mapped; reopened only when CURRENT changes."""
+    global _loaded
+    version = current_version()
+    if version is None:
+        return None
+
+    with _loaded_lock:
+        if _loaded is None or _loaded.version != version:
+            try:
+                parts = {
+                    part: np.load(_part_path(version, part), mmap_mode="r")
+                    for part in PARTS
+                }
+            except FileNotFoundError:
+                # pruned between reading CURRENT and opening; caller retries next time
+                return _loaded
+            _loaded = Corpus(
+                version=version,
+                ids=parts["ids"],
+                vectors=parts["vectors"],
+                centroids=np.array(parts["centroids"]),
+                offsets=np.array(parts["offsets"]),
+                trained_size=int(parts["meta"][0]),
+                # versions written before the fingerprint never match one
+                signature=tuple(int(v) for v in parts["meta"][1:3]) or (-1, -1),
+            )
+        return _loaded
+
+
+def forget_loaded_corpus():
+    global _loaded
+    with _loaded_lock:
+        _loaded = None
@@ -0,0 +1,134 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from .caches import cache_is_shared
+from .models import SubmissionDeadline
+
+
+# -------------------- CURRENT DEADLINE (CACHED) --------------------
+# The latest SubmissionDeadline is read on almost every dashboard request and
+# changes a few times a term. It is kept in this process for DEADLINE_LOCAL_TTL
+# seconds and in Django's cache; signals.py drops both whenever a deadline is
+# saved or deleted. That only reaches the other workers through a shared
+# cache backend, so with a per-process one the cached copy is kept no longer
+# than DEADLINE_LOCAL_TTL either.
+
+DEADLINE_CACHE_KEY = "main_app:submission_deadline"
+_NO_DEADLINE = "none"  # cached marker: the table is empty
+
+_local = None  # (expires_at, deadline)
+_local_lock = threading.Lock()
+
+
+def latest_deadline():
+    """The current deadline straight from the database."""
+    return SubmissionDeadline.objects.order_by('-created_at').first()
+
+
+def deadline_cache_timeout():
+    if cache_is_shared():
+        return getattr(settings, "DEADLINE_CACHE_TIMEOUT", 300)
+    return getattr(settings, "DEADLINE_LOCAL_TTL", 5)
+
+
+def current_deadline():
+    """The current deadline (or None), served from cache when possible."""
+    global _local
+    now = time.monotonic()
+    local = _local
+    if local is not None and local[0] > now:
+        return local[1]
+
+    cached = cache.get(DEADLINE_CACHE_KEY)
+    if cached is None:
+        deadline = latest_deadline()
+        cache.set(
+            DEADLINE_CACHE_KEY,
+            deadline if deadline is not None else _NO_DEADLINE,
+            deadline_cache_timeout(),
+        )
+    else:
+        deadline = None if cached == _NO_DEADLINE else cached
+
+    with _local_lock:
+        _local = (now + getattr(settings, "DEADLINE_LOCAL_TTL", 5), deadline)
+    return deadline
+
+
+def invalidate_deadline_cache():
+    global _local
+    with _local_lock:
+        _local = None
+    cache.delete(DEADLINE_CACHE_KEY)
+
+
+# -------------------- COUNTDOWN MESSAGES --------------------
+SUBMISSION_TEXTS = (
+    "🕒 {days} days left to submit your project.",
+    "⚠️ Tomorrow is the last day to submit!",
+    "🚨 Today is the final submission day!",
+    "❌ Submission deadline has passed.",
+)
+STUDENT_DEADLINE_TEXTS = (
+    "🕒 Students have {days} days left.",
+    "⚠️ Students' last day is tomorrow!",
+    "🚨 Today is final submission day!",
+    "❌ Student submission deadline passed.",
+)
+REVIEW_TEXTS = (
+    "✅ {days} days left to review.",
+    "⚠️ Review last day is tomorrow!",
+    "🚨 Today is final review day!",
+    "❌ Review deadline passed.",
+)
+
+
+def today():
+    return timezone.now().date()
+
+
+def countdown(due, texts, on=None, many_color='#2563eb'):
+    """
+    ``({'text', 'color'}, passed)`` for a due date, using ``texts`` for
+    (several days, tomorrow, today, passed). ``(None, False)`` without a date.
+    """
+    if not due:
+        return None, False
+
+    days_left = (due - (on or today())).days
+    if days_left > 1:
+        return {'text': texts[0].format(days=days_left), 'color': many_color}, False
+    if days_left == 1:
+        return {'text': texts[1], 'color': '#f59e0b'}, False
+    if days_left == 0:
+        return {'text': texts[2], 'color': '#eab308'}, False
+    return {'text': texts[3], 'color': '#dc2626'}, True
+
+
+def submission_info(deadline, on=None):
+    """Student-facing countdown to the submission deadline: ``(info, passed)``."""
+    return countdown(deadline.deadline if deadline else None, SUBMISSION_TEXTS, on)
+
+
+def student_deadline_info(deadline, on=None):
+    """Teacher-facing countdown to the students' submission deadline."""
+    return countdown(deadline.deadline if deadline else None, STUDENT_DEADLINE_TEXTS, on)[0]
+
+
+def review_info(deadline, on=None):
+    """Teacher-facing countdown to the review deadline: ``(info, passed)``."""
+    return countdown(
+        deadline.teacher_deadline if deadline else None, REVIEW_TEXTS, on, many_color='#16a34a',
+    )
+
+
+def submission_closed(deadline, on=None):
+    return bool(deadline and deadline.deadline and (on or today()) > deadline.deadline)
+
+
+def review_closed(deadline, on=None):
+    return bool(deadline and deadline.teacher_deadline and (on or today()) > deadline.teacher_deadline)
@@ -0,0 +1,179 @@
+import logging
+
+import numpy as np
+from django.db import DatabaseError, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .ann import approved_candidate_ids
+from .embeddings import (
+    SBERT_MODEL_NAME,
+    embedding_from_bytes,
+    encode,
+    ensure_embeddings,
+    is_embedding_current,
+    set_embedding,
+    submission_text,
+)
+from .fragments import bump_projects, duplicate_partner_ids
+from .models import DuplicateCandidate, Projectsubmission
+from .similarity import (
+    DUPLICATE_THRESHOLD,
+    FUZZY_WEIGHT,
+    SEMANTIC_WEIGHT,
+    cosine_scores,
+    rank_projects,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def find_approved_duplicate(text, embedding, exclude_id=None):
+    """
+    Best approved project scoring at or above the duplicate threshold, as
+    ``(project, Match)``, or None. The ANN index narrows the approved corpus;
+    exact scoring runs on those candidates only.
+    """
+    approved = Projectsubmission.objects.filter(
+        status='Approved',
+        id__in=approved_candidate_ids(embedding),
+    ).select_related('student', 'reviewed_by')
+    if exclude_id is not None:
+        approved = approved.exclude(id=exclude_id)
+
+    best = rank_projects(text, embedding, approved, top_k=1, threshold=DUPLICATE_THRESHOLD)
+    return best[0] if best else None
+
+
+def duplicate_warning(project, match):
+    return (
+        f"⚠️ Duplicate detected! Similarity Score: {match.score}%. "
+        f"Similar to: '{project.title}' approved for {project.student.full_name} "
+        f"(Guide: {project.reviewed_by.full_name if project.reviewed_by else 'N/A'})."
+    )
+
+
+def candidates_current(project):
+    """True when the stored DuplicateCandidate rows match the project's current text."""
+    return is_embedding_current(project) and project.candidates_hash == project.content_hash
+
+
+# -------------------- DUPLICATE CANDIDATES --------------------
+# Scoring only reads, so the views run it before the transaction that saves
+# the project and write the rows in that same transaction: one lock on
+# SQLite, and a failure to score never undoes (or 500s) the submission -
+# the project is left unscored for refresh_stale_candidates().
+
+# Submissions scored exactly per project, picked by stored embedding
+CANDIDATE_SHORTLIST = 50
+
+
+def shortlist_ids(project_emb, exclude_id=None, limit=CANDIDATE_SHORTLIST):
+    """
+    Ids of the ``limit`` submissions closest to ``project_emb`` among those
+    whose semantic score can still reach DUPLICATE_THRESHOLD. Reads only
+    (id, embedding); rows without a current embedding are skipped, their
+    own refresh pairs them up.
+    """
+    rows = Projectsubmission.objects.filter(embedding_model=SBERT_MODEL_NAME).exclude(embedding=None)
+    if exclude_id is not None:
+        rows = rows.exclude(id=exclude_id)
+    rows = list(rows.values_list('id', 'embedding'))
+    if not rows:
+        return []
+
+    ids = [row_id for row_id, _ in rows]
+    semantic = cosine_scores(project_emb, np.vstack([embedding_from_bytes(raw) for _, raw in rows]))
+    reachable = np.flatnonzero(semantic * SEMANTIC_WEIGHT + 100 * FUZZY_WEIGHT >= DUPLICATE_THRESHOLD - 1)
+    best = reachable[np.argsort(-semantic[reachable], kind="stable")[:limit]]
+    return [ids[i] for i in best]
+
+
+def score_duplicate_candidates(project):
+    """``[(other, Match), ...]`` for ``project``, which must carry a current embedding."""
+    project_emb = embedding_from_bytes(project.embedding)
+    others = [
+        other for other in Projectsubmission.objects.filter(id__in=shortlist_ids(project_emb, project.id))
+        if is_embedding_current(other)
+    ]
+    return rank_projects(submission_text(project), project_emb, others, threshold=DUPLICATE_THRESHOLD)
+
+
+@transaction.atomic
+def save_duplicate_candidates(project, matches):
+    """
+    Replace the DuplicateCandidate rows involving ``project`` with ``matches``.
+
+    Rows are stored in both directions so a dashboard only has to look up
+    ``project__in=...``; existing rows on either side are dropped first.
+    """
+    previous_partners = duplicate_partner_ids([project.id])
+    DuplicateCandidate.objects.filter(
+        Q(project=project) | Q(other_project=project)
+    ).delete()
+
+    now = timezone.now()
+    rows = []
+    for other, match in matches:
+        for a, b in ((project, other), (other, project)):
+            rows.append(DuplicateCandidate(
+                project=a,
+                other_project=b,
+                semantic_score=match.semantic,
+                fuzzy_score=match.fuzzy,
+                score=match.score,
+                computed_at=now,
+            ))
+    DuplicateCandidate.objects.bulk_create(rows)
+
+    project.candidates_hash = project.content_hash
+    Projectsubmission.objects.filter(id=project.id).update(candidates_hash=project.candidates_hash)
+    # teachers of old and new partners show (or showed) a warning naming it
+    bump_projects({project.id} | previous_partners)
+    return rows
+
+
+def refresh_duplicate_candidates(project):
+    """Recompute the DuplicateCandidate rows involving a saved ``project``."""
+    ensure_embeddings([project])
+    return save_duplicate_candidates(project, score_duplicate_candidates(project))
+
+
+def save_with_candidates(project, save=None):
+    """
+    Save ``project`` (through ``save`` when given, e.g. form.save) together
+    with its DuplicateCandidate rows. Returns the saved project.
+    """
+    try:
+        if not is_embedding_current(project):
+            text = submission_text(project)
+            set_embedding(project, encode([text])[0], text)
+        matches = score_duplicate_candidates(project)
+    except Exception:
+        logger.exception("Duplicate candidates for %r not scored; left to the sweep", project.title)
+        matches = None
+
+    with transaction.atomic():
+        project = (save or project.save)() or project
+        if matches is not None:
+            try:
+                with transaction.atomic():
+                    save_duplicate_candidates(project, matches)
+            except DatabaseError:
+                logger.exception("Duplicate candidates for project %s not saved; left to the sweep", project.id)
+    return project
+
+
+def refresh_stale_candidates():
+    """
+    Recompute candidates for pending projects scored never or for older text
+    (rows saved outside the views, imports). Dashboards only read
+    DuplicateCandidate rows; the similarity worker runs this sweep. Returns
+    the number of projects refreshed.
+    """
+    refreshed = 0
+    for project in Projectsubmission.objects.filter(status='Pending').iterator():
+        if not candidates_current(project):
+            refresh_duplicate_candidates(project)
+            refreshed += 1
+    return refreshed
@@ -0,0 +1,131 @@
+import json
+import queue
+import socket
+import socketserver
+import struct
+import threading
+
+import numpy as np
+
+
+# -------------------- WIRE PROTOCOL --------------------
+# Request:  4-byte length + JSON {"texts": [...]}
+# Response: 4-byte length + JSON {"shape": [n, dim]} or {"error": "..."},
+#           followed by n * dim float32 values.
+
+_LENGTH = struct.Struct("!I")
+
+
+def _recv_exact(sock, size):
+    chunks = []
+    while size:
+        chunk = sock.recv(size)
+        if not chunk:
+            raise ConnectionError("embedding server closed the connection")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def _send_message(sock, header, payload=b""):
+    raw = json.dumps(header).encode("utf-8")
+    sock.sendall(_LENGTH.pack(len(raw)) + raw + payload)
+
+
+def _recv_header(sock):
+    (size,) = _LENGTH.unpack(_recv_exact(sock, _LENGTH.size))
+    return json.loads(_recv_exact(sock, size).decode("utf-8"))
+
+
+# -------------------- CLIENT --------------------
+def remote_encode(socket_path, texts, timeout=30.0):
+    """Encode ``texts`` through the sidecar; raises OSError if it is unreachable."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(socket_path)
+        _send_message(sock, {"texts": list(texts)})
+        header = _recv_header(sock)
+        if "error" in header:
+            raise ConnectionError(f"embedding server error: {header['error']}")
+        rows, dim = header["shape"]
+        raw = _recv_exact(sock, rows * dim * 4)
+    return np.frombuffer(raw, dtype=np.float32).reshape(rows, dim)
+
+
+# -------------------- SERVER --------------------
+class _Job:
+    def __init__(self, texts):
+        self.texts = texts
+        self.result = None
+        self.error = None
+        self.done = threading.Event()
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    def handle(self):
+        try:
+            texts = _recv_header(self.request)["texts"]
+        except (ConnectionError, ValueError, KeyError):
+            return
+        job = _Job(texts)
+        self.server.jobs.put(job)
+        job.done.wait()
+
+        if job.error is not None:
+            _send_message(self.request, {"error": job.error})
+        else:
+            vectors = np.ascontiguousarray(job.result, dtype=np.float32)
+            _send_message(self.request, {"shape": list(vectors.shape)}, vectors.tobytes())
+
+
+class EmbeddingServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Owns the SBERT model for every worker on the host.
+
+    Connections are handled on their own threads; a single batcher thread
+    coalesces whatever requests arrive within ``max_wait`` seconds (up to
+    ``max_batch`` texts) into one ``encode`` call.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, socket_path, encode_fn, max_batch=64, max_wait=0.005):
+        self.encode_fn = encode_fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.jobs = queue.Queue()
+        self.batches = 0
+        super().__init__(socket_path, _Handler)
+        self._batcher = threading.Thread(target=self._run_batcher, daemon=True)
+        self._batcher.start()
+
+    def _next_batch(self):
+        batch = [self.jobs.get()]
+        size = len(batch[0].texts)
+        while size < self.max_batch:
+            try:
+                job = self.jobs.get(timeout=self.max_wait)
+            except queue.Empty:
+                break
+            batch.append(job)
+            size += len(job.texts)
+        return batch
+
+    def _run_batcher(self):
+        while True:
+            batch = self._next_batch()
+            texts = [text for job in batch for text in job.texts]
+            try:
+                vectors = self.encode_fn(texts) if texts else np.zeros((0, 0), dtype=np.float32)
+                self.batches += 1
+            except Exception as exc:  # report to every waiting client, keep serving
+                for job in batch:
+                    job.error = str(exc)
+                    job.done.set()
+                continue
+
+            start = 0
+            for job in batch:
+                job.result = vectors[start:start + len(job.texts)]
+                start += len(job.texts)
+                job.done.set()
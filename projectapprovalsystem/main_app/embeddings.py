@@ -0,0 +1,131 @@
+import hashlib
+import logging
+import os
+import socket
+
+import numpy as np
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+# -------------------- SBERT MODEL --------------------
+SBERT_MODEL_NAME = "all-MiniLM-L6-v2"
+EMBEDDING_DTYPE = np.float32
+ENCODE_BATCH_SIZE = 64
+
+# Load lightweight but powerful model
+_sbert_model = None
+
+
+def get_sbert_model():
+    # Imported here: torch/transformers take seconds to import and most
+    # requests (and every manage.py command) never need them.
+    from sentence_transformers import SentenceTransformer
+
+    global _sbert_model
+    if _sbert_model is None:
+        _sbert_model = SentenceTransformer(SBERT_MODEL_NAME)
+    return _sbert_model
+
+
+def is_model_loaded():
+    return _sbert_model is not None
+
+
+# -------------------- PROJECT TEXT --------------------
+def project_text(title, description, technology_used):
+    """Text compared by the duplicate checks for one project."""
+    return f"{title} {description} {technology_used}".lower()
+
+
+def submission_text(project):
+    return project_text(project.title, project.description, project.technology_used)
+
+
+def content_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+# -------------------- ENCODING --------------------
+def embedding_socket_path():
+    """UNIX socket of the shared embedding server, or None when it is not running."""
+    path = getattr(settings, "SIMILARITY_EMBEDDING_SOCKET", "")
+    if path and hasattr(socket, "AF_UNIX") and os.path.exists(path):
+        return path
+    return None
+
+
+def encode(texts):
+    """
+    Encode texts into L2-normalised float32 rows (cosine == dot product).
+
+    Goes through the embedding server when its socket exists and falls back
+    to the in-process model otherwise.
+    """
+    texts = list(texts)
+    path = embedding_socket_path()
+    if path:
+        from .embedding_server import remote_encode
+        try:
+            return remote_encode(path, texts)
+        except OSError as exc:
+            logger.warning("Embedding server at %s unavailable (%s); encoding in-process.", path, exc)
+    return encode_local(texts)
+
+
+def encode_local(texts):
+    """Encode with this process's own SBERT model."""
+    model = get_sbert_model()
+    vectors = model.encode(
+        list(texts),
+        batch_size=ENCODE_BATCH_SIZE,
+        convert_to_numpy=True,
+        normalize_embeddings=True,
+    )
+    return np.asarray(vectors, dtype=EMBEDDING_DTYPE).reshape(len(texts), -1)
+
+
+def embedding_from_bytes(raw):
+    return np.frombuffer(bytes(raw), dtype=EMBEDDING_DTYPE)
+
+
+def is_embedding_current(project):
+    return (
+        project.embedding is not None
+        and project.embedding_model == SBERT_MODEL_NAME
+        and project.content_hash == content_hash(submission_text(project))
+    )
+
+
+def set_embedding(project, vector, text=None):
+    """Attach an already computed embedding to ``project`` (not saved)."""
+    text = submission_text(project) if text is None else text
+    project.embedding = np.asarray(vector, dtype=EMBEDDING_DTYPE).tobytes()
+    project.embedding_model = SBERT_MODEL_NAME
+    project.content_hash = content_hash(text)
+
+
+def ensure_embeddings(projects):
+    """
+    Return the embedding matrix for ``projects`` (one row per project, same order).
+
+    Stored embeddings are reused; only projects whose text or model changed since
+    they were last encoded go through SBERT, in one batch, and are written back.
+    """
+    projects = list(projects)
+    if not projects:
+        return np.zeros((0, 0), dtype=EMBEDDING_DTYPE)
+
+    stale = [p for p in projects if not is_embedding_current(p)]
+    if stale:
+        texts = [submission_text(p) for p in stale]
+        for project, vector, text in zip(stale, encode(texts), texts):
+            set_embedding(project, vector, text)
+
+        from .models import Projectsubmission
+        Projectsubmission.objects.bulk_update(
+            stale, ['embedding', 'embedding_model', 'content_hash']
+        )
+
+    return np.vstack([embedding_from_bytes(p.embedding) for p in projects])
@@ -0,0 +1,53 @@
+import asyncio
+import threading
+
+
+# -------------------- IN-PROCESS PUB/SUB --------------------
+# Channels are plain strings; subscribers are asyncio queues owned by the
+# event loop of an ASGI worker. publish() may be called from any thread (sync
+# views run in asgiref's thread pool) and only wakes subscribers of this
+# process - other workers notice changes through the periodic check in the
+# stream itself (see views.project_status_stream).
+
+_lock = threading.Lock()
+_subscribers = {}  # channel -> {(loop, queue)}
+
+
+def student_channel(student_id):
+    return f"student:{student_id}"
+
+
+def subscribe(channel):
+    """Register the running event loop for ``channel``; returns the subscription."""
+    # One pending wake-up is enough: the subscriber re-reads the state anyway
+    subscription = (asyncio.get_running_loop(), asyncio.Queue(maxsize=1))
+    with _lock:
+        _subscribers.setdefault(channel, set()).add(subscription)
+    return subscription
+
+
+def unsubscribe(channel, subscription):
+    with _lock:
+        subscribers = _subscribers.get(channel)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del _subscribers[channel]
+
+
+def _offer(queue, message):
+    if not queue.full():
+        queue.put_nowait(message)
+
+
+def publish(channel, message=None):
+    """Wake every subscriber of ``channel``. Returns how many there were."""
+    with _lock:
+        subscribers = list(_subscribers.get(channel, ()))
+    for loop, queue in subscribers:
+        try:
+            loop.call_soon_threadsafe(_offer, queue, message)
+        except RuntimeError:  # loop already closed; its stream is gone
+            pass
+    return len(subscribers)
+
@@ -0,0 +1,97 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+
+from .caches import cache_is_shared
+from .models import DuplicateCandidate, Projectsubmission, UserRegistration
+
+
+# -------------------- DASHBOARD FRAGMENT VERSIONS --------------------
+# The {% cache %} blocks of student_dashboard.html and teacher_dashboard.html
+# vary on a version token per student / teacher. signals.py replaces a token
+# whenever something shown in those blocks changes; the old block is simply
+# never read again and expires after DASHBOARD_FRAGMENT_TIMEOUT.
+#
+# Tokens live in the default cache. With a per-process backend (local
+# memory, the default) a bump made by one worker is invisible to the others,
+# so blocks are kept there for DASHBOARD_FRAGMENT_LOCAL_TIMEOUT seconds only;
+# the file-based (or any shared) backend gets the full timeout.
+
+VERSION_KEY = "main_app:fragments:{scope}"
+
+
+def student_scope(student_id):
+    return f"student:{student_id}"
+
+
+def teacher_scope(teacher_id):
+    return f"teacher:{teacher_id}"
+
+
+def fragment_timeout():
+    timeout = getattr(settings, "DASHBOARD_FRAGMENT_TIMEOUT", 600)
+    if cache_is_shared():
+        return timeout
+    return min(timeout, getattr(settings, "DASHBOARD_FRAGMENT_LOCAL_TIMEOUT", 10))
+
+
+def _new_token():
+    return time.time_ns()
+
+
+def fragment_version(*scopes):
+    """One cache round trip: a key part that changes whenever any of ``scopes`` is bumped."""
+    scopes = [scope for scope in scopes if scope]
+    keys = {scope: VERSION_KEY.format(scope=scope) for scope in scopes}
+    tokens = cache.get_many(keys.values())
+    missing = {key: _new_token() for key in keys.values() if key not in tokens}
+    if missing:
+        cache.set_many(missing, None)
+        tokens.update(missing)
+    return ",".join(f"{scope}={tokens[keys[scope]]}" for scope in scopes)
+
+
+def bump(*scopes):
+    """
+    Replace the tokens of ``scopes`` now, and again once the surrounding
+    transaction commits: a render racing the transaction would otherwise
+    cache the old rows under the new token.
+    """
+    def replace():
+        cache.set_many({VERSION_KEY.format(scope=scope): _new_token() for scope in scopes}, None)
+
+    replace()
+    if connection.in_atomic_block:
+        transaction.on_commit(replace)
+
+
+# -------------------- WHAT A CHANGE INVALIDATES --------------------
+def bump_students(student_ids, teacher_ids=()):
+    """The students' dashboards and their guides' (plus ``teacher_ids``)."""
+    scopes = {teacher_scope(teacher_id) for teacher_id in teacher_ids if teacher_id}
+    rows = UserRegistration.objects.filter(id__in=set(student_ids)).values_list('id', 'assigned_teacher_id')
+    for student_id, teacher_id in rows:
+        scopes.add(student_scope(student_id))
+        if teacher_id:
+            scopes.add(teacher_scope(teacher_id))
+    if scopes:
+        bump(*scopes)
+
+
+def duplicate_partner_ids(project_ids):
+    """Projects paired with ``project_ids`` as duplicate candidates."""
+    return set(
+        DuplicateCandidate.objects.filter(project_id__in=project_ids).values_list('other_project_id', flat=True)
+    )
+
+
+def bump_projects(project_ids, student_ids=()):
+    """
+    Every dashboard showing these projects: their students', their guides'
+    and those of the projects they are listed as possible duplicates of.
+    """
+    project_ids = set(project_ids) | duplicate_partner_ids(project_ids)
+    owners = Projectsubmission.objects.filter(id__in=project_ids).values_list('student_id', flat=True)
+    bump_students(set(owners) | set(student_ids))
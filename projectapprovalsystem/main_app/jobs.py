@@ -0,0 +1,153 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .duplicates import (
+    duplicate_warning,
+    find_approved_duplicate,
+    save_duplicate_candidates,
+    score_duplicate_candidates,
+)
+from .embeddings import encode, set_embedding, submission_text
+from .fragments import bump_projects
+from .models import Projectsubmission, SimilarityJob
+from .submissions import bump_submission_version, refresh_current_submission
+
+logger = logging.getLogger(__name__)
+
+
+# -------------------- BACKGROUND DUPLICATE CHECKS --------------------
+# With SIMILARITY_ASYNC on, student_dashboard saves the submission straight
+# away and queues a SimilarityJob; `manage.py run_similarity_worker` claims
+# jobs from the table, runs the semantic + fuzzy check and writes the result
+# back to the Projectsubmission row, where check_project_status reports it.
+
+MAX_ATTEMPTS = 3
+STALE_AFTER = timedelta(minutes=10)
+
+
+def async_checks_enabled():
+    return getattr(settings, "SIMILARITY_ASYNC", False)
+
+
+def enqueue_similarity_check(project):
+    """Mark ``project`` as being checked and queue a job for the worker."""
+    project.similarity_status = 'checking'
+    project.similarity_score = None
+    project.similar_to = None
+    Projectsubmission.objects.filter(id=project.id).update(
+        similarity_status='checking', similarity_score=None, similar_to=None,
+    )
+    bump_submission_version(project.student_id)
+    bump_projects([project.id])
+    # one live job per project is enough; the worker always reads the latest text
+    if not SimilarityJob.objects.filter(project=project, status='queued').exists():
+        SimilarityJob.objects.create(project=project)
+
+
+def claim_next_job():
+    """
+    Atomically move the oldest queued job to ``running`` and return it, or None.
+
+    The claim is a conditional UPDATE, so several workers can poll the same
+    table without a row lock (SQLite has no SELECT ... FOR UPDATE).
+    """
+    for job_id in SimilarityJob.objects.filter(status='queued').values_list('id', flat=True)[:10]:
+        claimed = SimilarityJob.objects.filter(id=job_id, status='queued').update(
+            status='running', started_at=timezone.now(),
+        )
+        if claimed:
+            return SimilarityJob.objects.select_related('project__student').get(id=job_id)
+    return None
+
+
+def requeue_stale_jobs(stale_after=STALE_AFTER):
+    """Put back jobs whose worker died mid-run. Returns how many were requeued."""
+    cutoff = timezone.now() - stale_after
+    return SimilarityJob.objects.filter(status='running', started_at__lt=cutoff).update(
+        status='queued', started_at=None,
+    )
+
+
+def run_job(job):
+    """Run one claimed job; failures are retried up to MAX_ATTEMPTS."""
+    job.attempts += 1
+    try:
+        check_submission(job.project)
+    except Exception as exc:
+        logger.exception("Similarity check for project %s failed", job.project_id)
+        job.error = f"{type(exc).__name__}: {exc}"
+        if job.attempts >= MAX_ATTEMPTS:
+            job.status = 'failed'
+            job.finished_at = timezone.now()
+            # the teacher still reviews it; the check just could not run
+            Projectsubmission.objects.filter(id=job.project_id).update(similarity_status='failed')
+            bump_submission_version(job.project.student_id)
+            bump_projects([job.project_id])
+        else:
+            job.status = 'queued'
+            job.started_at = None
+    else:
+        job.status = 'done'
+        job.error = ''
+        job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'attempts', 'error', 'started_at', 'finished_at'])
+    return job
+
+
+def check_submission(project):
+    """
+    Duplicate-check ``project`` against the approved corpus and store the result.
+
+    A duplicate of an approved project is rejected with the same message the
+    synchronous check shows, which lets the student submit a new idea. A
+    teacher decision taken while the check ran is left alone.
+    """
+    text = submission_text(project)
+    embedding = encode([text])[0]
+    set_embedding(project, embedding, text)
+    hit = find_approved_duplicate(text, embedding, exclude_id=project.id)
+    # scored before the transaction, which then only writes
+    matches = score_duplicate_candidates(project) if hit is None else None
+
+    with transaction.atomic():
+        Projectsubmission.objects.filter(id=project.id).update(
+            embedding=project.embedding,
+            embedding_model=project.embedding_model,
+            content_hash=project.content_hash,
+        )
+        if hit is None:
+            Projectsubmission.objects.filter(id=project.id).update(
+                similarity_status='clear', similarity_score=None, similar_to=None,
+            )
+            bump_submission_version(project.student_id)
+            save_duplicate_candidates(project, matches)  # also invalidates the dashboards
+            return None
+
+        approved, match = hit
+        Projectsubmission.objects.filter(id=project.id).update(
+            similarity_status='duplicate', similarity_score=match.score, similar_to=approved,
+        )
+        Projectsubmission.objects.filter(id=project.id, status='Pending').update(
+            status='Rejected',
+            feedback=duplicate_warning(approved, match),
+            reviewed_at=timezone.now(),
+        )
+        refresh_current_submission(project.student_id)
+        bump_projects([project.id])
+    return hit
+
+
+def run_pending_jobs(limit=None):
+    """Drain the queue in this process. Returns the number of jobs run."""
+    count = 0
+    while limit is None or count < limit:
+        job = claim_next_job()
+        if job is None:
+            break
+        run_job(job)
+        count += 1
+    return count
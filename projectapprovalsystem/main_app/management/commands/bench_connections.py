@@ -0,0 +1,84 @@
+import copy
+import json
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.utils import load_backend
+
+
+class Command(BaseCommand):
+    help = (
+        "Time simulated requests (one small query each) against the configured database with a "
+        "new connection per request, a persistent connection and, on PostgreSQL, the psycopg pool."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200, help="Simulated requests per mode.")
+        parser.add_argument("--queries", type=int, default=3, help="Queries per request.")
+        parser.add_argument("--database", default="default", help="Database alias to measure.")
+        parser.add_argument("--json", dest="json_path", help="Also write the results to this file.")
+
+    def handle(self, *args, **options):
+        base = connections[options["database"]].settings_dict
+        # DB_POOL may already have put a pool into OPTIONS; only the "pool" mode keeps one
+        unpooled = {key: value for key, value in base.get("OPTIONS", {}).items() if key != "pool"}
+        modes = {
+            "fresh": {"CONN_MAX_AGE": 0, "OPTIONS": unpooled},
+            "persistent": {"CONN_MAX_AGE": None, "CONN_HEALTH_CHECKS": True, "OPTIONS": unpooled},
+        }
+        if base["ENGINE"] == "django.db.backends.postgresql":
+            pool = base.get("OPTIONS", {}).get("pool") or {"min_size": 1, "max_size": 2, "timeout": 10}
+            modes["pool"] = {"CONN_MAX_AGE": 0, "OPTIONS": {**unpooled, "pool": pool}}
+        elif base["ENGINE"].endswith("sqlite3") and str(base["NAME"]) == ":memory:":
+            raise CommandError("An in-memory SQLite database cannot be reopened per request.")
+
+        results = {}
+        for mode, overrides in modes.items():
+            settings_dict = {**copy.deepcopy(base), **overrides}
+            results[mode] = self.measure(f"bench_{mode}", settings_dict, options)
+
+        self.print_report(results)
+        if options["json_path"]:
+            with open(options["json_path"], "w") as fh:
+                json.dump(results, fh, indent=2)
+
+    # -------------------- MEASURING --------------------
+    def measure(self, alias, settings_dict, options):
+        """
+        What Django does around each request: close_old_connections() when it
+        starts and ends (which closes, keeps or returns the connection as
+        configured) with the view's queries in between.
+        """
+        wrapper = load_backend(settings_dict["ENGINE"]).DatabaseWrapper(settings_dict, alias)
+        timings = []
+        try:
+            for _ in range(options["requests"] + 1):
+                started = time.perf_counter()
+                wrapper.close_if_unusable_or_obsolete()
+                with wrapper.cursor() as cursor:
+                    for _ in range(options["queries"]):
+                        cursor.execute("SELECT 1")
+                        cursor.fetchone()
+                wrapper.close_if_unusable_or_obsolete()
+                timings.append((time.perf_counter() - started) * 1000)
+        finally:
+            wrapper.close()
+            if settings_dict.get("OPTIONS", {}).get("pool"):
+                wrapper.close_pool()
+
+        timings = sorted(timings[1:])  # the first request opens the persistent connection / pool
+        return {
+            "median_ms": statistics.median(timings),
+            "p95_ms": timings[int(len(timings) * 0.95) - 1],
+        }
+
+    # -------------------- REPORT --------------------
+    def print_report(self, results):
+        fresh = results["fresh"]["median_ms"]
+        self.stdout.write(f"{'mode':<14}{'median ms':>12}{'p95 ms':>12}{'saved/request':>16}")
+        for mode, row in results.items():
+            self.stdout.write(
+                f"{mode:<14}{row['median_ms']:>12.3f}{row['p95_ms']:>12.3f}{fresh - row['median_ms']:>13.3f} ms"
+            )
@@ -0,0 +1,204 @@
+import importlib
+import json
+import random
+import statistics
+import tempfile
+import time
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.migrations.operations import AddIndex
+from django.db.models import Q
+from django.utils import timezone
+
+from main_app.models import Projectsubmission, SubmissionDeadline, UserRegistration
+
+
+# The indexes under test; "before" runs with them dropped from the current schema
+INDEX_MIGRATION = "main_app.migrations.0019_view_filter_indexes"
+PAGE = 26  # keyset pages fetch one row more than they show
+
+# The admin dashboard's user lists: (filter, newest first), as its sections page them
+SECTIONS = {
+    "pending_students": (Q(role="student", is_verified=False, is_deleted=False), False),
+    "verified_students": (Q(role="student", is_verified=True, is_deleted=False), False),
+    "deleted_users": (Q(is_deleted=True), True),
+    "approved_teachers": (Q(role="teacher", is_verified=True, is_deleted=False), False),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway database with ~100k users and their projects, then compare EXPLAIN "
+        "plans and timings of the dashboard queries without and with the view-filter indexes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=100_000, help="UserRegistration rows to seed.")
+        parser.add_argument("--repeat", type=int, default=50, help="Timed runs per query.")
+        parser.add_argument("--seed", type=int, default=7, help="Random seed for the dataset.")
+        parser.add_argument("--plans", action="store_true", help="Print the EXPLAIN output of every query.")
+        parser.add_argument("--json", dest="json_path", help="Also write the results to this file.")
+
+    def handle(self, *args, **options):
+        workdir = tempfile.TemporaryDirectory(prefix="bench-indexes-")
+        db_settings = settings.DATABASES["default"]
+        if db_settings["ENGINE"].endswith("sqlite3"):
+            # on disk like production, not the in-memory test default
+            db_settings.setdefault("TEST", {})["NAME"] = f"{workdir.name}/bench.sqlite3"
+
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            # seeded with the current models, so later migrations' columns exist
+            started = time.perf_counter()
+            self.view_filter_indexes("remove_index")
+            context = self.seed(options)
+            self.stdout.write(f"seeded in {time.perf_counter() - started:.1f} s")
+
+            before = self.measure(context, options["repeat"])
+            self.view_filter_indexes("add_index")
+            self.analyze()  # as 0019 does once its indexes exist
+            after = self.measure(context, options["repeat"])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            workdir.cleanup()
+
+        results = {
+            name: {"before": before[name], "after": after[name]}
+            for name in before
+        }
+        self.print_report(results, options["plans"])
+        if options["json_path"]:
+            with open(options["json_path"], "w") as fh:
+                json.dump(results, fh, indent=2)
+
+    # -------------------- INDEXES --------------------
+    def view_filter_indexes(self, method):
+        """Drop ("remove_index") or recreate ("add_index") the indexes added by 0019."""
+        migration = importlib.import_module(INDEX_MIGRATION).Migration
+        with connection.schema_editor() as editor:
+            for operation in migration.operations:
+                if isinstance(operation, AddIndex):
+                    model = apps.get_model("main_app", operation.model_name)
+                    getattr(editor, method)(model, operation.index)
+
+    def analyze(self):
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    # -------------------- SEEDING --------------------
+    def seed(self, options):
+        """
+        A term's worth of data: 2% teachers, the rest students (5% awaiting
+        verification, 3% soft-deleted), one project per active student.
+        """
+        rng = random.Random(options["seed"])
+        total = options["users"]
+        now = timezone.now()
+
+        SubmissionDeadline.objects.bulk_create([
+            SubmissionDeadline(deadline=now.date() + timedelta(days=i), teacher_deadline=now.date() + timedelta(days=i + 2))
+            for i in range(200)
+        ])
+
+        teachers = UserRegistration.objects.bulk_create([
+            UserRegistration(
+                full_name=f"Teacher {i}", email=f"teacher{i}@bench.test", role="teacher",
+                password="!", is_verified=True,
+            )
+            for i in range(max(1, total // 50))
+        ], batch_size=2000)
+
+        students = []
+        for i in range(total - len(teachers)):
+            roll = rng.random()
+            students.append(UserRegistration(
+                full_name=f"Student {i}", email=f"student{i}@bench.test", role="student", password="!",
+                is_verified=roll >= 0.05,
+                is_deleted=roll >= 0.97,
+                deleted_at=now if roll >= 0.97 else None,
+                assigned_teacher=rng.choice(teachers),
+            ))
+        students = UserRegistration.objects.bulk_create(students, batch_size=2000)
+
+        statuses = ["Approved"] * 3 + ["Pending"] * 5 + ["Rejected"] * 2
+        Projectsubmission.objects.bulk_create([
+            Projectsubmission(
+                student=student, title=f"Project {student.id}", description="Seeded for bench_indexes.",
+                technology_used="Django", status=rng.choice(statuses), created_at=now,
+            )
+            for student in students
+            if student.is_verified and not student.is_deleted
+        ], batch_size=2000)
+
+        self.analyze()  # the same statistics the "after" run gets
+
+        active = [s for s in students if s.is_verified and not s.is_deleted]
+        return {
+            "teacher": rng.choice(teachers),
+            "student": rng.choice(active),
+            "middle_id": students[len(students) // 2].id,
+        }
+
+    # -------------------- QUERIES --------------------
+    def queries(self, context):
+        """The hot filters of the dashboards, shaped as the views issue them."""
+        teacher, student, middle = context["teacher"], context["student"], context["middle_id"]
+
+        def section(name, cursor=None):
+            condition, descending = SECTIONS[name]
+            qs = UserRegistration.objects.filter(condition)
+            if cursor is not None:
+                qs = qs.filter(**{"id__lt" if descending else "id__gt": cursor})
+            return qs.order_by("-id" if descending else "id")[:PAGE]
+
+        return {
+            "student: live submission": Projectsubmission.objects.filter(
+                student=student, status__in=["Pending", "Approved"],
+            ).order_by("id")[:1],
+            "duplicates: approved corpus": Projectsubmission.objects.filter(status="Approved").only("id"),
+            "admin: approved projects": Projectsubmission.objects.filter(status="Approved")
+            .select_related("student", "reviewed_by").defer("embedding"),
+            "teacher: assigned students": UserRegistration.objects.filter(
+                role="student", assigned_teacher=teacher, is_verified=True,
+            ),
+            "teacher: projects page": Projectsubmission.objects.filter(
+                student__role="student", student__assigned_teacher=teacher, student__is_verified=True,
+            ).select_related("student").order_by("-id")[:PAGE],
+            "admin: pending students": section("pending_students"),
+            "admin: verified students p1": section("verified_students"),
+            "admin: verified students mid": section("verified_students", middle),
+            "admin: deleted users": section("deleted_users"),
+            "admin: approved teachers": section("approved_teachers"),
+            "admin: teachers": UserRegistration.objects.filter(role="teacher", is_deleted=False).order_by("full_name"),
+            "deadline: latest": SubmissionDeadline.objects.order_by("-created_at")[:1],
+        }
+
+    def measure(self, context, repeat):
+        results = {}
+        for name, queryset in self.queries(context).items():
+            list(queryset.all())  # warm the page cache
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                list(queryset.all())
+                timings.append((time.perf_counter() - started) * 1000)
+            results[name] = {
+                "median_ms": statistics.median(timings),
+                "plan": queryset.explain(),
+            }
+        return results
+
+    # -------------------- REPORT --------------------
+    def print_report(self, results, plans):
+        self.stdout.write("")
+        self.stdout.write(f"{'query':<32}{'before ms':>12}{'after ms':>12}{'speed-up':>10}")
+        for name, row in results.items():
+            before, after = row["before"]["median_ms"], row["after"]["median_ms"]
+            self.stdout.write(f"{name:<32}{before:>12.3f}{after:>12.3f}{before / max(after, 1e-6):>9.1f}x")
+            if plans:
+                self.stdout.write(f"    before: {row['before']['plan']}".replace("\n", "\n            "))
+                self.stdout.write(f"    after:  {row['after']['plan']}".replace("\n", "\n            "))
@@ -0,0 +1,90 @@
+import json
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+
+# Each probe runs in a fresh interpreter so nothing is already imported.
+_SETUP = """
+import json, os, sys, time
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", {settings_module!r})
+t0 = time.perf_counter()
+import django
+django.setup()
+import importlib
+importlib.import_module({urlconf!r})
+result = {{"startup": time.perf_counter() - t0}}
+"""
+
+_PROBES = {
+    "startup": """
+result["torch_imported"] = "torch" in sys.modules
+""",
+    "eager_import": """
+t0 = time.perf_counter()
+import sentence_transformers
+result["startup"] += time.perf_counter() - t0
+""",
+    "first_page": """
+from django.test import Client
+t0 = time.perf_counter()
+status = Client(HTTP_HOST="localhost").get("/about/").status_code
+result["request"] = time.perf_counter() - t0
+result["status"] = status
+""",
+    "first_encode": """
+from main_app.embeddings import encode_local
+t0 = time.perf_counter()
+try:
+    encode_local(["warm up"])
+    result["request"] = time.perf_counter() - t0
+except Exception as exc:
+    result["error"] = type(exc).__name__
+""",
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure cold start: Django setup + URLconf import with lazy similarity imports, "
+        "the same with the old eager sentence_transformers import, the first plain page, "
+        "and the first SBERT encode."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--runs", type=int, default=3, help="Cold runs per probe (median reported).")
+        parser.add_argument("--skip-model", action="store_true", help="Do not time the first SBERT encode.")
+
+    def run_probe(self, name):
+        code = _SETUP.format(
+            settings_module=os.environ.get("DJANGO_SETTINGS_MODULE", "projectapprovalsystem.settings"),
+            urlconf=settings.ROOT_URLCONF,
+        ) + _PROBES[name] + "\nprint(json.dumps(result))\n"
+        out = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return json.loads(out.stdout.strip().splitlines()[-1])
+
+    def handle(self, *args, **options):
+        probes = [p for p in _PROBES if not (options["skip_model"] and p == "first_encode")]
+
+        for name in probes:
+            runs = [self.run_probe(name) for _ in range(options["runs"])]
+            startup = sorted(r["startup"] for r in runs)[len(runs) // 2]
+            line = f"{name:<14} startup {startup * 1000:8.1f} ms"
+
+            if "request" in runs[0]:
+                request = sorted(r["request"] for r in runs)[len(runs) // 2]
+                line += f"   first request {request * 1000:8.1f} ms"
+            if "error" in runs[0]:
+                line += f"   first request failed ({runs[0]['error']})"
+            if "torch_imported" in runs[0]:
+                line += f"   torch imported: {runs[0]['torch_imported']}"
+            self.stdout.write(line)
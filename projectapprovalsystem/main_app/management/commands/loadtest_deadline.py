@@ -0,0 +1,419 @@
+import hashlib
+import json
+import random
+import re
+import socketserver
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from datetime import timedelta
+from http.cookiejar import CookieJar
+from unittest import mock
+from urllib.error import HTTPError
+from urllib.parse import urlencode
+from urllib.request import HTTPCookieProcessor, HTTPRedirectHandler, Request, build_opener
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+import numpy as np
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.core.wsgi import get_wsgi_application
+from django.db import connection
+from django.test.utils import override_settings
+from django.urls import Resolver404, resolve, reverse
+from django.utils import timezone
+
+from main_app import ann, embeddings
+from main_app.embeddings import ensure_embeddings
+from main_app.models import Projectsubmission, SubmissionDeadline, UserRegistration
+from main_app.warmup import warm_similarity
+
+
+PASSWORD = "loadtest123"
+STUB_DIM = 384
+
+SUBJECTS = [
+    "attendance", "irrigation", "library", "news", "bus", "hostel", "crop", "expense",
+    "parking", "canteen", "blood bank", "exam", "placement", "traffic", "weather", "pharmacy",
+    "recycling", "alumni", "timetable", "fitness", "museum", "hospital", "tourism", "inventory",
+]
+METHODS = [
+    "face recognition", "sensor network", "chatbot", "recommendation engine", "blockchain ledger",
+    "image classifier", "route planner", "voice assistant", "qr code scanner", "sentiment analysis",
+    "anomaly detection", "mobile app", "web portal", "forecasting model", "rfid tracking",
+]
+TECHNOLOGIES = [
+    "Python, OpenCV", "Arduino, IoT", "Django, PostgreSQL", "Flutter, Firebase", "React, Node",
+    "TensorFlow, Android", "Kotlin, SQLite", "Java, Spring", "Solidity, Ethereum", "PHP, MySQL",
+]
+
+FEATURES = [
+    "dashboard", "notifications", "analytics", "login", "payments", "maps", "reports", "search",
+    "scheduling", "feedback", "offline mode", "admin panel", "export", "chat", "calendar", "alerts",
+    "barcode", "ratings", "booking", "tracking", "uploads", "reminders", "leaderboard", "audit log",
+]
+
+SYLLABLES = ["ka", "zor", "mi", "tel", "vu", "ran", "osh", "pe", "dri", "lum", "xa", "qen", "bo", "sty", "far", "ni"]
+
+
+def _codeword(rng):
+    return "".join(rng.choice(SYLLABLES) for _ in range(3))
+
+
+def project_fields(seed):
+    """
+    Project text for one seed (the same seed gives the same project). Invented
+    code words keep unrelated seeds below the duplicate threshold, so the
+    submissions phase exercises the save path and not just rejections.
+    """
+    rng = random.Random(seed)
+    return {
+        "title": f"{_codeword(rng).title()} {_codeword(rng).title()} {rng.choice(METHODS).title()}",
+        "description": (
+            f"{rng.choice(SUBJECTS)} {' '.join(_codeword(rng) for _ in range(6))} "
+            f"with {', '.join(rng.sample(FEATURES, 2))}"
+        ),
+        "technology_used": rng.choice(TECHNOLOGIES),
+    }
+
+
+def stub_encode(texts):
+    """Deterministic offline stand-in for SBERT: hashed bag of words, L2-normalised."""
+    vectors = np.zeros((len(texts), STUB_DIM), dtype=np.float32)
+    for row, text in enumerate(texts):
+        for token in re.findall(r"\w+", text.lower()):
+            bucket = int(hashlib.md5(token.encode("utf-8")).hexdigest()[:8], 16) % STUB_DIM
+            vectors[row, bucket] += 1.0
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+# -------------------- LOCAL SERVER --------------------
+class _ThreadingWSGIServer(socketserver.ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class _QuietHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class _QueryCounter:
+    """WSGI wrapper recording the DB queries each request ran, per view."""
+
+    def __init__(self, app):
+        self.app = app
+        self.lock = threading.Lock()
+        self.queries = defaultdict(list)
+
+    def __call__(self, environ, start_response):
+        try:
+            view = resolve(environ.get("PATH_INFO", "/")).url_name
+        except Resolver404:
+            view = "404"
+        count = [0]
+
+        def counter(execute, sql, params, many, context):
+            count[0] += 1
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(counter):
+            # consume the body here so every query runs inside the wrapper
+            body = b"".join(self.app(environ, start_response))
+        with self.lock:
+            self.queries[f"{environ['REQUEST_METHOD']} {view}"].append(count[0])
+        return [body]
+
+
+# -------------------- VIRTUAL USERS --------------------
+class _NoRedirect(HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class _VirtualUser:
+    def __init__(self, base_url, email, role, stats):
+        self.base_url = base_url
+        self.email = email
+        self.role = role
+        self.stats = stats
+        self.cookies = CookieJar()
+        self.opener = build_opener(HTTPCookieProcessor(self.cookies), _NoRedirect)
+
+    def csrf_token(self):
+        for cookie in self.cookies:
+            if cookie.name == settings.CSRF_COOKIE_NAME:
+                return cookie.value
+        return ""
+
+    def request(self, view, data=None):
+        path = reverse(view)
+        method = "POST" if data is not None else "GET"
+        body = None
+        headers = {}
+        if data is not None:
+            body = urlencode({**data, "csrfmiddlewaretoken": self.csrf_token()}).encode("utf-8")
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+
+        started = time.perf_counter()
+        try:
+            with self.opener.open(Request(self.base_url + path, body, headers, method=method)) as response:
+                response.read()
+                status = response.status
+        except HTTPError as exc:  # redirects land here too (3xx are not followed)
+            exc.read()
+            status = exc.code
+        self.stats.record(f"{method} {view}", time.perf_counter() - started, status)
+        return status
+
+    def login(self):
+        self.request("login_page")
+        return self.request("login_page", {
+            "email": self.email, "password": PASSWORD, "role": self.role,
+        })
+
+
+class _Stats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    def record(self, key, seconds, status):
+        with self.lock:
+            self.latencies[key].append(seconds)
+            if status >= 400:
+                self.errors[key] += 1
+
+
+class Command(BaseCommand):
+    help = (
+        "Deadline-crunch load harness: seed a throwaway database, then fire concurrent logins, "
+        "student_dashboard submissions and teacher dashboard loads at a local server and report "
+        "latency percentiles, throughput and DB queries per view."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--students", type=int, default=200, help="Students submitting during the peak.")
+        parser.add_argument("--teachers", type=int, default=10, help="Teachers (students are spread across them).")
+        parser.add_argument("--approved", type=int, default=500, help="Approved projects already in the corpus.")
+        parser.add_argument("--concurrency", type=int, default=16, help="Concurrent virtual users.")
+        parser.add_argument("--teacher-loads", type=int, default=5, help="Dashboard loads per teacher.")
+        parser.add_argument(
+            "--duplicate-ratio", type=float, default=0.1,
+            help="Share of submissions that copy an approved project.",
+        )
+        parser.add_argument(
+            "--stub-encoder", action="store_true",
+            help="Replace SBERT with a deterministic hashing encoder (offline, no model download).",
+        )
+        parser.add_argument("--json", dest="json_path", help="Also write the report to this file.")
+
+    def handle(self, *args, **options):
+        workdir = tempfile.TemporaryDirectory(prefix="loadtest-")
+        overrides = {"SIMILARITY_CORPUS_DIR": workdir.name, "DEBUG": False}
+        if options["stub_encoder"]:
+            overrides["SIMILARITY_EMBEDDING_SOCKET"] = ""
+
+        db_settings = settings.DATABASES["default"]
+        if db_settings["ENGINE"].endswith("sqlite3"):
+            # a file, not the in-memory default: the server threads need their own connections
+            db_settings.setdefault("TEST", {})["NAME"] = f"{workdir.name}/loadtest.sqlite3"
+
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            with override_settings(**overrides), self.encoder(options["stub_encoder"]):
+                ann.reset_approved_index()
+                report = self.run_load(options)
+        finally:
+            ann.reset_approved_index()
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            workdir.cleanup()
+
+        self.print_report(report)
+        if options["json_path"]:
+            with open(options["json_path"], "w") as fh:
+                json.dump(report, fh, indent=2)
+
+    def encoder(self, stub):
+        return mock.patch.object(embeddings, "encode_local", stub_encode) if stub else nullcontext()
+
+    # -------------------- SEEDING --------------------
+    def seed(self, options):
+        password = make_password(PASSWORD)  # hashed once; logins still verify it per request
+        today = timezone.now().date()
+        SubmissionDeadline.objects.create(deadline=today + timedelta(days=1), teacher_deadline=today + timedelta(days=3))
+
+        teachers = UserRegistration.objects.bulk_create([
+            UserRegistration(
+                full_name=f"Teacher {i}", email=f"teacher{i}@load.test", role="teacher",
+                password=password, is_verified=True,
+            )
+            for i in range(options["teachers"])
+        ])
+        students = UserRegistration.objects.bulk_create([
+            UserRegistration(
+                full_name=f"Student {i}", email=f"student{i}@load.test", role="student",
+                password=password, is_verified=True, assigned_teacher=teachers[i % len(teachers)],
+            )
+            for i in range(options["students"])
+        ])
+        alumni = UserRegistration.objects.bulk_create([
+            UserRegistration(
+                full_name=f"Alumnus {i}", email=f"alumnus{i}@load.test", role="student",
+                password=password, is_verified=True, assigned_teacher=teachers[i % len(teachers)],
+            )
+            for i in range(options["approved"])
+        ])
+
+        approved = [
+            Projectsubmission(
+                student=alumnus,
+                status="Approved",
+                reviewed_by=alumnus.assigned_teacher,
+                reviewed_at=timezone.now(),
+                **project_fields(i),
+            )
+            for i, alumnus in enumerate(alumni)
+        ]
+        approved = Projectsubmission.objects.bulk_create(approved)
+        ensure_embeddings(approved)
+        return teachers, students, approved
+
+    # -------------------- PHASES --------------------
+    def run_load(self, options):
+        started = time.perf_counter()
+        teachers, students, approved = self.seed(options)
+        seed_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        warm_similarity()
+        warm_seconds = time.perf_counter() - started
+
+        app = _QueryCounter(get_wsgi_application())
+        server = make_server(
+            "127.0.0.1", 0, app, server_class=_ThreadingWSGIServer, handler_class=_QuietHandler,
+        )
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        base_url = f"http://127.0.0.1:{server.server_port}"
+
+        stats = _Stats()
+        student_users = [_VirtualUser(base_url, s.email, "student", stats) for s in students]
+        teacher_users = [_VirtualUser(base_url, t.email, "teacher", stats) for t in teachers]
+        duplicates = int(len(student_users) * options["duplicate_ratio"])
+
+        def submit(index):
+            user = student_users[index]
+            if index < duplicates and approved:
+                source = approved[index % len(approved)]
+                data = {
+                    "title": source.title,
+                    "description": source.description,
+                    "technology_used": source.technology_used,
+                }
+            else:
+                data = project_fields(len(approved) + index)
+            return user.request("student_dashboard", data)
+
+        def load_teacher(user):
+            for _ in range(options["teacher_loads"]):
+                user.request("teacher_dashboard")
+
+        phases = [
+            ("logins", lambda pool: list(pool.map(lambda u: u.login(), student_users + teacher_users))),
+            ("submissions", lambda pool: list(pool.map(submit, range(len(student_users))))),
+            ("teacher dashboards", lambda pool: list(pool.map(load_teacher, teacher_users))),
+        ]
+        phase_seconds = {}
+        try:
+            with ThreadPoolExecutor(max_workers=options["concurrency"]) as pool:
+                for name, run in phases:
+                    started = time.perf_counter()
+                    run(pool)
+                    phase_seconds[name] = time.perf_counter() - started
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        views = {}
+        for key, samples in sorted(stats.latencies.items()):
+            ordered = sorted(samples)
+            queries = app.queries.get(key, [])
+            views[key] = {
+                "requests": len(ordered),
+                "errors": stats.errors.get(key, 0),
+                "p50_ms": percentile(ordered, 50) * 1000,
+                "p95_ms": percentile(ordered, 95) * 1000,
+                "p99_ms": percentile(ordered, 99) * 1000,
+                "queries_avg": sum(queries) / len(queries) if queries else 0,
+                "queries_max": max(queries, default=0),
+            }
+
+        return {
+            "options": {k: options[k] for k in (
+                "students", "teachers", "approved", "concurrency",
+                "teacher_loads", "duplicate_ratio", "stub_encoder",
+            )},
+            "seed_seconds": seed_seconds,
+            "warm_seconds": warm_seconds,
+            "phases": self.throughput(phase_seconds, views),
+            "submissions_saved": Projectsubmission.objects.filter(
+                student__in=students, status="Pending"
+            ).count(),
+            "views": views,
+        }
+
+    @staticmethod
+    def throughput(phase_seconds, views):
+        keys = {
+            "logins": ("GET login_page", "POST login_page"),
+            "submissions": ("POST student_dashboard",),
+            "teacher dashboards": ("GET teacher_dashboard",),
+        }
+        phases = {}
+        for name, seconds in phase_seconds.items():
+            requests = sum(views.get(key, {}).get("requests", 0) for key in keys[name])
+            phases[name] = {
+                "seconds": seconds,
+                "requests": requests,
+                "requests_per_second": requests / seconds if seconds else 0.0,
+            }
+        return phases
+
+    # -------------------- REPORT --------------------
+    def print_report(self, report):
+        opts = report["options"]
+        self.stdout.write(
+            f"{opts['students']} students, {opts['teachers']} teachers, {opts['approved']} approved projects, "
+            f"concurrency {opts['concurrency']}, encoder {'stub' if opts['stub_encoder'] else 'SBERT'}"
+        )
+        self.stdout.write(f"seed {report['seed_seconds']:.1f} s, warm-up {report['warm_seconds']:.1f} s")
+        for name, phase in report["phases"].items():
+            self.stdout.write(
+                f"{name:<20} {phase['requests']:>6} req in {phase['seconds']:7.2f} s "
+                f"= {phase['requests_per_second']:7.1f} req/s"
+            )
+        self.stdout.write(f"submissions saved as Pending: {report['submissions_saved']}")
+        self.stdout.write("")
+        self.stdout.write(
+            f"{'view':<26}{'reqs':>6}{'errs':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'queries':>9}{'max':>6}"
+        )
+        for key, row in report["views"].items():
+            line = (
+                f"{key:<26}{row['requests']:>6}{row['errors']:>6}{row['p50_ms']:>10.1f}"
+                f"{row['p95_ms']:>10.1f}{row['p99_ms']:>10.1f}{row['queries_avg']:>9.1f}{row['queries_max']:>6}"
+            )
+            self.stdout.write(self.style.ERROR(line) if row["errors"] else line)
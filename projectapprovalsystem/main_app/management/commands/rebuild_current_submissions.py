@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from main_app.submissions import rebuild_current_submissions
+
+
+class Command(BaseCommand):
+    help = "Recompute UserRegistration.current_submission and its cached status from the submissions table."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Rows per read and per bulk update.")
+
+    def handle(self, *args, **options):
+        changed = rebuild_current_submissions(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Updated {changed} student(s)."))
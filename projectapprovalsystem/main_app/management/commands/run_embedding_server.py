@@ -0,0 +1,51 @@
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from main_app.embedding_server import EmbeddingServer
+from main_app.embeddings import SBERT_MODEL_NAME, encode_local
+
+
+class Command(BaseCommand):
+    help = "Serve SBERT embeddings to local workers over a UNIX domain socket."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--socket",
+            default=getattr(settings, "SIMILARITY_EMBEDDING_SOCKET", ""),
+            help="Socket path (defaults to SIMILARITY_EMBEDDING_SOCKET).",
+        )
+        parser.add_argument("--max-batch", type=int, default=64, help="Most texts encoded in one batch.")
+        parser.add_argument(
+            "--max-wait-ms", type=float, default=5.0,
+            help="How long to wait for more requests before encoding a partial batch.",
+        )
+
+    def handle(self, *args, **options):
+        path = options["socket"]
+        if not path:
+            raise CommandError("No socket path: pass --socket or set SIMILARITY_EMBEDDING_SOCKET.")
+
+        if os.path.exists(path):
+            os.remove(path)  # stale socket from a previous run
+
+        self.stdout.write(f"Loading {SBERT_MODEL_NAME}...")
+        encode_local(["warm up"])
+
+        server = EmbeddingServer(
+            path,
+            encode_fn=encode_local,
+            max_batch=options["max_batch"],
+            max_wait=options["max_wait_ms"] / 1000,
+        )
+        os.chmod(path, 0o660)
+        self.stdout.write(self.style.SUCCESS(f"Embedding server listening on {path}"))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            if os.path.exists(path):
+                os.remove(path)
@@ -0,0 +1,60 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from main_app.duplicates import refresh_stale_candidates
+from main_app.jobs import claim_next_job, requeue_stale_jobs, run_job
+from main_app.warmup import warm_similarity
+
+
+class Command(BaseCommand):
+    help = "Consume queued duplicate checks (SimilarityJob rows) for SIMILARITY_ASYNC submissions."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--poll-interval", type=float, default=1.0,
+            help="Seconds to sleep when the queue is empty.",
+        )
+        parser.add_argument("--once", action="store_true", help="Drain the queue and exit.")
+        parser.add_argument("--skip-warmup", action="store_true", help="Do not load the model before polling.")
+        parser.add_argument(
+            "--sweep-interval", type=float, default=60.0,
+            help="Seconds between sweeps for pending projects whose duplicate candidates are stale.",
+        )
+
+    def handle(self, *args, **options):
+        if not options["skip_warmup"]:
+            self.stdout.write("Warming the similarity engine...")
+            warm_similarity()
+
+        requeued = requeue_stale_jobs()
+        if requeued:
+            self.stdout.write(f"Requeued {requeued} stale job(s).")
+
+        self.stdout.write(self.style.SUCCESS("Similarity worker started."))
+        last_sweep = None
+        try:
+            while True:
+                close_old_connections()
+                job = claim_next_job()
+                if job is None:
+                    # idle: score what the teacher dashboards would otherwise miss
+                    if last_sweep is None or time.monotonic() - last_sweep >= options["sweep_interval"]:
+                        refreshed = refresh_stale_candidates()
+                        last_sweep = time.monotonic()
+                        if refreshed:
+                            self.stdout.write(f"Refreshed duplicate candidates of {refreshed} project(s).")
+                    if options["once"]:
+                        break
+                    time.sleep(options["poll_interval"])
+                    continue
+
+                started = time.perf_counter()
+                job = run_job(job)
+                self.stdout.write(
+                    f"job {job.id} project {job.project_id}: {job.status} "
+                    f"in {(time.perf_counter() - started) * 1000:.0f} ms"
+                )
+        except KeyboardInterrupt:
+            pass
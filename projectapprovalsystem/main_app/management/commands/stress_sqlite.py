@@ -0,0 +1,162 @@
+import json
+import statistics
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection, connections
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from main_app import deadlines
+from main_app.models import SubmissionDeadline, UserRegistration
+
+
+class Command(BaseCommand):
+    help = (
+        "Have concurrent students submit a project on student_dashboard and reload it against a "
+        "throwaway SQLite file, once with SQLite's defaults and once with SQLITE_TUNING_OPTIONS."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--students", type=int, default=200, help="Students, one submission each.")
+        parser.add_argument("--threads", type=int, default=16, help="Concurrent clients.")
+        parser.add_argument(
+            "--busy-timeout", type=float, default=5.0,
+            help="Seconds a default-profile connection waits for a lock (Django's default is 5); "
+                 "the tuned profile uses SQLITE_BUSY_TIMEOUT_MS.",
+        )
+        parser.add_argument("--json", dest="json_path", help="Also write the results to this file.")
+
+    def handle(self, *args, **options):
+        db_settings = settings.DATABASES["default"]
+        if not db_settings["ENGINE"].endswith("sqlite3"):
+            raise CommandError("stress_sqlite only runs against the SQLite backend.")
+        original_options = dict(db_settings.get("OPTIONS", {}))
+        plain = {
+            key: value for key, value in original_options.items()
+            if key not in settings.SQLITE_TUNING_OPTIONS
+        }
+        profiles = {
+            "default": {**plain, "timeout": options["busy_timeout"]},
+            "tuned": {**plain, **settings.SQLITE_TUNING_OPTIONS},
+        }
+
+        results = {}
+        try:
+            for name, sqlite_options in profiles.items():
+                db_settings["OPTIONS"] = sqlite_options
+                results[name] = self.run_profile(name, options)
+        finally:
+            db_settings["OPTIONS"] = original_options
+
+        self.print_report(results)
+        if options["json_path"]:
+            with open(options["json_path"], "w") as fh:
+                json.dump(results, fh, indent=2)
+
+    # -------------------- ONE PROFILE --------------------
+    def run_profile(self, name, options):
+        workdir = tempfile.TemporaryDirectory(prefix="stress-sqlite-")
+        test_settings = settings.DATABASES["default"].setdefault("TEST", {})
+        previous_test_name = test_settings.get("NAME")
+        test_settings["NAME"] = f"{workdir.name}/{name}.sqlite3"
+
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("PRAGMA journal_mode")
+                journal_mode = cursor.fetchone()[0]
+            sessions = self.seed(options["students"])
+            connection.close()  # every worker opens its own
+
+            outcomes = Counter()
+            timings = []
+            lock = threading.Lock()
+
+            def student_round(session_key):
+                client = Client()
+                client.cookies[settings.SESSION_COOKIE_NAME] = session_key
+                started = time.perf_counter()
+                try:
+                    response = client.post(reverse("student_dashboard"), {
+                        "title": f"Stress project {session_key[:8]}",
+                        "description": f"Concurrent submission {session_key}",
+                        "technology_used": "Django",
+                    })
+                    response = client.get(reverse("student_dashboard"))
+                    outcome = "ok" if response.status_code == 200 else f"http {response.status_code}"
+                except OperationalError as exc:
+                    outcome = "locked" if "locked" in str(exc) else f"error: {exc}"
+                finally:
+                    connections.close_all()
+                with lock:
+                    outcomes[outcome] += 1
+                    timings.append((time.perf_counter() - started) * 1000)
+
+            started = time.perf_counter()
+            # queue the similarity check like a deployment with a worker: the write path, not the model
+            with override_settings(ALLOWED_HOSTS=["testserver"], SIMILARITY_ASYNC=True), \
+                    ThreadPoolExecutor(options["threads"]) as pool:
+                list(pool.map(student_round, sessions))
+            elapsed = time.perf_counter() - started
+
+            submitted = UserRegistration.objects.filter(role="student").exclude(current_submission=None).count()
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            if previous_test_name is None:
+                test_settings.pop("NAME", None)
+            else:
+                test_settings["NAME"] = previous_test_name
+            workdir.cleanup()
+
+        timings.sort()
+        return {
+            "journal_mode": journal_mode,
+            "outcomes": dict(outcomes),
+            "saved_submissions": submitted,
+            "rounds_per_s": len(sessions) / elapsed,
+            "median_ms": statistics.median(timings),
+            "p95_ms": timings[int(len(timings) * 0.95) - 1],
+        }
+
+    def seed(self, count):
+        """Students with an open deadline and a signed-in session each; returns the session keys."""
+        deadlines.invalidate_deadline_cache()
+        today = timezone.localdate()
+        SubmissionDeadline.objects.create(deadline=today + timedelta(days=7), teacher_deadline=today + timedelta(days=9))
+        students = UserRegistration.objects.bulk_create([
+            UserRegistration(
+                full_name=f"Stress Student {i}", email=f"stress{i}@sqlite.test", role="student",
+                password="!", is_verified=True,
+            )
+            for i in range(count)
+        ])
+        keys = []
+        for student in students:
+            session = SessionStore()
+            session["user_id"] = student.id
+            session["role"] = student.role
+            session.create()
+            keys.append(session.session_key)
+        return keys
+
+    # -------------------- REPORT --------------------
+    def print_report(self, results):
+        self.stdout.write(
+            f"{'profile':<10}{'journal':>9}{'saved':>8}{'rounds/s':>10}{'median ms':>11}{'p95 ms':>10}  outcomes"
+        )
+        for name, row in results.items():
+            outcomes = ", ".join(f"{key}={value}" for key, value in sorted(row["outcomes"].items()))
+            self.stdout.write(
+                f"{name:<10}{row['journal_mode']:>9}{row['saved_submissions']:>8}{row['rounds_per_s']:>10.1f}"
+                f"{row['median_ms']:>11.1f}{row['p95_ms']:>10.1f}  {outcomes}"
+            )
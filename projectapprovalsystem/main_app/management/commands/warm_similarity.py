@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from main_app.warmup import warm_similarity
+
+
+class Command(BaseCommand):
+    help = "Load the SBERT model, run a dummy batch and build the approved-corpus embedding cache."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--skip-corpus", action="store_true",
+            help="Only warm the model, do not build/map the approved corpus.",
+        )
+
+    def handle(self, *args, **options):
+        timings = warm_similarity(build_corpus=not options["skip_corpus"])
+        for step, seconds in timings.items():
+            self.stdout.write(f"{step:<8} {seconds * 1000:9.1f} ms")
+        self.stdout.write(self.style.SUCCESS("Similarity engine is warm."))
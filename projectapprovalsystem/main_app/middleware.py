@@ -0,0 +1,16 @@
+from functools import partial
+
+from django.utils.functional import SimpleLazyObject
+
+from .access import get_app_user
+
+
+class CurrentUserMiddleware:
+    """Expose the signed-in UserRegistration as ``request.app_user`` (see access.py)."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.app_user = SimpleLazyObject(partial(get_app_user, request))
+        return self.get_response(request)
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-16 22:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0015_remove_userregistration_admin_code_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='projectsubmission',
+            name='content_hash',
+            field=models.CharField(blank=True, default='', editable=False, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='projectsubmission',
+            name='embedding',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='projectsubmission',
+            name='embedding_model',
+            field=models.CharField(blank=True, default='', editable=False, max_length=100),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.7 on 2026-10-16 22:47
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0016_projectsubmission_embedding'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='projectsubmission',
+            name='candidates_hash',
+            field=models.CharField(blank=True, default='', editable=False, max_length=64),
+        ),
+        migrations.CreateModel(
+            name='DuplicateCandidate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('semantic_score', models.FloatField()),
+                ('fuzzy_score', models.FloatField()),
+                ('score', models.PositiveSmallIntegerField()),
+                ('computed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('other_project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='main_app.projectsubmission')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='duplicate_candidates', to='main_app.projectsubmission')),
+            ],
+            options={
+                'ordering': ['-score'],
+                'unique_together': {('project', 'other_project')},
+            },
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.7 on 2026-10-16 23:05
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0017_duplicatecandidate'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='projectsubmission',
+            name='similar_to',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='main_app.projectsubmission'),
+        ),
+        migrations.AddField(
+            model_name='projectsubmission',
+            name='similarity_score',
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='projectsubmission',
+            name='similarity_status',
+            field=models.CharField(blank=True, choices=[('', 'Not queued'), ('checking', 'Checking'), ('clear', 'Clear'), ('duplicate', 'Duplicate'), ('failed', 'Check failed')], default='', max_length=10),
+        ),
+        migrations.CreateModel(
+            name='SimilarityJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='queued', max_length=10)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similarity_jobs', to='main_app.projectsubmission')),
+            ],
+            options={
+                'ordering': ['created_at', 'id'],
+                'indexes': [models.Index(fields=['status', 'created_at'], name='main_app_si_status_d8b709_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.7 on 2026-10-16 23:29
+
+from django.db import migrations, models
+
+
+def analyze(apps, schema_editor):
+    # Without statistics for the new indexes SQLite may pick user_role_idx
+    # (role has two values) over the assigned_teacher FK index.
+    if schema_editor.connection.vendor in ('sqlite', 'postgresql'):
+        schema_editor.execute('ANALYZE')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0018_similarity_job'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='projectsubmission',
+            index=models.Index(fields=['student', 'status'], name='submission_student_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='projectsubmission',
+            index=models.Index(fields=['status', 'id'], name='submission_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='submissiondeadline',
+            index=models.Index(fields=['-created_at'], name='deadline_latest_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userregistration',
+            index=models.Index(fields=['role', 'id'], name='user_role_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userregistration',
+            index=models.Index(condition=models.Q(('is_deleted', False), ('is_verified', False)), fields=['role', 'id'], name='user_pending_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='userregistration',
+            index=models.Index(condition=models.Q(('is_deleted', True)), fields=['-id'], name='user_deleted_idx'),
+        ),
+        migrations.RunPython(analyze, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.7 on 2026-10-16 23:37
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def fill_current_submission(apps, schema_editor):
+    # Same rule as submissions.rebuild_current_submissions, on the historical models
+    UserRegistration = apps.get_model('main_app', 'UserRegistration')
+    Projectsubmission = apps.get_model('main_app', 'Projectsubmission')
+    live = ('Pending', 'Approved')
+
+    current = {}
+    rows = Projectsubmission.objects.order_by('student_id', 'created_at', 'id').values_list('student_id', 'id', 'status')
+    for student_id, project_id, status in rows.iterator():
+        held = current.get(student_id)
+        if held is None or status in live or held[1] not in live:
+            current[student_id] = (project_id, status)
+
+    for student_id, (project_id, status) in current.items():
+        UserRegistration.objects.filter(id=student_id).update(
+            current_submission_id=project_id, current_submission_status=status,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0019_view_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userregistration',
+            name='current_submission',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='main_app.projectsubmission'),
+        ),
+        migrations.AddField(
+            model_name='userregistration',
+            name='current_submission_status',
+            field=models.CharField(blank=True, default='', editable=False, max_length=10),
+        ),
+        migrations.RunPython(fill_current_submission, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-16 23:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0020_current_submission'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userregistration',
+            name='submission_version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
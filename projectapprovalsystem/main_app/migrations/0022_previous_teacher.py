@@ -0,0 +1,24 @@
+# Generated by Django 5.2.7 on 2026-10-17 00:23
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0021_submission_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userregistration',
+            name='previous_teacher',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='main_app.userregistration'),
+        ),
+        migrations.AddField(
+            model_name='userregistration',
+            name='unassigned_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
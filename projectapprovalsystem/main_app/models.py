@@ -56,9 +56,68 @@ class UserRegistration(models.Model):
      # ✅ Soft delete flag
     is_deleted = models.BooleanField(default=False)
     deleted_at = models.DateTimeField(null=True, blank=True)
+
+    # Guide a student lost when that teacher was soft-deleted, kept by
+    # accounts.py so restoring the teacher can reattach the student
+    previous_teacher = models.ForeignKey(
+        'self',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name='+',
+    )
+    unassigned_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    # Student's live (else latest) submission and its status, kept by submissions.py
+    current_submission = models.ForeignKey(
+        'Projectsubmission',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name='+',
+    )
+    current_submission_status = models.CharField(max_length=10, blank=True, default='', editable=False)
+    # bumped whenever check_project_status would answer differently (its ETag)
+    submission_version = models.PositiveIntegerField(default=0, editable=False)
+
+    class Meta:
+        indexes = [
+            # Partial indexes only on boolean predicates: Django writes those
+            # inline ("NOT is_verified"), so SQLite can match them against the
+            # index condition. Conditions on parameters (role = %s) cannot be
+            # matched by SQLite and go in the index columns instead.
+            models.Index(fields=['role', 'id'], name='user_role_idx'),
+            # pending teachers / students waiting for the admin
+            models.Index(
+                fields=['role', 'id'],
+                condition=models.Q(is_verified=False, is_deleted=False),
+                name='user_pending_idx',
+            ),
+            # "Recently deleted", newest first
+            models.Index(fields=['-id'], condition=models.Q(is_deleted=True), name='user_deleted_idx'),
+        ]
+
+    # Written only with QuerySet.update() by submissions.py and accounts.py
+    MAINTAINED_FIELDS = (
+        'current_submission', 'current_submission_status', 'submission_version',
+        'previous_teacher', 'unassigned_at',
+    )
+
     def __str__(self):
         return f"{self.full_name} ({self.role})"
 
+    def save(self, *args, **kwargs):
+        # A full save of an instance loaded earlier in the request must not
+        # write back a stale pointer or roll the version back.
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.MAINTAINED_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
     def set_password(self, raw_password):
         self.password = make_password(raw_password)
 
@@ -121,11 +180,101 @@ class Projectsubmission(models.Model):
     reviewed_by = models.ForeignKey(UserRegistration, on_delete=models.SET_NULL, null=True, blank=True, related_name='reviewed_projects')
     reviewed_at = models.DateTimeField(null=True, blank=True)
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='Pending')
-    feedback = models.TextField(blank=True, null=True)  
+    feedback = models.TextField(blank=True, null=True)
+
+    # SBERT embedding of title + description + technology (see embeddings.py)
+    embedding = models.BinaryField(null=True, blank=True, editable=False)
+    embedding_model = models.CharField(max_length=100, blank=True, default="", editable=False)
+    content_hash = models.CharField(max_length=64, blank=True, default="", editable=False)
+    # content_hash the DuplicateCandidate rows of this project were computed for
+    candidates_hash = models.CharField(max_length=64, blank=True, default="", editable=False)
+
+    # Result of the background duplicate check against approved projects (see jobs.py)
+    SIMILARITY_CHOICES = [
+        ('', 'Not queued'),
+        ('checking', 'Checking'),
+        ('clear', 'Clear'),
+        ('duplicate', 'Duplicate'),
+        ('failed', 'Check failed'),
+    ]
+    similarity_status = models.CharField(max_length=10, choices=SIMILARITY_CHOICES, blank=True, default='')
+    similarity_score = models.PositiveSmallIntegerField(null=True, blank=True)
+    similar_to = models.ForeignKey(
+        'self',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+    )
+
+    class Meta:
+        indexes = [
+            # a student's live submission (status in Pending/Approved)
+            models.Index(fields=['student', 'status'], name='submission_student_status_idx'),
+            # the approved corpus (duplicate checks, ANN rebuild, admin list)
+            models.Index(fields=['status', 'id'], name='submission_status_idx'),
+        ]
+
     def __str__(self):
         return f"{self.title} by {self.student.full_name}"
     
 
+# -------------------- DUPLICATE CANDIDATE MODEL --------------------
+class DuplicateCandidate(models.Model):
+    """A precomputed pair of submissions that scored above the duplicate threshold."""
+    project = models.ForeignKey(
+        Projectsubmission,
+        on_delete=models.CASCADE,
+        related_name='duplicate_candidates',
+    )
+    other_project = models.ForeignKey(
+        Projectsubmission,
+        on_delete=models.CASCADE,
+        related_name='+',
+    )
+    semantic_score = models.FloatField()
+    fuzzy_score = models.FloatField()
+    score = models.PositiveSmallIntegerField()
+    computed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        unique_together = ('project', 'other_project')
+        ordering = ['-score']
+
+    def __str__(self):
+        return f"{self.project_id} ~ {self.other_project_id} ({self.score}%)"
+
+
+# -------------------- SIMILARITY JOB MODEL --------------------
+class SimilarityJob(models.Model):
+    """A queued duplicate check, consumed by ``manage.py run_similarity_worker``."""
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    project = models.ForeignKey(
+        Projectsubmission,
+        on_delete=models.CASCADE,
+        related_name='similarity_jobs',
+    )
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(default=timezone.now)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['created_at', 'id']
+        indexes = [models.Index(fields=['status', 'created_at'])]
+
+    def __str__(self):
+        return f"Similarity check for {self.project_id} ({self.status})"
+
+
 # -------------------- SUBMISSION DEADLINE MODEL --------------------
 
 class SubmissionDeadline(models.Model):
@@ -133,5 +282,8 @@ class SubmissionDeadline(models.Model):
     teacher_deadline = models.DateField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [models.Index(fields=['-created_at'], name='deadline_latest_idx')]
+
     def __str__(self):
         return f"Student Deadline: {self.deadline} | Teacher Deadline: {self.teacher_deadline or 'Not Set'}"
\ No newline at end of file
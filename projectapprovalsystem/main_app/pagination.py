@@ -0,0 +1,87 @@
+from functools import reduce
+from operator import or_
+
+from django.db.models import Q
+
+
+# -------------------- KEYSET (CURSOR) PAGINATION --------------------
+# Pages are fetched with ``WHERE id > <last id seen> ORDER BY id LIMIT n``
+# (or the descending equivalent), which walks the primary-key index, so page
+# 400 costs the same as page 1. OFFSET pagination re-reads every skipped row.
+
+PAGE_SIZE = 25
+SEARCH_PARAM = "q"
+
+
+class KeysetPage:
+    """One page of rows plus the cursor and query strings for the next one."""
+
+    def __init__(self, items, param, cursor, next_cursor, search, request):
+        self.items = items
+        self.param = param
+        self.cursor = cursor
+        self.next_cursor = next_cursor
+        self.search = search
+        self._request = request
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __bool__(self):
+        return bool(self.items)
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def _query(self, cursor):
+        params = self._request.GET.copy()
+        params.pop("partial", None)
+        if cursor is None:
+            params.pop(self.param, None)
+        else:
+            params[self.param] = cursor
+        return params.urlencode()
+
+    @property
+    def next_query(self):
+        return self._query(self.next_cursor) if self.has_next else None
+
+    @property
+    def first_query(self):
+        """Query string back to the first page (None when already on it)."""
+        return self._query(None) if self.cursor is not None else None
+
+
+def parse_cursor(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def search_filter(search, fields):
+    return reduce(or_, (Q(**{f"{field}__icontains": search}) for field in fields))
+
+
+def keyset_page(request, queryset, param, per_page=PAGE_SIZE, descending=False, search_fields=()):
+    """
+    The page of ``queryset`` after the id in ``request.GET[param]``.
+
+    Rows are ordered by id (descending for newest-first lists). When
+    ``search_fields`` are given, ``?q=`` narrows the rows first.
+    """
+    cursor = parse_cursor(request.GET.get(param))
+    search = request.GET.get(SEARCH_PARAM, "").strip()
+
+    if search and search_fields:
+        queryset = queryset.filter(search_filter(search, search_fields))
+    if cursor is not None:
+        queryset = queryset.filter(**{"id__lt" if descending else "id__gt": cursor})
+
+    rows = list(queryset.order_by("-id" if descending else "id")[:per_page + 1])
+    next_cursor = rows[per_page - 1].id if len(rows) > per_page else None
+    return KeysetPage(rows[:per_page], param, cursor, next_cursor, search, request)
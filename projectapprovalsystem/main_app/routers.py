@@ -0,0 +1,130 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils.functional import SimpleLazyObject
+
+
+# -------------------- READ REPLICAS --------------------
+# Views marked @replica_reads may send their SELECTs on main_app tables to
+# one of settings.DATABASE_REPLICAS. Everything else stays on the primary:
+#   - any other view, and any non-GET/HEAD request;
+#   - the rest of a request once it has written anything (read-after-write),
+#     and reads inside a transaction on the primary;
+#   - a client for REPLICA_PIN_SECONDS after one of its requests wrote, so
+#     the page after a redirect never shows the replica's older copy;
+#   - sessions, auth and admin tables (login must see its own session).
+#   - data rendered into a {% cache %} block (see read_from_primary).
+# ReplicaRoutingMiddleware sets up the routing state per request; code
+# running outside a request (commands, the similarity worker) uses the
+# primary only.
+
+PIN_COOKIE = "primary_pin"
+
+READ_METHODS = ('GET', 'HEAD')
+
+
+class Routing:
+    def __init__(self):
+        self.replica_reads = False  # set by the middleware once the view is known
+        self.wrote = False
+
+
+_routing = ContextVar("main_app_db_routing", default=None)
+
+
+def replica_reads(view):
+    """Mark ``view`` as safe to read from a replica (it must not depend on its own writes)."""
+    view.replica_reads = True
+    return view
+
+
+@contextmanager
+def primary_reads():
+    """Send this request's reads to the primary inside the block."""
+    routing = _routing.get()
+    if routing is None:
+        yield
+        return
+    previous = routing.replica_reads
+    routing.replica_reads = False
+    try:
+        yield
+    finally:
+        routing.replica_reads = previous
+
+
+def read_from_primary(func):
+    """
+    ``func()``, evaluated on first use with primary_reads().
+
+    For context rendered inside {% cache %} blocks: writes bump the fragment
+    token on the primary, so a miss filled from a lagging replica would store
+    the old rows under the new token until the fragment times out.
+    """
+    def evaluate():
+        with primary_reads():
+            return func()
+    return SimpleLazyObject(evaluate)
+
+
+def replica_aliases():
+    return getattr(settings, "DATABASE_REPLICAS", [])
+
+
+def pin_seconds():
+    return getattr(settings, "REPLICA_PIN_SECONDS", 5)
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        routing = _routing.get()
+        replicas = replica_aliases()
+        if (
+            routing is None or not routing.replica_reads or routing.wrote
+            or not replicas or model._meta.app_label != 'main_app'
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        routing = _routing.get()
+        if routing is not None and model._meta.app_label == 'main_app':
+            routing.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # replicas hold the primary's rows: any pair of aliases is the same database
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in replica_aliases()
+
+
+class ReplicaRoutingMiddleware:
+    """Per-request routing state for PrimaryReplicaRouter, plus the pin cookie after writes."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        routing = Routing()
+        token = _routing.set(routing)
+        request._db_routing = routing
+        try:
+            response = self.get_response(request)
+        finally:
+            _routing.reset(token)
+        if routing.wrote and replica_aliases():
+            response.set_cookie(PIN_COOKIE, "1", max_age=pin_seconds(), httponly=True, samesite='Lax')
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._db_routing.replica_reads = (
+            getattr(view_func, 'replica_reads', False)
+            and request.method in READ_METHODS
+            and PIN_COOKIE not in request.COOKIES
+        )
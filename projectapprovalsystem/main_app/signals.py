@@ -0,0 +1,59 @@
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from .access import forget_app_user
+from .deadlines import invalidate_deadline_cache
+from .fragments import bump, bump_projects, student_scope, teacher_scope
+from .models import Projectsubmission, SubmissionDeadline, UserRegistration
+from .submissions import refresh_current_submission
+
+
+# -------------------- DEADLINE CACHE --------------------
+@receiver(post_save, sender=SubmissionDeadline)
+@receiver(post_delete, sender=SubmissionDeadline)
+def deadline_changed(sender, **kwargs):
+    invalidate_deadline_cache()
+
+
+# -------------------- CURRENT SUBMISSION --------------------
+@receiver(post_save, sender=Projectsubmission)
+@receiver(post_delete, sender=Projectsubmission)
+def submission_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        refresh_current_submission(instance.student_id)
+
+
+# -------------------- DASHBOARD FRAGMENTS --------------------
+@receiver(post_save, sender=Projectsubmission)
+def submission_saved_fragments(sender, instance, raw=False, **kwargs):
+    if not raw:
+        bump_projects([instance.id])
+
+
+@receiver(pre_delete, sender=Projectsubmission)
+def submission_deleted_fragments(sender, instance, **kwargs):
+    # before the cascade drops the candidate rows that name its partners
+    bump_projects([instance.id])
+
+
+@receiver(pre_save, sender=UserRegistration)
+def remember_previous_guide(sender, instance, raw=False, **kwargs):
+    instance._previous_teacher_id = None
+    if not raw and not instance._state.adding:
+        instance._previous_teacher_id = (
+            sender.objects.filter(pk=instance.pk).values_list('assigned_teacher_id', flat=True).first()
+        )
+
+
+@receiver(post_save, sender=UserRegistration)
+@receiver(post_delete, sender=UserRegistration)
+def user_fragments_changed(sender, instance, raw=False, **kwargs):
+    """Names, assignment, verification and deletion show on both dashboards."""
+    if raw:
+        return
+    forget_app_user(instance.id)
+    scopes = {student_scope(instance.id), teacher_scope(instance.id)}
+    for teacher_id in (instance.assigned_teacher_id, getattr(instance, '_previous_teacher_id', None)):
+        if teacher_id:
+            scopes.add(teacher_scope(teacher_id))
+    bump(*scopes)
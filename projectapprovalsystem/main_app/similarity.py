@@ -0,0 +1,110 @@
+from typing import NamedTuple
+
+import numpy as np
+from django.conf import settings
+from rapidfuzz import fuzz, process
+
+from .embeddings import ensure_embeddings, submission_text
+
+
+# -------------------- SCORING SETTINGS --------------------
+SEMANTIC_WEIGHT = 0.6
+FUZZY_WEIGHT = 0.4
+
+# Combined score at which two projects are flagged as duplicates
+DUPLICATE_THRESHOLD = 60
+
+# rapidfuzz worker threads for cdist (-1 = all cores)
+FUZZY_WORKERS = getattr(settings, "SIMILARITY_FUZZY_WORKERS", -1)
+
+
+class Match(NamedTuple):
+    index: int
+    semantic: float
+    fuzzy: float
+    score: int
+
+
+def combined_score(semantic, fuzzy):
+    """Weighted score in percent; works on scalars and numpy arrays alike."""
+    score = np.rint((np.asarray(semantic) * SEMANTIC_WEIGHT) + (np.asarray(fuzzy) * FUZZY_WEIGHT))
+    return int(score) if score.ndim == 0 else score.astype(int)
+
+
+# -------------------- VECTORISED SCORES --------------------
+def cosine_scores(query_emb, matrix):
+    """Cosine similarity (percent) of one normalised query against every row of ``matrix``."""
+    if len(matrix) == 0:
+        return np.zeros(0, dtype=np.float32)
+    return np.asarray(matrix) @ np.asarray(query_emb) * 100
+
+
+def fuzzy_scores(query_text, texts, scorer=fuzz.WRatio, score_cutoff=None):
+    """Score ``query_text`` against all ``texts`` in one rapidfuzz call (below cutoff -> 0)."""
+    if not texts:
+        return np.zeros(0, dtype=np.float32)
+    return process.cdist(
+        [query_text],
+        texts,
+        scorer=scorer,
+        score_cutoff=score_cutoff,
+        dtype=np.float32,
+        workers=FUZZY_WORKERS,
+    )[0]
+
+
+def top_matches(query_text, query_emb, texts, matrix, top_k=None, threshold=0):
+    """
+    Rank candidates by combined SBERT + WRatio score.
+
+    Only candidates whose semantic score can still reach ``threshold`` go
+    through the fuzzy scorer, and those share a single ``score_cutoff``.
+    Returns at most ``top_k`` matches with ``score >= threshold``, best first.
+    """
+    semantic = cosine_scores(query_emb, matrix)
+    fuzzy = np.zeros(len(texts), dtype=np.float32)
+
+    # one point of slack so rounding can never push a skipped pair over the line
+    floor = threshold - 1
+    reachable = np.flatnonzero(semantic * SEMANTIC_WEIGHT + 100 * FUZZY_WEIGHT >= floor)
+    if len(reachable):
+        cutoff = max(0.0, (floor - float(semantic[reachable].max()) * SEMANTIC_WEIGHT) / FUZZY_WEIGHT)
+        fuzzy[reachable] = fuzzy_scores(
+            query_text,
+            [texts[i] for i in reachable],
+            score_cutoff=cutoff or None,
+        )
+
+    scores = combined_score(semantic, fuzzy)
+    order = np.argsort(-scores, kind="stable")
+    order = order[scores[order] >= threshold][:top_k]
+    return [Match(int(i), float(semantic[i]), float(fuzzy[i]), int(scores[i])) for i in order]
+
+
+# -------------------- PROJECT HELPERS --------------------
+def rank_projects(query_text, query_emb, projects, top_k=None, threshold=0):
+    """Return ``[(project, Match), ...]`` for the best scoring ``projects``."""
+    projects = list(projects)
+    if not projects:
+        return []
+    matrix = ensure_embeddings(projects)
+    texts = [submission_text(p) for p in projects]
+    matches = top_matches(query_text, query_emb, texts, matrix, top_k=top_k, threshold=threshold)
+    return [(projects[m.index], m) for m in matches]
+
+
+def first_fuzzy_match(query_fields, candidate_fields, scorer=fuzz.token_sort_ratio, above=75):
+    """
+    Index of the first candidate where any field scores strictly above ``above``.
+
+    ``query_fields`` is a tuple of strings, ``candidate_fields`` a list of tuples
+    with the same arity; each field is scored in one cdist call.
+    """
+    if not candidate_fields:
+        return None
+    hit = np.zeros(len(candidate_fields), dtype=bool)
+    for position, query in enumerate(query_fields):
+        column = [fields[position] for fields in candidate_fields]
+        hit |= fuzzy_scores(query, column, scorer=scorer, score_cutoff=above) > above
+    found = np.flatnonzero(hit)
+    return int(found[0]) if len(found) else None
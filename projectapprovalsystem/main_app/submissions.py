@@ -0,0 +1,102 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models import F
+
+from .access import forget_app_user
+from .events import publish, student_channel
+from .models import Projectsubmission, UserRegistration
+
+
+# -------------------- CURRENT SUBMISSION POINTER --------------------
+# UserRegistration.current_submission is the submission a student's pages are
+# about: the live (Pending or Approved) one when there is one, otherwise the
+# most recent. current_submission_status caches its status, so "may this
+# student submit?" is answered from the user row alone.
+#
+# Saves and deletes keep it in step through signals.py; code that changes
+# status with QuerySet.update() calls refresh_current_submission() itself.
+#
+# submission_version counts those changes (and the background check's
+# updates) and is the ETag of check_project_status. Each bump is also
+# published to the student's status stream once the transaction commits.
+
+LIVE_STATUSES = ('Pending', 'Approved')
+
+
+def has_live_submission(student):
+    return student.current_submission_status in LIVE_STATUSES
+
+
+def pick_current_submission(student_id):
+    projects = Projectsubmission.objects.filter(student_id=student_id).only('id', 'status')
+    newest = ('-created_at', '-id')
+    return (
+        projects.filter(status__in=LIVE_STATUSES).order_by(*newest).first()
+        or projects.order_by(*newest).first()
+    )
+
+
+def refresh_current_submission(student_id):
+    """Recompute the pointer and cached status of one student. Returns the project."""
+    with transaction.atomic():
+        project = pick_current_submission(student_id)
+        UserRegistration.objects.filter(id=student_id).update(
+            current_submission=project,
+            current_submission_status=project.status if project else '',
+            submission_version=F('submission_version') + 1,
+        )
+        announce_change(student_id)
+    forget_app_user(student_id)
+    return project
+
+
+def bump_submission_version(student_id):
+    """Invalidate the student's status ETag after a change that keeps the pointer."""
+    UserRegistration.objects.filter(id=student_id).update(submission_version=F('submission_version') + 1)
+    announce_change(student_id)
+
+
+def announce_change(student_id):
+    transaction.on_commit(partial(publish, student_channel(student_id)))
+
+
+def submission_version(student_id):
+    return UserRegistration.objects.filter(id=student_id).values_list('submission_version', flat=True).first()
+
+
+def rebuild_current_submissions(batch_size=1000):
+    """
+    Recompute every student's pointer from the submissions table.
+    Returns the number of students whose pointer or status changed.
+    """
+    current = {}
+    rows = (
+        Projectsubmission.objects.order_by('student_id', 'created_at', 'id')
+        .values_list('student_id', 'id', 'status')
+    )
+    for student_id, project_id, status in rows.iterator(chunk_size=batch_size):
+        held = current.get(student_id)
+        # newer rows win, except that a live submission is never displaced by a closed one
+        if held is None or status in LIVE_STATUSES or held[1] not in LIVE_STATUSES:
+            current[student_id] = (project_id, status)
+
+    changed = []
+    students = UserRegistration.objects.filter(role='student').only(
+        'id', 'current_submission', 'current_submission_status',
+    )
+    for student in students.iterator(chunk_size=batch_size):
+        project_id, status = current.get(student.id, (None, ''))
+        if (student.current_submission_id, student.current_submission_status) != (project_id, status):
+            student.current_submission_id = project_id
+            student.current_submission_status = status
+            student.submission_version = F('submission_version') + 1
+            changed.append(student)
+
+    with transaction.atomic():
+        UserRegistration.objects.bulk_update(
+            changed, ['current_submission', 'current_submission_status', 'submission_version'],
+            batch_size=batch_size,
+        )
+    forget_app_user(*(student.id for student in changed))
+    return len(changed)
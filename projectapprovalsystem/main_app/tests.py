@@ -1,24 +1,71 @@
-from django.test import TestCase, Client
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, Client, override_settings
 from django.urls import reverse, resolve
 from django.utils import timezone
 from datetime import date, timedelta
+from io import StringIO
+import asyncio
+from unittest import mock
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from asgiref.sync import sync_to_async
+from django.apps import apps
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection, connections, transaction
+from django.test.utils import CaptureQueriesContext
+
+import numpy as np
+from rapidfuzz import fuzz
 
 from main_app.models import (
     UserRegistration,
     Project,
     Projectsubmission,
-    SubmissionDeadline
+    SubmissionDeadline,
+    DuplicateCandidate,
+    SimilarityJob
 )
-from main_app import views
+from main_app import ann, corpus, deadlines, embeddings, fragments, jobs, routers, similarity, views, warmup
+from main_app.access import forget_app_user
+from main_app.accounts import soft_delete_users
+from main_app.duplicates import candidates_current, refresh_duplicate_candidates, refresh_stale_candidates
+from main_app.embedding_server import EmbeddingServer, remote_encode
 
 
 # =====================================================================
-# 🌟 PROJECT SUBMISSION & TEACHER LOGIC TESTS
+# 🌟 SHARED FIXTURES
 # =====================================================================
-class ProjectApprovalTests(TestCase):
+def make_project(student, title, vector, status="Pending"):
+    """A submission with its embedding already stored, so nothing is encoded."""
+    project = Projectsubmission(
+        student=student,
+        title=title,
+        description="desc",
+        technology_used="Python",
+        status=status
+    )
+    embeddings.set_embedding(project, np.asarray(vector, dtype=np.float32))
+    project.save()
+    return project
+
+
+class PortalUsersMixin:
+    """An admin, two teachers, a student guided by the first and an open deadline."""
 
     def setUp(self):
+        super().setUp()
         self.client = Client()
+        # cached deadlines and dashboard blocks outlive the rolled-back rows of earlier tests
+        deadlines.invalidate_deadline_cache()
+        cache.clear()
 
         # Admin
         self.admin = UserRegistration.objects.create(
@@ -84,6 +131,21 @@ class ProjectApprovalTests(TestCase):
             "role": "student"
         })
 
+    def login_admin(self):
+        self.client.post(reverse("login_page"), {
+            "email": "admin@test.com",
+            "password": "admin123",
+            "role": "admin"
+        })
+
+
+
+# =====================================================================
+# 🌟 PROJECT SUBMISSION & TEACHER LOGIC TESTS
+# =====================================================================
+class ProjectApprovalTests(PortalUsersMixin, TestCase):
+
+
     # -----------------------------------------------------------
     # 1️⃣ Teacher Approves Assigned Student Project
     # -----------------------------------------------------------
@@ -407,14 +469,6 @@ class ProjectApprovalTests(TestCase):
     # 1️⃣9️⃣ Teacher Duplicate Similarity Alert (Pending-Pending)
     # -----------------------------------------------------------
     def test_teacher_duplicate_similarity_alert(self):
-        Projectsubmission.objects.create(
-            student=self.student,
-            title="AI Drone System",
-            description="Drone using AI",
-            technology_used="Python",
-            status="Pending"
-        )
-
         student2 = UserRegistration.objects.create(
             full_name="Student B",
             email="b@test.com",
@@ -422,14 +476,24 @@ class ProjectApprovalTests(TestCase):
             assigned_teacher=self.teacher,
             is_verified=True
         )
-
-        Projectsubmission.objects.create(
-            student=student2,
-            title="AI Drone",
-            description="Drone automation",
-            technology_used="Python",
-            status="Pending"
+        student2.set_password("studb123")
+        student2.save()
+
+        # both submit through student_dashboard, which stores the candidates
+        drone = np.array([[1, 0, 0]], dtype=np.float32)
+        submissions = (
+            ("s1@test.com", "stud123", "AI Drone System", "Drone using AI"),
+            ("b@test.com", "studb123", "AI Drone", "Drone automation"),
         )
+        with mock.patch.object(views, "encode", return_value=drone):
+            for email, password, title, description in submissions:
+                self.client.post(reverse("login_page"), {"email": email, "password": password, "role": "student"})
+                self.client.post(reverse("student_dashboard"), {
+                    "title": title,
+                    "description": description,
+                    "technology_used": "Python"
+                })
+        self.assertEqual(Projectsubmission.objects.filter(status="Pending").count(), 2)
 
         self.login_teacher()
         response = self.client.get(reverse("teacher_dashboard"))
@@ -437,6 +501,585 @@ class ProjectApprovalTests(TestCase):
         self.assertContains(response, "Similar")
 
 
+class DuplicateCandidateTests(PortalUsersMixin, TestCase):
+    """Candidates stored on submit and read, never written, by teacher_dashboard."""
+
+    def setUp(self):
+        super().setUp()
+        self.student_b = UserRegistration.objects.create(
+            full_name="Student B",
+            email="b@test.com",
+            role="student",
+            is_verified=True
+        )
+
+    # -----------------------------------------------------------
+    # 2️⃣0️⃣ Teacher Dashboard Reads Precomputed Duplicate Candidates
+    # -----------------------------------------------------------
+    def test_teacher_dashboard_uses_duplicate_candidates(self):
+        project = make_project(self.student, "AI Drone System", [1, 0, 0])
+        other = make_project(self.student_b, "AI Drone System", [1, 0, 0])
+
+        refresh_duplicate_candidates(other)
+        self.assertEqual(DuplicateCandidate.objects.filter(project=project, other_project=other).count(), 1)
+        self.assertEqual(DuplicateCandidate.objects.filter(project=other, other_project=project).count(), 1)
+
+        refresh_duplicate_candidates(project)
+        self.login_teacher()
+        with mock.patch.object(embeddings, "encode") as encode:
+            response = self.client.get(reverse("teacher_dashboard"))
+
+        encode.assert_not_called()
+        self.assertContains(response, "Similar")
+        self.assertContains(response, "Student B")
+
+    def test_submit_saved_when_candidates_fail(self):
+        self.login_student()
+        drone = np.array([[1, 0, 0]], dtype=np.float32)
+        with mock.patch.object(views, "encode", return_value=drone), \
+                mock.patch("main_app.duplicates.score_duplicate_candidates", side_effect=RuntimeError("scorer down")), \
+                self.assertLogs("main_app.duplicates", "ERROR"):
+            response = self.client.post(reverse("student_dashboard"), {
+                "title": "AI Drone System", "description": "Drone using AI", "technology_used": "Python"
+            })
+        self.assertRedirects(response, reverse("student_dashboard"), fetch_redirect_response=False)
+        project = Projectsubmission.objects.get(student=self.student)
+        self.assertFalse(candidates_current(project))  # left to the worker's sweep
+        self.assertEqual(refresh_stale_candidates(), 1)
+
+    def test_teacher_dashboard_never_writes(self):
+        make_project(self.student, "AI Drone System", [1, 0, 0])
+        make_project(self.student_b, "AI Drone System", [1, 0, 0])
+        self.login_teacher()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("teacher_dashboard"))
+        self.assertNotContains(response, "Similar")
+        self.assertFalse([q for q in queries if not q["sql"].startswith("SELECT")])
+        self.assertEqual(DuplicateCandidate.objects.count(), 0)
+
+        self.assertEqual(refresh_stale_candidates(), 2)
+        self.assertEqual(refresh_stale_candidates(), 0)
+        cache.clear()
+        self.assertContains(self.client.get(reverse("teacher_dashboard")), "Student B")
+
+    # -----------------------------------------------------------
+    # 2️⃣1️⃣ Editing a Project Invalidates Its Candidates
+    # -----------------------------------------------------------
+    def test_duplicate_candidates_invalidated_on_change(self):
+        project = make_project(self.student, "AI Drone System", [1, 0, 0])
+        other = make_project(self.student, "AI Drone System", [1, 0, 0], status="Rejected")
+        refresh_duplicate_candidates(project)
+        self.assertEqual(DuplicateCandidate.objects.count(), 2)
+
+        other.title = "Library Booking Portal"
+        other.description = "Reserve books online"
+        embeddings.set_embedding(other, np.array([0, 1, 0], dtype=np.float32))
+        other.save()
+        self.assertFalse(candidates_current(other))
+
+        refresh_duplicate_candidates(other)
+        self.assertEqual(DuplicateCandidate.objects.count(), 0)
+
+
+class TeacherDashboardQueryTests(PortalUsersMixin, TestCase):
+    """teacher_dashboard's query count does not grow with its students."""
+
+    # -----------------------------------------------------------
+    # 2️⃣2️⃣ Teacher Dashboard Runs a Fixed Number of Queries
+    # -----------------------------------------------------------
+    def add_assigned_students(self, count, start=0):
+        for i in range(start, start + count):
+            student = UserRegistration.objects.create(
+                full_name=f"Student {i}",
+                email=f"student{i}@test.com",
+                role="student",
+                assigned_teacher=self.teacher,
+                is_verified=True
+            )
+            project = make_project(student, f"Drone Project {i}", [1, 0, 0])
+            refresh_duplicate_candidates(project)
+
+    def test_teacher_dashboard_query_budget(self):
+        self.add_assigned_students(3)
+        self.login_teacher()
+        deadlines.current_deadline()
+
+        # session, teacher, students, projects, duplicate candidates (deadline is cached)
+        with self.assertNumQueries(5):
+            response = self.client.get(reverse("teacher_dashboard"))
+        self.assertEqual(len(response.context["dashboard"]["duplicate_warnings"]), 3)
+
+        self.add_assigned_students(60, start=3)
+        with self.assertNumQueries(5):
+            response = self.client.get(reverse("teacher_dashboard"))
+        self.assertContains(response, "Student 62")
+
+        # unchanged since: the cached blocks need neither students nor projects
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse("teacher_dashboard"))
+        self.assertContains(response, "Student 62")
+
+
+class AdminDashboardPagingTests(PortalUsersMixin, TestCase):
+    """admin_dashboard counts every section in one query and pages its lists."""
+
+    # -----------------------------------------------------------
+    # 2️⃣3️⃣ Admin Dashboard Pages Students in a Fixed Number of Queries
+    # -----------------------------------------------------------
+    def test_admin_dashboard_query_budget_and_pages(self):
+        UserRegistration.objects.bulk_create([
+            UserRegistration(
+                full_name=f"Verified {i:02d}",
+                email=f"v{i}@test.com",
+                role="student",
+                assigned_teacher=self.other_teacher if i % 2 else self.teacher,
+                is_verified=True
+            )
+            for i in range(30)
+        ])
+        UserRegistration.objects.create(full_name="Waiting", email="w@test.com", role="student")
+        UserRegistration.objects.create(full_name="Gone", email="g@test.com", role="student", is_deleted=True)
+        self.login_admin()
+
+        # session, admin row, counts, teachers, pending / verified / deleted pages, approved projects
+        with self.assertNumQueries(8):
+            response = self.client.get(reverse("admin_dashboard"))
+
+        page = response.context["verified_students"]
+        self.assertEqual(response.context["counts"]["verified_students"], 31)
+        self.assertEqual(len(page), 25)
+        self.assertContains(response, f"verified_students_after={page.next_cursor}")
+
+        # the next page is a keyset query, never an OFFSET
+        with self.assertNumQueries(8):
+            response = self.client.get(reverse("admin_dashboard"), {"verified_students_after": page.next_cursor})
+        self.assertContains(response, "Verified 29")
+        self.assertNotContains(response, "Verified 00")
+        self.assertIsNone(response.context["verified_students"].next_cursor)
+
+        # "Load more" fragment and search
+        response = self.client.get(
+            reverse("admin_user_rows", args=["verified_students"]),
+            {"verified_students_after": page.next_cursor},
+        )
+        self.assertContains(response, "Verified 29")
+        self.assertNotContains(response, "<html")
+        self.assertEqual(response["X-Next-Cursor"], "")
+
+        response = self.client.get(reverse("admin_dashboard"), {"q": "verified 07"})
+        self.assertEqual([s.full_name for s in response.context["verified_students"]], ["Verified 07"])
+
+        response = self.client.get(reverse("manage_users"), {"q": "teacher"})
+        self.assertContains(response, "Teacher Two")
+        self.assertEqual(len(response.context["approved_students"]), 0)
+
+
+class TeacherProjectPagingTests(PortalUsersMixin, TestCase):
+    """The teacher's project list loads more rows by keyset cursor."""
+
+    # -----------------------------------------------------------
+    # 2️⃣4️⃣ Teacher Project List Loads More by Cursor
+    # -----------------------------------------------------------
+    def test_teacher_project_keyset_pages(self):
+        for i in range(30):
+            Projectsubmission.objects.create(
+                student=self.student,
+                title=f"Project {i:02d}",
+                description="Desc",
+                technology_used="Python",
+                status="Rejected"
+            )
+        self.login_teacher()
+
+        response = self.client.get(reverse("teacher_dashboard"))
+        page = response.context["submitted_projects"]
+        self.assertEqual([p.title for p in page][:2], ["Project 29", "Project 28"])
+        self.assertEqual(len(page), 25)
+
+        response = self.client.get(reverse("teacher_project_rows"), {"projects_after": page.next_cursor})
+        self.assertContains(response, "Project 04")
+        self.assertNotContains(response, "Project 05")
+        self.assertEqual(response["X-Next-Cursor"], "")
+
+        self.client.get(reverse("logout"))
+        response = self.client.get(reverse("teacher_project_rows"))
+        self.assertEqual(response.status_code, 403)
+
+
+class DeadlineCacheTests(PortalUsersMixin, TestCase):
+    """The current deadline is cached, invalidated on save and capped on per-process caches."""
+
+    # -----------------------------------------------------------
+    # 2️⃣5️⃣ Deadline Is Cached and Invalidated on Save
+    # -----------------------------------------------------------
+    def test_deadline_cache_invalidated_on_save(self):
+        self.assertEqual(deadlines.current_deadline(), self.deadline)
+        with self.assertNumQueries(0):
+            deadlines.current_deadline()
+
+        self.deadline.deadline = date.today() - timedelta(days=1)
+        self.deadline.save()
+        self.assertTrue(deadlines.submission_closed(deadlines.current_deadline()))
+
+        info, passed = deadlines.submission_info(self.deadline, on=self.deadline.deadline - timedelta(days=1))
+        self.assertEqual((info["text"], passed), ("⚠️ Tomorrow is the last day to submit!", False))
+        info, passed = deadlines.review_info(self.deadline, on=self.deadline.teacher_deadline)
+        self.assertEqual((info["text"], passed), ("🚨 Today is final review day!", False))
+
+        self.deadline.delete()
+        self.assertIsNone(deadlines.current_deadline())
+        self.assertEqual(deadlines.submission_info(None), (None, False))
+
+    # -----------------------------------------------------------
+    # 3️⃣3️⃣ Deadline Cache Timeout Follows the Cache Backend
+    # -----------------------------------------------------------
+    @override_settings(DEADLINE_LOCAL_TTL=5, DEADLINE_CACHE_TIMEOUT=300)
+    def test_deadline_cache_timeout_follows_backend(self):
+        # local memory: another worker's invalidate_deadline_cache() never reaches this one
+        self.assertEqual(deadlines.deadline_cache_timeout(), 5)
+        with mock.patch.object(deadlines.cache, "set") as cache_set:
+            deadlines.current_deadline()
+        self.assertEqual(cache_set.call_args.args[2], 5)
+
+        with tempfile.TemporaryDirectory() as location, override_settings(CACHES={"default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": location,
+        }}):
+            self.assertEqual(deadlines.deadline_cache_timeout(), 300)
+
+
+class CurrentSubmissionTests(PortalUsersMixin, TestCase):
+    """UserRegistration.current_submission follows submit, review and delete."""
+
+    # -----------------------------------------------------------
+    # 2️⃣6️⃣ Current Submission Pointer Follows Submit / Review / Delete
+    # -----------------------------------------------------------
+    def test_current_submission_pointer(self):
+        old = Projectsubmission.objects.create(
+            student=self.student, title="Old", description="Desc", technology_used="Python", status="Rejected"
+        )
+        project = Projectsubmission.objects.create(
+            student=self.student, title="Live", description="Desc", technology_used="Python", status="Pending"
+        )
+        self.student.refresh_from_db()
+        self.assertEqual((self.student.current_submission, self.student.current_submission_status), (project, "Pending"))
+
+        self.login_student()
+        with self.assertNumQueries(3):  # session, ETag version, one primary-key lookup
+            data = self.client.get(reverse("check_project_status")).json()
+        self.assertEqual(data["status"], "Pending")
+
+        response = self.client.get(reverse("submit_project"))
+        self.assertContains(response, "You already have a project under review")
+
+        self.client.get(reverse("logout"))
+        self.login_teacher()
+        self.client.post(reverse("approve_project", args=[project.id]))
+        self.student.refresh_from_db()
+        self.assertEqual(self.student.current_submission_status, "Approved")
+
+        project.delete()
+        self.student.refresh_from_db()
+        self.assertEqual((self.student.current_submission, self.student.current_submission_status), (old, "Rejected"))
+
+        UserRegistration.objects.filter(id=self.student.id).update(current_submission=None, current_submission_status="")
+        out = StringIO()
+        call_command("rebuild_current_submissions", stdout=out)
+        self.assertIn("Updated 1 student(s).", out.getvalue())
+        self.student.refresh_from_db()
+        self.assertEqual(self.student.current_submission, old)
+
+
+class ProjectStatusPollTests(PortalUsersMixin, TestCase):
+    """check_project_status answers 304 while the submission is unchanged."""
+
+    # -----------------------------------------------------------
+    # 2️⃣7️⃣ Status Polling Answers 304 While Nothing Changed
+    # -----------------------------------------------------------
+    def test_check_project_status_etag(self):
+        project = Projectsubmission.objects.create(
+            student=self.student, title="Live", description="Desc", technology_used="Python"
+        )
+        self.login_student()
+        url = reverse("check_project_status")
+
+        response = self.client.get(url)
+        etag = response["ETag"]
+        self.assertEqual(response.json()["status"], "Pending")
+        self.assertIn("no-cache", response["Cache-Control"])
+
+        with self.assertNumQueries(2):  # session + version; the submission is not read
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.student.full_name = "Student Renamed"
+        self.student.save()  # unrelated profile save keeps the version
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        project.status = "Rejected"
+        project.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.json()["status"], "Rejected")
+
+
+class ProjectStatusStreamTests(PortalUsersMixin, TestCase):
+    """project_status_stream pushes status changes to the signed-in student under ASGI."""
+
+    async def async_login(self, email, password, role):
+        await self.async_client.post(reverse("login_page"), {"email": email, "password": password, "role": role})
+
+    # -----------------------------------------------------------
+    # 2️⃣8️⃣ Status Changes Are Pushed Over Server-Sent Events
+    # -----------------------------------------------------------
+    async def test_project_status_stream(self):
+        project = await Projectsubmission.objects.acreate(
+            student=self.student, title="Live", description="Desc", technology_used="Python"
+        )
+        await self.async_login("s1@test.com", "stud123", "student")
+
+        response = await self.async_client.get(reverse("project_status_stream"))
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        stream = response.streaming_content
+        try:
+            self.assertEqual(await anext(stream), b"retry: 3000\n\n")
+            self.assertIn(b'"status": "Pending"', await anext(stream))
+
+            def reject():
+                with self.captureOnCommitCallbacks(execute=True):
+                    project.status = "Rejected"
+                    project.save()
+
+            await sync_to_async(reject)()
+            event = await asyncio.wait_for(anext(stream), timeout=5)
+            self.assertIn(b"event: status", event)
+            self.assertIn(b'"status": "Rejected"', event)
+        finally:
+            await stream.aclose()
+
+    async def test_project_status_stream_needs_a_student(self):
+        url = reverse("project_status_stream")
+        await self.async_login("t1@test.com", "teacher123", "teacher")
+        self.assertEqual((await self.async_client.get(url)).status_code, 403)
+
+        await self.async_login("s1@test.com", "stud123", "student")
+        await UserRegistration.objects.filter(id=self.student.id).aupdate(is_deleted=True)
+        await sync_to_async(forget_app_user)(self.student.id)
+        self.assertEqual((await self.async_client.get(url)).status_code, 403)
+
+    def test_project_status_stream_needs_asgi(self):
+        self.login_student()
+        self.assertEqual(self.client.get(reverse("project_status_stream")).status_code, 204)
+
+
+class DashboardFragmentTests(PortalUsersMixin, TestCase):
+    """Cached dashboard blocks are invalidated by version tokens and kept briefly on local caches."""
+
+    # -----------------------------------------------------------
+    # 2️⃣9️⃣ Cached Dashboard Blocks Follow Reviews and Reassignment
+    # -----------------------------------------------------------
+    def test_dashboard_fragments_invalidated(self):
+        project = make_project(self.student, "Cached Project", [1, 0, 0])
+        refresh_duplicate_candidates(project)
+        student_client, teacher_client = Client(), self.client
+        student_client.post(reverse("login_page"), {"email": "s1@test.com", "password": "stud123", "role": "student"})
+        self.login_teacher()
+
+        self.assertContains(student_client.get(reverse("student_dashboard")), "Cached Project")
+        self.assertContains(teacher_client.get(reverse("teacher_dashboard")), "🎓 Student A")
+
+        Projectsubmission.objects.filter(id=project.id).update(title="Changed Behind The Cache")
+        self.assertContains(student_client.get(reverse("student_dashboard")), "Cached Project")
+
+        teacher_client.post(reverse("approve_project", args=[project.id]))
+        response = student_client.get(reverse("student_dashboard"))
+        self.assertContains(response, "Changed Behind The Cache")
+        self.assertContains(response, "Reviewed by:</strong> Teacher One")
+
+        self.student.assigned_teacher = self.other_teacher
+        self.student.save()
+        self.assertNotContains(teacher_client.get(reverse("teacher_dashboard")), "🎓 Student A")
+
+    @override_settings(DASHBOARD_FRAGMENT_TIMEOUT=600, DASHBOARD_FRAGMENT_LOCAL_TIMEOUT=10)
+    def test_fragment_timeout_follows_backend(self):
+        # local memory: another worker's bump never reaches this one's blocks, keep them briefly
+        self.assertEqual(fragments.fragment_timeout(), 10)
+
+        with tempfile.TemporaryDirectory() as location, override_settings(CACHES={"default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": location,
+        }}):
+            self.assertEqual(fragments.fragment_timeout(), 600)
+
+
+class AppUserTests(PortalUsersMixin, TestCase):
+    """The signed-in user is loaded once per request; deleted users and other roles are turned away."""
+
+    # -----------------------------------------------------------
+    # 3️⃣0️⃣ Signed-in User Loaded Once Per Request (Optionally Cached)
+    # -----------------------------------------------------------
+    def test_app_user_loaded_once(self):
+        pending = UserRegistration.objects.create(full_name="Pending", email="p@test.com", role="student")
+        self.client.get(reverse("approve_user", args=[pending.id]))
+        self.login_teacher()
+        self.client.get(reverse("approve_user", args=[pending.id]))
+        pending.refresh_from_db()
+        self.assertFalse(pending.is_verified)  # admins only
+
+        def user_reads():
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(reverse("teacher_project_rows"))
+            self.assertEqual(response.status_code, 200)
+            reads = sum('FROM "main_app_userregistration"' in q["sql"] for q in queries.captured_queries)
+            return reads, response.wsgi_request.app_user
+
+        reads, user = user_reads()
+        self.assertEqual(reads, 1)
+        self.assertIn("assigned_teacher", user._state.fields_cache)  # joined, no extra query
+
+        with override_settings(APP_USER_CACHE_TTL=60):
+            user_reads()
+            self.assertEqual(user_reads()[0], 0)
+            self.teacher.full_name = "Teacher Renamed"
+            self.teacher.save()
+            reads, user = user_reads()
+            self.assertEqual((reads, user.full_name), (1, "Teacher Renamed"))
+
+    # -----------------------------------------------------------
+    # 3️⃣4️⃣ Soft-Deleted Users Are Signed Out; Only the Owner Edits a Project
+    # -----------------------------------------------------------
+    def test_deleted_user_session_and_project_owner(self):
+        project = Projectsubmission.objects.create(
+            student=self.student, title="Mine", description="Desc", technology_used="Python"
+        )
+        self.login_teacher()
+        response = self.client.post(reverse("delete_project", args=[project.id]))
+        self.assertRedirects(response, reverse("login_page"), fetch_redirect_response=False)
+        self.assertTrue(Projectsubmission.objects.filter(id=project.id).exists())
+
+        self.login_student()
+        self.assertEqual(self.client.get(reverse("student_dashboard")).status_code, 200)
+        soft_delete_users([self.student.id])
+        response = self.client.get(reverse("student_dashboard"))
+        self.assertRedirects(response, reverse("login_page"), fetch_redirect_response=False)
+        self.client.post(reverse("delete_project", args=[project.id]))
+        self.assertTrue(Projectsubmission.objects.filter(id=project.id).exists())
+
+    def test_role_checks_keep_each_views_redirect(self):
+        def get(url):
+            self.client.cookies.pop("messages", None)  # as if a page had shown them
+            response = self.client.get(url)
+            return response, [str(m) for m in get_messages(response.wsgi_request)]
+
+        url = reverse("delete_user", args=[self.student.id])
+        response, notices = get(url)
+        self.assertRedirects(response, reverse("login_page"), fetch_redirect_response=False)
+        self.assertEqual(notices, ["You must be logged in first."])
+
+        self.login_teacher()
+        response, notices = get(url)
+        self.assertRedirects(response, reverse("index"), fetch_redirect_response=False)
+        self.assertEqual(notices, ["Unauthorized access."])
+        self.assertFalse(UserRegistration.objects.get(id=self.student.id).is_deleted)
+
+        self.client.get(reverse("logout"))
+        self.login_student()
+        response, notices = get(reverse("teacher_dashboard"))
+        self.assertRedirects(response, reverse("login_page"), fetch_redirect_response=False)
+        self.assertEqual(notices, [])
+
+
+class BulkUserActionTests(PortalUsersMixin, TestCase):
+    """The admin approves, rejects and restores a selection of users in one statement each."""
+
+    # -----------------------------------------------------------
+    # 3️⃣1️⃣ Admin Bulk Approve / Reject / Restore
+    # -----------------------------------------------------------
+    def test_bulk_user_actions(self):
+        pending = [
+            UserRegistration.objects.create(full_name=f"Pending {i}", email=f"p{i}@test.com", role="student")
+            for i in range(4)
+        ]
+        self.student.is_deleted = True
+        self.student.save()
+        self.login_admin()
+        url = reverse("bulk_user_action")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(url, {
+                "action": "approve", "user_ids": [pending[0].id, pending[1].id, self.admin.id, "x"],
+            })
+        self.assertRedirects(response, reverse("admin_dashboard"), fetch_redirect_response=False)
+        updates = [q["sql"] for q in queries.captured_queries if q["sql"].startswith('UPDATE "main_app_userregistration"')]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(
+            list(UserRegistration.objects.filter(is_verified=True, role="student").order_by("id").values_list("id", flat=True)),
+            [self.student.id, pending[0].id, pending[1].id],
+        )
+
+        response = self.client.post(url, {"action": "reject", "user_ids": [pending[2].id, pending[0].id]})
+        self.assertFalse(UserRegistration.objects.filter(id=pending[2].id).exists())
+        self.assertTrue(UserRegistration.objects.filter(id=pending[0].id).exists())  # verified: not removed
+        notices = [str(m) for m in get_messages(response.wsgi_request)]
+        self.assertIn("❌ 1 registration(s) rejected and removed.", notices)
+        self.assertIn("⚠️ 1 verified user(s) skipped: delete them instead of rejecting.", notices)
+
+        self.client.post(url, {"action": "restore", "user_ids": [self.student.id]})
+        self.student.refresh_from_db()
+        self.assertFalse(self.student.is_deleted)
+
+        self.client.get(reverse("logout"))
+        self.login_teacher()
+        self.client.post(url, {"action": "approve", "user_ids": [pending[3].id]})
+        pending[3].refresh_from_db()
+        self.assertFalse(pending[3].is_verified)
+
+
+class SoftDeleteTests(PortalUsersMixin, TestCase):
+    """Deleting a teacher unassigns their students in bulk; restoring the teacher reattaches them."""
+
+    # -----------------------------------------------------------
+    # 3️⃣2️⃣ Deleting A Teacher Unassigns In Bulk, Restoring Reattaches
+    # -----------------------------------------------------------
+    def test_delete_and_restore_teacher_in_bulk(self):
+        students = UserRegistration.objects.bulk_create([
+            UserRegistration(
+                full_name=f"Guided {i}", email=f"g{i}@test.com", role="student",
+                is_verified=True, assigned_teacher=self.teacher,
+            )
+            for i in range(25)
+        ])
+        self.login_admin()
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse("delete_user", args=[self.teacher.id]))
+        updates = [q["sql"] for q in queries.captured_queries if q["sql"].startswith('UPDATE "main_app_userregistration"')]
+        self.assertEqual(len(updates), 2)  # the teacher, then all 26 students at once
+
+        self.teacher.refresh_from_db()
+        self.assertTrue(self.teacher.is_deleted)
+        self.assertFalse(UserRegistration.objects.filter(assigned_teacher=self.teacher).exists())
+        self.assertEqual(UserRegistration.objects.filter(previous_teacher=self.teacher).count(), 26)
+
+        # one student got a new guide in the meantime and keeps them; another
+        # was given one and then left without a guide on purpose
+        self.client.post(reverse("assign_teacher", args=[students[0].id]), {"teacher_id": self.other_teacher.id})
+        self.client.post(reverse("assign_teacher", args=[students[1].id]), {"teacher_id": self.other_teacher.id})
+        self.client.post(reverse("assign_teacher", args=[students[1].id]), {"teacher_id": ""})
+        self.assertFalse(UserRegistration.objects.filter(id__in=[students[0].id, students[1].id]).exclude(
+            previous_teacher=None, unassigned_at=None,
+        ).exists())
+
+        self.client.get(reverse("restore_user", args=[self.teacher.id]))
+        self.teacher.refresh_from_db()
+        self.assertFalse(self.teacher.is_deleted)
+        self.assertEqual(UserRegistration.objects.filter(assigned_teacher=self.teacher).count(), 24)
+        students[0].refresh_from_db()
+        self.assertEqual(students[0].assigned_teacher_id, self.other_teacher.id)
+        students[1].refresh_from_db()
+        self.assertIsNone(students[1].assigned_teacher_id)
+
+
 # =====================================================================
 # 🌟 MODELS TESTS
 # =====================================================================
@@ -565,6 +1208,542 @@ class ProjectSubmissionModelTests(TestCase):
         self.assertEqual(sub.team_members, "Prachi, Rahul")
 
 
+class EmbeddingStoreTests(TestCase):
+    def setUp(self):
+        self.student = UserRegistration.objects.create(
+            full_name="Student One",
+            email="s1@test.com",
+            role="student",
+            is_verified=True
+        )
+        self.project = Projectsubmission.objects.create(
+            student=self.student,
+            title="Drone Mapping",
+            description="Aerial survey",
+            technology_used="Python"
+        )
+
+    def test_stored_embedding_is_reused(self):
+        vector = np.array([0.6, 0.8, 0.0], dtype=np.float32)
+        embeddings.set_embedding(self.project, vector)
+        self.project.save()
+
+        project = Projectsubmission.objects.get(id=self.project.id)
+        self.assertTrue(embeddings.is_embedding_current(project))
+
+        with mock.patch.object(embeddings, "encode") as encode:
+            matrix = embeddings.ensure_embeddings([project])
+
+        encode.assert_not_called()
+        np.testing.assert_array_equal(matrix[0], vector)
+
+    def test_edited_text_invalidates_embedding(self):
+        embeddings.set_embedding(self.project, np.ones(3, dtype=np.float32))
+        self.project.save()
+
+        self.project.title = "Drone Delivery"
+        self.assertFalse(embeddings.is_embedding_current(self.project))
+
+
+class SimilarityEngineTests(SimpleTestCase):
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.texts = [
+            "ai drone system drone using ai python",
+            "library booking portal reserve books django",
+            "face recognition attendance opencv python",
+            "ai drone delivery drone automation python",
+            "hospital management system php mysql",
+        ]
+        matrix = rng.normal(size=(len(self.texts), 8)).astype(np.float32)
+        self.matrix = matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+        self.query_text = "ai drone system for automation python"
+        self.query_emb = self.matrix[0]
+
+    def pairwise_scores(self):
+        scores = []
+        for text, emb in zip(self.texts, self.matrix):
+            semantic = float(np.dot(self.query_emb, emb)) * 100
+            scores.append(round((semantic * 0.6) + (fuzz.WRatio(self.query_text, text) * 0.4)))
+        return scores
+
+    def test_top_matches_agree_with_pairwise_scores(self):
+        expected = self.pairwise_scores()
+        matches = similarity.top_matches(self.query_text, self.query_emb, self.texts, self.matrix)
+
+        self.assertEqual([m.score for m in matches], sorted(expected, reverse=True))
+        for m in matches:
+            self.assertEqual(m.score, expected[m.index])
+
+    def test_top_matches_threshold_and_top_k(self):
+        expected = self.pairwise_scores()
+        matches = similarity.top_matches(
+            self.query_text, self.query_emb, self.texts, self.matrix, top_k=1, threshold=60
+        )
+
+        self.assertEqual(len(matches), 1)
+        self.assertEqual(matches[0].index, expected.index(max(expected)))
+
+    def test_first_fuzzy_match(self):
+        candidates = [
+            ("library portal", "reserve books online"),
+            ("face recognition system", "ai based"),
+        ]
+        self.assertEqual(
+            similarity.first_fuzzy_match(("system recognition face", "x"), candidates), 1
+        )
+        self.assertIsNone(similarity.first_fuzzy_match(("weather app", "forecast"), candidates))
+
+
+class ApproximateIndexTests(SimpleTestCase):
+    def clustered_vectors(self, n, dim=32, clusters=40, seed=3):
+        rng = np.random.default_rng(seed)
+        centers = rng.normal(size=(clusters, dim))
+        vectors = centers[rng.integers(clusters, size=n)] + 0.35 * rng.normal(size=(n, dim))
+        return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+    def test_recall_against_brute_force(self):
+        vectors = self.clustered_vectors(3000)
+        queries = self.clustered_vectors(100, seed=11)
+        index = ann.IVFIndex(nprobe=8).build(np.arange(len(vectors)), vectors)
+        self.assertGreater(len(index.centroids), 1)
+
+        k = 10
+        found = 0
+        for query in queries:
+            exact = np.argsort(-(vectors @ query))[:k]
+            ids, _ = index.search(query, k)
+            found += len(set(exact) & set(ids.tolist()))
+
+        recall = found / (k * len(queries))
+        self.assertGreaterEqual(recall, 0.9)
+
+    def test_incremental_insert_and_remove(self):
+        vectors = self.clustered_vectors(500)
+        index = ann.IVFIndex().build(np.arange(500), vectors)
+
+        new_vector = self.clustered_vectors(1, seed=99)[0]
+        index.add(1000, new_vector)
+        self.assertEqual(index.search(new_vector, 1)[0][0], 1000)
+
+        index.remove(1000)
+        self.assertNotIn(1000, index)
+        self.assertNotIn(1000, index.search(new_vector, 5)[0].tolist())
+
+
+class ApprovedCorpusMixin:
+    """A throwaway SIMILARITY_CORPUS_DIR and a fresh approved index for each test."""
+
+    def setUp(self):
+        super().setUp()
+        corpus_root = tempfile.TemporaryDirectory()
+        self.addCleanup(corpus_root.cleanup)
+        settings_override = override_settings(SIMILARITY_CORPUS_DIR=corpus_root.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        ann.reset_approved_index()
+        self.addCleanup(ann.reset_approved_index)
+
+
+class ApprovedIndexTests(ApprovedCorpusMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.student = UserRegistration.objects.create(
+            full_name="Student One",
+            email="s1@test.com",
+            role="student",
+            is_verified=True
+        )
+
+    def test_index_follows_approval_changes(self):
+        approved = make_project(self.student, "Approved One", [1, 0, 0], "Approved")
+        pending = make_project(self.student, "Pending One", [0, 1, 0], "Pending")
+
+        self.assertEqual(ann.approved_candidate_ids(np.array([1, 0, 0], dtype=np.float32)), [approved.id])
+
+        first_version = corpus.current_version()
+        pending.status = "Approved"
+        pending.save()
+        ann.sync_approved_project(pending)
+        self.assertNotEqual(corpus.current_version(), first_version)
+
+        approved.status = "Rejected"
+        approved.save()
+        ann.sync_approved_project(approved)
+        # kept current by the syncs: no fingerprint query before the recheck is due
+        with self.assertNumQueries(0):
+            index = ann.approved_index()
+        self.assertIn(pending.id, index)
+        self.assertNotIn(approved.id, index)
+        self.assertEqual(ann.approved_candidate_ids(np.array([1, 0, 0], dtype=np.float32)), [pending.id])
+
+    def test_review_views_sync_on_commit(self):
+        teacher = UserRegistration.objects.create(
+            full_name="Teacher One", email="t1@test.com", role="teacher", is_verified=True,
+        )
+        teacher.set_password("teacher123")
+        teacher.save()
+        UserRegistration.objects.filter(id=self.student.id).update(assigned_teacher=teacher)
+        SubmissionDeadline.objects.create(deadline=date.today() + timedelta(days=2))
+        deadlines.invalidate_deadline_cache()
+        pending = make_project(self.student, "Pending One", [0, 1, 0], "Pending")
+        ann.approved_index()
+        self.client.post(reverse("login_page"), {"email": "t1@test.com", "password": "teacher123", "role": "teacher"})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("approve_project", args=[pending.id]))
+        self.assertIn(pending.id, ann.approved_index())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("handle_project_feedback"), {"project_id": pending.id, "action": "reject"})
+        self.assertNotIn(pending.id, ann.approved_index())
+
+    @override_settings(SIMILARITY_INDEX_RECHECK_SECONDS=0)
+    def test_corpus_rechecked_against_database(self):
+        approved = make_project(self.student, "Approved One", [1, 0, 0], "Approved")
+        ann.approved_index()
+
+        # a restored backup: as many approved rows, all older than the corpus
+        restored = make_project(self.student, "Restored One", [0, 1, 0], "Approved")
+        Projectsubmission.objects.filter(id=restored.id).update(updated_at=approved.updated_at - timedelta(days=1))
+        Projectsubmission.objects.filter(id=approved.id).delete()
+        self.assertEqual(ann.approved_candidate_ids(np.array([0, 1, 0], dtype=np.float32)), [restored.id])
+        self.assertNotIn(approved.id, ann.approved_index())
+
+        # a cascade delete from the admin
+        self.student.delete()
+        self.assertEqual(len(ann.approved_index()), 0)
+
+    def test_workers_share_memory_mapped_corpus(self):
+        approved = make_project(self.student, "Approved One", [1, 0, 0], "Approved")
+        ann.approved_index()
+
+        shared = corpus.current_corpus()
+        self.assertIsInstance(shared.vectors, np.memmap)
+        self.assertEqual(shared.ids.tolist(), [approved.id])
+
+        # Another worker publishes a new version; this process picks it up on next use.
+        first_version = shared.version
+        index = ann.IVFIndex.from_corpus(shared)
+        index.add(999, np.array([0, 1, 0], dtype=np.float32))
+        corpus.publish_corpus(*index.to_arrays(), trained_size=index.trained_size, signature=shared.signature)
+
+        self.assertNotEqual(corpus.current_version(), first_version)
+        self.assertIn(999, ann.approved_index())
+
+
+@override_settings(SIMILARITY_ASYNC=True)
+class SimilarityJobTests(ApprovedCorpusMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        deadlines.invalidate_deadline_cache()
+        cache.clear()
+
+        self.other_student = UserRegistration.objects.create(
+            full_name="Student Two",
+            email="s2@test.com",
+            role="student",
+            is_verified=True
+        )
+        self.student = UserRegistration.objects.create(
+            full_name="Student One",
+            email="s1@test.com",
+            role="student",
+            is_verified=True
+        )
+        self.student.set_password("stud123")
+        self.student.save()
+        self.client.post(reverse("login_page"), {
+            "email": "s1@test.com",
+            "password": "stud123",
+            "role": "student"
+        })
+
+    def submit(self, title):
+        with mock.patch.object(embeddings, "encode") as encode:
+            self.client.post(reverse("student_dashboard"), {
+                "title": title,
+                "description": "desc",
+                "technology_used": "Python"
+            })
+        encode.assert_not_called()
+        return Projectsubmission.objects.get(student=self.student, title=title)
+
+    def test_duplicate_found_by_worker(self):
+        approved = make_project(self.other_student, "Approved One", [1, 0, 0], "Approved")
+        project = self.submit("Approved One")
+
+        self.assertEqual(project.status, "Pending")
+        self.assertEqual(project.similarity_status, "checking")
+        self.assertEqual(SimilarityJob.objects.filter(project=project, status="queued").count(), 1)
+        self.assertEqual(self.client.get(reverse("check_project_status")).json()["similarity_status"], "checking")
+
+        with mock.patch.object(jobs, "encode", return_value=np.array([[1, 0, 0]], dtype=np.float32)):
+            self.assertEqual(jobs.run_pending_jobs(), 1)
+
+        project.refresh_from_db()
+        self.assertEqual(project.similarity_status, "duplicate")
+        self.assertEqual(project.similar_to, approved)
+        self.assertEqual(project.status, "Rejected")
+        data = self.client.get(reverse("check_project_status")).json()
+        self.assertTrue(data["duplicate"])
+        self.assertEqual(data["similar_to"], "Approved One")
+        self.assertEqual(data["similarity_score"], project.similarity_score)
+
+    def test_clear_result_and_retry_on_failure(self):
+        make_project(self.other_student, "Approved One", [1, 0, 0], "Approved")
+        project = self.submit("Library Booking Portal")
+
+        with mock.patch.object(jobs, "encode", side_effect=OSError("model unavailable")), \
+                self.assertLogs("main_app.jobs", "ERROR"):
+            jobs.run_pending_jobs(limit=1)
+        job = SimilarityJob.objects.get(project=project)
+        self.assertEqual((job.status, job.attempts), ("queued", 1))
+
+        with mock.patch.object(jobs, "encode", return_value=np.array([[0, 1, 0]], dtype=np.float32)):
+            jobs.run_pending_jobs()
+
+        job.refresh_from_db()
+        project.refresh_from_db()
+        self.assertEqual(job.status, "done")
+        self.assertEqual((project.status, project.similarity_status), ("Pending", "clear"))
+        self.assertTrue(candidates_current(project))
+
+
+class EmbeddingServerTests(SimpleTestCase):
+    def fake_encode(self, texts):
+        time.sleep(0.05)
+        self.calls.append(list(texts))
+        return np.array([[len(t), 1.0] for t in texts], dtype=np.float32)
+
+    def setUp(self):
+        self.calls = []
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.socket_path = os.path.join(tmp.name, "embed.sock")
+
+        self.server = EmbeddingServer(self.socket_path, self.fake_encode, max_wait=0.02)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+    def test_concurrent_requests_are_coalesced(self):
+        texts = ["a" * n for n in range(1, 9)]
+        results = {}
+
+        def call(text):
+            results[text] = remote_encode(self.socket_path, [text])
+
+        threads = [threading.Thread(target=call, args=(t,)) for t in texts]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        for text in texts:
+            np.testing.assert_array_equal(results[text], [[len(text), 1.0]])
+        self.assertLess(self.server.batches, len(texts))
+
+    def test_encode_uses_server_and_falls_back_without_it(self):
+        with override_settings(SIMILARITY_EMBEDDING_SOCKET=self.socket_path), \
+                mock.patch.object(embeddings, "encode_local") as local:
+            vectors = embeddings.encode(["abc"])
+        local.assert_not_called()
+        np.testing.assert_array_equal(vectors, [[3, 1.0]])
+
+        missing = os.path.join(os.path.dirname(self.socket_path), "missing.sock")
+        with override_settings(SIMILARITY_EMBEDDING_SOCKET=missing), \
+                mock.patch.object(embeddings, "encode_local", return_value="local") as local:
+            self.assertEqual(embeddings.encode(["abc"]), "local")
+        local.assert_called_once_with(["abc"])
+
+
+class WarmupTests(TestCase):
+    def setUp(self):
+        warmup._warm.clear()
+        self.addCleanup(warmup._warm.clear)
+
+    def test_readiness_reports_cold_then_warm(self):
+        with mock.patch.object(warmup, "warm_similarity") as warm_similarity:
+            response = self.client.get(reverse("readiness"))
+            warmup._warming.join()
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json(), {"status": "cold"})
+        # no post_fork hook here (runserver, uvicorn): the probe started the warm-up
+        warm_similarity.assert_called_once_with()
+
+        with mock.patch.object(warmup, "encode") as encode:
+            timings = warmup.warm_similarity(build_corpus=False)
+
+        self.assertEqual(encode.call_count, 2)
+        self.assertIn("batch", timings)
+        response = self.client.get(reverse("readiness"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"status": "warm"})
+
+
+class LazyImportTests(SimpleTestCase):
+    def test_urlconf_does_not_import_sentence_transformers(self):
+        code = (
+            "import django, sys; django.setup();"
+            "import projectapprovalsystem.urls, main_app.views;"
+            "print('sentence_transformers' in sys.modules, 'torch' in sys.modules)"
+        )
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE="projectapprovalsystem.settings")
+        out = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True, check=True,
+        )
+        self.assertEqual(out.stdout.split(), ["False", "False"])
+
+
+class SQLiteTuningTests(SimpleTestCase):
+    """SQLITE_TUNING_OPTIONS on a throwaway file (the test database lives in memory)."""
+
+    def setUp(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("SQLite only")
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tuned = {
+            **connection.settings_dict,
+            "NAME": os.path.join(tmp.name, "tuned.sqlite3"),
+            "OPTIONS": settings.SQLITE_TUNING_OPTIONS,
+        }
+
+    def connect(self):
+        """This thread's connection to the tuned file, registered as the "tuned" alias."""
+        connections["tuned"] = type(connections["default"])(self.tuned, "tuned")
+        return connections["tuned"]
+
+    def disconnect(self):
+        connections["tuned"].close()
+        del connections["tuned"]
+
+    def test_pragmas_applied_on_connect(self):
+        self.addCleanup(self.disconnect)
+        values = {}
+        with self.connect().cursor() as cursor:
+            for pragma in ("journal_mode", "synchronous", "busy_timeout"):
+                cursor.execute(f"PRAGMA {pragma}")
+                values[pragma] = cursor.fetchone()[0]
+        self.assertEqual(values["journal_mode"], "wal")
+        self.assertEqual(values["synchronous"], 1)  # NORMAL
+        self.assertGreater(values["busy_timeout"], 0)
+
+    def test_concurrent_read_then_write_transactions(self):
+        self.addCleanup(self.disconnect)
+        with self.connect().cursor() as cursor:
+            cursor.execute("CREATE TABLE counter (value INTEGER)")
+            cursor.execute("INSERT INTO counter VALUES (0)")
+        errors = []
+
+        def writer():
+            tuned = self.connect()
+            try:
+                for _ in range(25):
+                    # read, then write: a deferred transaction cannot upgrade its lock after
+                    # another writer committed and fails at once, whatever the busy timeout
+                    with transaction.atomic(using="tuned"), tuned.cursor() as cursor:
+                        cursor.execute("SELECT value FROM counter")
+                        cursor.execute("UPDATE counter SET value = %s", [cursor.fetchone()[0] + 1])
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                self.disconnect()
+
+        threads = [threading.Thread(target=writer) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        with connections["tuned"].cursor() as cursor:
+            cursor.execute("SELECT value FROM counter")
+            self.assertEqual(cursor.fetchone()[0], 200)
+
+
+class ReplicaRoutingTests(PortalUsersMixin, TransactionTestCase):
+    """A second SQLite file stands in for a replica of the test database."""
+
+    def setUp(self):
+        super().setUp()
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        replica = type(connections["default"])(
+            {**connection.settings_dict, "NAME": os.path.join(tmp.name, "replica.sqlite3")}, "replica_1",
+        )
+        connections["replica_1"] = replica
+        self.addCleanup(connections.__delitem__, "replica_1")
+        self.addCleanup(replica.close)
+        with replica.schema_editor() as editor:
+            for model in apps.get_app_config("main_app").get_models():
+                editor.create_model(model)
+        replicas = override_settings(DATABASE_REPLICAS=["replica_1"], SIMILARITY_ASYNC=True)
+        replicas.enable()
+        self.addCleanup(replicas.disable)
+
+        # the replica lags: same student and guide, an older version of the student's row
+        UserRegistration.objects.using("replica_1").create(
+            id=self.teacher.id, full_name="Teacher One", email="t1@test.com", role="teacher", is_verified=True,
+        )
+        UserRegistration.objects.using("replica_1").create(
+            id=self.student.id, full_name="Student A", email="s1@test.com", role="student",
+            is_verified=True, assigned_teacher_id=self.teacher.id, submission_version=41,
+        )
+        self.login_student()
+
+    def status_etag(self):
+        return self.client.get(reverse("check_project_status"))["ETag"]
+
+    def test_reads_from_replica_until_a_write_pins_the_primary(self):
+        self.assertEqual(self.status_etag(), f'"{self.student.id}.41"')
+
+        response = self.client.post(reverse("student_dashboard"), {
+            "title": "Replica Project", "description": "Desc", "technology_used": "Django",
+        })
+        self.assertIn(routers.PIN_COOKIE, response.cookies)
+        primary_version = UserRegistration.objects.get(id=self.student.id).submission_version
+        self.assertEqual(self.status_etag(), f'"{self.student.id}.{primary_version}"')
+
+        del self.client.cookies[routers.PIN_COOKIE]  # the pin window is over
+        self.assertEqual(self.status_etag(), f'"{self.student.id}.41"')
+
+    def test_cached_fragments_render_from_the_primary(self):
+        teacher_client = Client()
+        teacher_client.post(reverse("login_page"), {"email": "t1@test.com", "password": "teacher123", "role": "teacher"})
+        teacher_client.cookies.pop(routers.PIN_COOKIE, None)
+
+        self.client.post(reverse("student_dashboard"), {
+            "title": "Replica Project", "description": "Desc", "technology_used": "Django",
+        })
+        del self.client.cookies[routers.PIN_COOKIE]
+
+        # the replica has not seen the submission yet: the missed blocks still list it
+        self.assertContains(teacher_client.get(reverse("teacher_dashboard")), "Replica Project")
+        self.assertContains(self.client.get(reverse("student_dashboard")), "Replica Project")
+
+        # and once it has, the cached blocks still do
+        project = Projectsubmission.objects.get()
+        Projectsubmission.objects.using("replica_1").bulk_create([project])
+        self.assertContains(teacher_client.get(reverse("teacher_dashboard")), "Replica Project")
+
+    def test_transactions_and_other_apps_stay_on_primary(self):
+        router = routers.PrimaryReplicaRouter()
+        routing = routers.Routing()
+        routing.replica_reads = True
+        token = routers._routing.set(routing)
+        self.addCleanup(routers._routing.reset, token)
+
+        self.assertEqual(router.db_for_read(UserRegistration), "replica_1")
+        self.assertEqual(router.db_for_read(Session), "default")
+        with transaction.atomic():
+            self.assertEqual(router.db_for_read(UserRegistration), "default")
+        router.db_for_write(UserRegistration)
+        self.assertEqual(router.db_for_read(UserRegistration), "default")
+
+
 class SubmissionDeadlineModelTests(TestCase):
 
     def test_deadline_creation(self):
@@ -619,6 +1798,10 @@ class URLTests(TestCase):
         url = reverse('profile')
         self.assertEqual(resolve(url).func, views.profile_page)
 
+    def test_readiness_url(self):
+        url = reverse('readiness')
+        self.assertEqual(resolve(url).func, views.readiness)
+
     # Student URLs
     def test_student_dashboard_url(self):
         url = reverse('student_dashboard')
@@ -640,6 +1823,10 @@ class URLTests(TestCase):
         url = reverse('check_project_status')
         self.assertEqual(resolve(url).func, views.check_project_status)
 
+    def test_project_status_stream_url(self):
+        url = reverse('project_status_stream')
+        self.assertEqual(resolve(url).func, views.project_status_stream)
+
     # Teacher URLs
     def test_teacher_dashboard_url(self):
         url = reverse('teacher_dashboard')
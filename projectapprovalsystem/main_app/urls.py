@@ -9,6 +9,7 @@ urlpatterns = [
     path('index/', views.index, name='index'),
     path('about/', views.about, name='about'),
     path('profile/', views.profile_page, name='profile'),
+    path('ready/', views.readiness, name='readiness'),
 
       
    
@@ -21,10 +22,12 @@ urlpatterns = [
     path('student/edit_project/<int:project_id>/', views.edit_project, name='update_project'),
     path('student/delete_project/<int:project_id>/', views.delete_project, name='delete_project'),
     path('check_project_status/', views.check_project_status, name='check_project_status'),
+    path('student/status/stream/', views.project_status_stream, name='project_status_stream'),
 
 
 #teacher dashboard + project approval
     path('teacher/dashboard/', views.teacher_dashboard, name='teacher_dashboard'),
+    path('teacher/dashboard/projects/', views.teacher_project_rows, name='teacher_project_rows'),
     path('teacher/approve_project/<int:project_id>/', views.approve_project, name='approve_project'),
     path('teacher/reject_project/<int:project_id>/', views.reject_project, name='reject_project'),
     path('teacher/feedback/', views.handle_project_feedback, name='handle_project_feedback'),
@@ -35,8 +38,10 @@ urlpatterns = [
     path('admin_dashboard/', views.admin_dashboard, name='admin_dashboard'),
     path('approve_user/<int:user_id>/', views.approve_user, name='approve_user'),
     path('reject_user/<int:user_id>/', views.reject_user, name='reject_user'),
+    path('admin_dashboard/users/bulk/', views.bulk_user_action, name='bulk_user_action'),
     path('assign-teacher/<int:student_id>/', views.assign_teacher, name='assign_teacher'),
     path('admin_dashboard/manage_users/', views.manage_users, name='manage_users'),
+    path('admin_dashboard/rows/<str:section>/', views.admin_user_rows, name='admin_user_rows'),
     path('admin_dashboard/delete_user/<int:user_id>/', views.delete_user, name='delete_user'),
     path('set_deadline/', views.set_submission_deadline, name='set_deadline'),
     path('admin_dashboard/restore_user/<int:user_id>/', views.restore_user, name='restore_user'),
@@ -1,31 +1,57 @@
+import asyncio
+import json
+from functools import partial
+
 from pyexpat import model
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
 from django.contrib.auth.hashers import check_password, make_password
 from django.utils import timezone
-from django.views.decorators.http import require_POST
-from django.http import JsonResponse
-from datetime import date
-from sentence_transformers import SentenceTransformer, util
-
-# Load lightweight but powerful model
-_sbert_model = None
-
-def get_sbert_model():
-    global _sbert_model
-    if _sbert_model is None:
-        _sbert_model = SentenceTransformer("all-MiniLM-L6-v2")
-    return _sbert_model
-
-
-from .models import UserRegistration, Project, Projectsubmission, SubmissionDeadline
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, require_POST
+from django.http import Http404, HttpResponse, HttpResponseForbidden, JsonResponse, StreamingHttpResponse
+from django.db import connection, transaction
+from django.db.models import Count, Q
+
+from .access import load_app_user, role_required
+from .accounts import reject_users, restore_users, soft_delete_users, verify_users
+from .ann import sync_approved_project
+from .embeddings import encode, project_text, set_embedding
+from .events import student_channel, subscribe, unsubscribe
+from .fragments import fragment_timeout, fragment_version, student_scope, teacher_scope
+from .duplicates import (
+    duplicate_warning,
+    find_approved_duplicate,
+    save_with_candidates,
+)
+from .deadlines import (
+    current_deadline,
+    latest_deadline as latest_deadline_from_db,
+    review_closed,
+    review_info,
+    student_deadline_info,
+    submission_closed,
+    submission_info,
+)
+from .jobs import async_checks_enabled, enqueue_similarity_check
+from .pagination import SEARCH_PARAM, keyset_page
+from .routers import read_from_primary, replica_reads
+from .submissions import has_live_submission, refresh_current_submission, submission_version
+from .similarity import DUPLICATE_THRESHOLD, first_fuzzy_match
+from .warmup import is_warm, warm_in_background
+from .models import (
+    UserRegistration,
+    Projectsubmission,
+    DuplicateCandidate,
+)
 from .forms import (
     ProjectForm,
     ProjectSubmissionForm,
     SubmissionDeadlineForm,
     EditProfileForm
 )
-from rapidfuzz import fuzz
 
 
 
@@ -117,15 +143,10 @@ def index(request):
 # -------------------- STUDENT DASHBOARD --------------------
 
 
+@replica_reads
+@role_required('student')
 def student_dashboard(request):
-    user_id = request.session.get('user_id')
-    role = request.session.get('role')
-
-    if not user_id or role != 'student':
-        messages.error(request, "Unauthorized access.")
-        return redirect('login_page')
-
-    student = get_object_or_404(UserRegistration, id=user_id)
+    student = request.app_user
 
     # 🧑‍🏫 Check if assigned teacher deleted
     teacher_removed = False
@@ -135,30 +156,23 @@ def student_dashboard(request):
         teacher_name = student.assigned_teacher.full_name
 
     # -------------------- DEADLINE CALCULATION --------------------
-    latest_deadline = SubmissionDeadline.objects.order_by('-created_at').first()
-    deadline_info = None
-    deadline_passed = False
-
-    if latest_deadline and latest_deadline.deadline:
-        today = timezone.now().date()
-        days_left = (latest_deadline.deadline - today).days
-
-        if days_left > 1:
-            deadline_info = {'text': f"🕒 {days_left} days left to submit your project.", 'color': '#2563eb'}
-        elif days_left == 1:
-            deadline_info = {'text': "⚠️ Tomorrow is the last day to submit!", 'color': '#f59e0b'}
-        elif days_left == 0:
-            deadline_info = {'text': "🚨 Today is the final submission day!", 'color': '#eab308'}
-        else:
-            deadline_info = {'text': "❌ Submission deadline has passed.", 'color': '#dc2626'}
-            deadline_passed = True
+    deadline_info, deadline_passed = submission_info(current_deadline())
 
     # -------------------------------------------------------------
-    submitted_projects = Projectsubmission.objects.filter(student=student)
-    existing_project = Projectsubmission.objects.filter(
-        student=student,
-        status__in=['Pending', 'Approved']
-    ).first()
+    # Only read by the {% cache %} block of the template when it misses
+    submitted_projects = read_from_primary(lambda: list(
+        Projectsubmission.objects.filter(student=student)
+        .select_related('reviewed_by', 'similar_to')
+        .defer('embedding', 'similar_to__embedding')
+    ))
+    existing_project = has_live_submission(student)
+    fragments = {
+        'fragment_timeout': fragment_timeout(),
+        'fragment_version': fragment_version(
+            student_scope(student.id),
+            student.assigned_teacher_id and teacher_scope(student.assigned_teacher_id),
+        ),
+    }
 
     form = ProjectSubmissionForm()
 
@@ -175,6 +189,7 @@ def student_dashboard(request):
             "teacher_removed": teacher_removed,
             "teacher_name": teacher_name,
             "duplicate_warning": request.session.get("duplicate_warning"),
+            **fragments,
         })
 
     # -------------------------------------------------------------
@@ -212,42 +227,28 @@ def student_dashboard(request):
             description = form.cleaned_data['description']
             technology = form.cleaned_data['technology_used']
 
-            student_text = f"{title} {description} {technology}".lower()
-
-            # ---- Semantic AI similarity ----
-            model = get_sbert_model()
-            student_emb = model.encode(student_text, convert_to_tensor=True)
-            approved_projects = Projectsubmission.objects.filter(status='Approved')
-
-            duplicate_found = False
-            best_similarity = 0
-            best_project = None
-
-            for proj in approved_projects:
-                existing_text = f"{proj.title} {proj.description} {proj.technology_used}".lower()
-                model = get_sbert_model()
-                existing_emb = model.encode(existing_text, convert_to_tensor=True)
-
-
-                semantic_score = float(util.cos_sim(student_emb, existing_emb)[0][0]) * 100
-                fuzz_score = fuzz.WRatio(student_text, existing_text)
-
-                final_similarity = round((semantic_score * 0.6) + (fuzz_score * 0.4))
+            # ---- Background check: save now, the similarity worker decides ----
+            if async_checks_enabled():
+                project = form.save(commit=False)
+                project.student = student
+                project.status = "Pending"
+                project.created_at = timezone.now()
+                with transaction.atomic():
+                    project.save()
+                    enqueue_similarity_check(project)
+
+                messages.success(request, "✔ Project submitted! Checking it against approved projects...")
+                return redirect("student_dashboard")
 
-                if final_similarity > best_similarity:
-                    best_similarity = final_similarity
-                    best_project = proj
+            student_text = project_text(title, description, technology)
 
-                if final_similarity >= 60:
-                    duplicate_found = True
-                    break
+            # ---- Semantic AI + fuzzy similarity (stored embeddings, one encode) ----
+            student_emb = encode([student_text])[0]
+            best = find_approved_duplicate(student_text, student_emb)
 
-            if duplicate_found:
-                request.session['duplicate_warning'] = (
-                    f"⚠️ Duplicate detected! Similarity Score: {best_similarity}%. "
-                    f"Similar to: '{best_project.title}' approved for {best_project.student.full_name} "
-                    f"(Guide: {best_project.reviewed_by.full_name if best_project.reviewed_by else 'N/A'})."
-                )
+            if best:
+                best_project, best_match = best
+                request.session['duplicate_warning'] = duplicate_warning(best_project, best_match)
                 messages.warning(request, "⚠️ This project is too similar to an already approved one.")
                 return redirect("student_dashboard")
 
@@ -256,7 +257,8 @@ def student_dashboard(request):
             project.student = student
             project.status = "Pending"
             project.created_at = timezone.now()
-            project.save()
+            set_embedding(project, student_emb, student_text)
+            save_with_candidates(project)
 
             messages.success(request, "✔ Project submitted successfully! Awaiting teacher approval.")
             return redirect("student_dashboard")
@@ -270,16 +272,17 @@ def student_dashboard(request):
         'teacher_removed': teacher_removed,
         'teacher_name': teacher_name,
         'duplicate_warning': request.session.get('duplicate_warning'),
+        **fragments,
     })
 
 
 
 # -------------------- EDIT / DELETE PROJECT --------------------
+@role_required('student')
 def edit_project(request, project_id):
     project = get_object_or_404(Projectsubmission, id=project_id)
-    student_id = request.session.get('user_id')
 
-    if project.student.id != student_id:
+    if project.student_id != request.app_user.id:
         messages.error(request, "Unauthorized access.")
         return redirect('student_dashboard')
 
@@ -290,7 +293,11 @@ def edit_project(request, project_id):
     if request.method == 'POST':
         form = ProjectSubmissionForm(request.POST, instance=project)
         if form.is_valid():
-            form.save()
+            if async_checks_enabled():
+                project = form.save()
+                enqueue_similarity_check(project)
+            else:
+                project = save_with_candidates(project, save=form.save)
             messages.success(request, "✅ Project updated successfully!")
             return redirect('student_dashboard')
     else:
@@ -299,11 +306,11 @@ def edit_project(request, project_id):
     return render(request, 'edit_project.html', {'form': form, 'project': project})
 
 
+@role_required('student')
 def delete_project(request, project_id):
     project = get_object_or_404(Projectsubmission, id=project_id)
-    student_id = request.session.get('user_id')
 
-    if project.student.id != student_id:
+    if project.student_id != request.app_user.id:
         messages.error(request, "Unauthorized access.")
         return redirect('student_dashboard')
 
@@ -312,7 +319,8 @@ def delete_project(request, project_id):
             messages.warning(request, "You cannot delete an approved project.")
             return redirect('student_dashboard')
 
-        project.delete()
+        with transaction.atomic():
+            project.delete()
         messages.success(request, "🗑️ Project deleted successfully!")
         return redirect('student_dashboard')
 
@@ -321,32 +329,20 @@ def delete_project(request, project_id):
 
 
 # -------------------- SUBMIT PROJECT --------------------
+@role_required('student')
 def submit_project(request):
-    student_id = request.session.get('user_id')
-    role = request.session.get('role')
-
-    if not student_id or role != 'student':
-        messages.error(request, "Unauthorized access.")
-        return redirect('login_page')
-
-    student = get_object_or_404(UserRegistration, id=student_id)
-    latest_deadline = SubmissionDeadline.objects.order_by('-created_at').first()
-
-    if latest_deadline and timezone.now().date() > latest_deadline.deadline:
+    student = request.app_user
+    if submission_closed(current_deadline()):
         return render(request, 'submit_blocked.html', {
             'student': student,
             'message': "⏰ The project submission deadline has passed. You cannot submit a new project.",
             'color': "#ef4444"
         })
 
-    existing_project = Projectsubmission.objects.filter(
-        student=student,
-        status__in=['Pending', 'Approved']
-    ).first()
-
-    if existing_project:
-        msg = "✅ Your project has already been approved." if existing_project.status == "Approved" else "⚠️ You already have a project under review. Please wait for the teacher's decision."
-        color = "#16a34a" if existing_project.status == "Approved" else "#f59e0b"
+    if has_live_submission(student):
+        approved = student.current_submission_status == "Approved"
+        msg = "✅ Your project has already been approved." if approved else "⚠️ You already have a project under review. Please wait for the teacher's decision."
+        color = "#16a34a" if approved else "#f59e0b"
         return render(request, 'submit_blocked.html', {'student': student, 'message': msg, 'color': color})
 
     if request.method == 'POST':
@@ -358,24 +354,28 @@ def submit_project(request):
             project.created_at = timezone.now()
 
        
-            # 🚨 DUPLICATE CHECK (RapidFuzz)
-            approved_projects = Projectsubmission.objects.filter(status='Approved')
-
-            for approved in approved_projects:
-                title_similarity = fuzz.token_sort_ratio(project.title.lower(), approved.title.lower())
-                desc_similarity = fuzz.token_sort_ratio(project.description.lower(), approved.description.lower())
-
-                if title_similarity > 75 or desc_similarity > 75:
-                    messages.error(
-                        request,
-                        f"⚠️ This project is too similar to '{approved.title}', "
-                        f"which was already approved for {approved.student.full_name}. "
-                        f"Please modify your project idea."
-                    )
-                    return redirect('student_dashboard')
+            # 🚨 DUPLICATE CHECK (RapidFuzz, title and description in one pass each)
+            approved_projects = list(
+                Projectsubmission.objects.filter(status='Approved').select_related('student')
+            )
+            hit = first_fuzzy_match(
+                (project.title.lower(), project.description.lower()),
+                [(a.title.lower(), a.description.lower()) for a in approved_projects],
+            )
+
+            if hit is not None:
+                approved = approved_projects[hit]
+                messages.error(
+                    request,
+                    f"⚠️ This project is too similar to '{approved.title}', "
+                    f"which was already approved for {approved.student.full_name}. "
+                    f"Please modify your project idea."
+                )
+                return redirect('student_dashboard')
 
             # ✅ If no duplicates found, save project
-            project.save()
+            with transaction.atomic():
+                project.save()
             messages.success(request, "✅ Project idea submitted successfully! Awaiting teacher review.")
             return redirect('student_dashboard')
         else:
@@ -386,177 +386,261 @@ def submit_project(request):
     return render(request, 'submit_project.html', {'form': form})
 
 # -------------------- CHECK PROJECT STATUS (AJAX) --------------------
+def project_status_etag(request):
+    """ETag of check_project_status: the student's submission_version (one indexed lookup)."""
+    user_id = request.session.get('user_id')
+    if not user_id:
+        return None
+    version = submission_version(user_id)
+    return None if version is None else f"{user_id}.{version}"
+
+
+# Idle dashboard tabs poll this; an unchanged status answers 304 without
+# reading the submission. no-cache: always revalidate, never serve stale.
+@replica_reads
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=project_status_etag)
 def check_project_status(request):
     user_id = request.session.get('user_id')
     if not user_id:
         return JsonResponse({'status': 'None'})
 
-    student = get_object_or_404(UserRegistration, id=user_id)
-    project = Projectsubmission.objects.filter(student=student).order_by('-created_at').first()
-    return JsonResponse({'status': project.status if project else 'None'})
+    student = get_object_or_404(status_students(), id=user_id)
+    return JsonResponse(project_status_data(student))
 
 
-# -------------------- TEACHER DASHBOARD --------------------
+def status_students():
+    """Users with their current submission joined in: status is one primary-key lookup."""
+    return UserRegistration.objects.select_related('current_submission__similar_to').defer(
+        'current_submission__embedding', 'current_submission__similar_to__embedding',
+    )
 
 
-def teacher_dashboard(request):
-    if not request.session.get('user_id'):
-        return redirect('login_page')
+def project_status_data(student):
+    project = student.current_submission
+    if not project:
+        return {'status': 'None'}
 
-    # ❌ Block non-teachers
-    if request.session.get("role") != "teacher":
-        return redirect("login_page")
+    return {
+        'status': project.status,
+        'similarity_status': project.similarity_status,
+        'duplicate': project.similarity_status == 'duplicate',
+        'similarity_score': project.similarity_score,
+        'similar_to': project.similar_to.title if project.similar_to else None,
+    }
 
 
-    teacher = get_object_or_404(UserRegistration, id=request.session['user_id'])
-    assigned_students = UserRegistration.objects.filter(
-        role='student',
-        assigned_teacher=teacher,
-        is_verified=True
-    )
+# -------------------- PROJECT STATUS STREAM (SSE) --------------------
+# Under ASGI each dashboard tab holds one EventSource here instead of polling
+# check_project_status. submissions.py publishes every status change of the
+# student (in this process); the periodic re-check catches changes made by
+# other workers and doubles as a keep-alive.
+STREAM_RECHECK_SECONDS = 15
+STREAM_MAX_SECONDS = 600  # then EventSource reconnects on its own
+STREAM_RETRY_MS = 3000
 
-    submitted_projects = Projectsubmission.objects.filter(
-        student__in=assigned_students
-    ).order_by('-id')
 
-    # ---------------- DEADLINE INFO ----------------
-    latest_deadline = SubmissionDeadline.objects.order_by('-created_at').first()
-    student_deadline_info = None
-    review_info = None
-    review_passed = False
-
-    today = date.today()
-
-    if latest_deadline and latest_deadline.deadline:
-        days_left_student = (latest_deadline.deadline - today).days
-
-        if days_left_student > 1:
-            student_deadline_info = {'text': f"🕒 Students have {days_left_student} days left.", 'color': '#2563eb'}
-        elif days_left_student == 1:
-            student_deadline_info = {'text': "⚠️ Students' last day is tomorrow!", 'color': '#f59e0b'}
-        elif days_left_student == 0:
-            student_deadline_info = {'text': "🚨 Today is final submission day!", 'color': '#eab308'}
-        else:
-            student_deadline_info = {'text': "❌ Student submission deadline passed.", 'color': '#dc2626'}
+def sse_event(data, event, event_id):
+    return f"event: {event}\nid: {event_id}\ndata: {json.dumps(data)}\n\n"
 
-    if latest_deadline and latest_deadline.teacher_deadline:
-        review_days_left = (latest_deadline.teacher_deadline - today).days
 
-        if review_days_left > 1:
-            review_info = {'text': f"✅ {review_days_left} days left to review.", 'color': '#16a34a'}
-        elif review_days_left == 1:
-            review_info = {'text': "⚠️ Review last day is tomorrow!", 'color': '#f59e0b'}
-        elif review_days_left == 0:
-            review_info = {'text': "🚨 Today is final review day!", 'color': '#eab308'}
-        else:
-            review_info = {'text': "❌ Review deadline passed.", 'color': '#dc2626'}
-            review_passed = True
+def read_stream_student(user_id):
+    try:
+        return status_students().filter(id=user_id).first()
+    finally:
+        # a stream is mostly idle: don't hold a DB connection per open tab
+        if not connection.in_atomic_block:
+            connection.close()
 
-    # ---------------- DUPLICATE CHECK ----------------
-    duplicate_warnings = {}
-    
-    pending_projects = submitted_projects.filter(status="Pending")
-    all_other_projects = Projectsubmission.objects.exclude(id__isnull=True)
 
-    for project in pending_projects:
-        warnings = []
-        text1 = f"{project.title} {project.description} {project.technology_used}".lower()
-        model = get_sbert_model()
-        emb1 = model.encode(text1, convert_to_tensor=True)
+async def project_status_stream(request):
+    if not isinstance(request, ASGIRequest):
+        # A WSGI worker would be pinned to the tab; 204 tells EventSource to
+        # stop, and the page falls back to polling check_project_status.
+        return HttpResponse(status=204)
 
+    # role_required is sync-only: the same check, before the stream opens
+    user_id = await request.session.aget('user_id')
+    user = await sync_to_async(load_app_user)(user_id) if user_id else None
+    if user is None or user.role != 'student':
+        return HttpResponseForbidden()
 
-        for other in all_other_projects:
-            if other.id == project.id:
-                continue
+    response = StreamingHttpResponse(
+        project_status_events(user_id, request.headers.get('Last-Event-ID')),
+        content_type='text/event-stream',
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # nginx: flush every event
+    return response
+
+
+async def project_status_events(user_id, last_event_id=None):
+    channel = student_channel(user_id)
+    subscription = subscribe(channel)
+    loop, queue = subscription
+    closes_at = loop.time() + STREAM_MAX_SECONDS
+    try:
+        yield f"retry: {STREAM_RETRY_MS}\n\n"
+        while True:
+            student = await sync_to_async(read_stream_student)(user_id)
+            if student is None:
+                return
+            if str(student.submission_version) != last_event_id:
+                last_event_id = str(student.submission_version)
+                yield sse_event(project_status_data(student), 'status', last_event_id)
+            else:
+                yield ": keep-alive\n\n"
+
+            remaining = closes_at - loop.time()
+            if remaining <= 0:
+                return
+            try:
+                await asyncio.wait_for(queue.get(), min(STREAM_RECHECK_SECONDS, remaining))
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        unsubscribe(channel, subscription)
 
-            text2 = f"{other.title} {other.description} {other.technology_used}".lower()
-            model = get_sbert_model()
-            emb2 = model.encode(text2, convert_to_tensor=True)
 
-            semantic = float(util.cos_sim(emb1, emb2)[0][0]) * 100
-            token = fuzz.WRatio(text1, text2)
-            score = round((semantic * 0.6) + (token * 0.4))
+# -------------------- TEACHER DASHBOARD --------------------
 
-            if score >= 60:
-                warnings.append({
-                    "other_student": other.student.full_name,
-                    "other_title": other.title,
-                    "similarity": score,
-                    "guide": other.student.assigned_teacher.full_name if other.student.assigned_teacher else "N/A",
-                    "status": other.status
-                })
 
-        if warnings:
-            duplicate_warnings[project.id] = warnings
+@replica_reads
+@role_required('teacher', message=None)
+def teacher_dashboard(request):
+    teacher = request.app_user
+
+    # ---------------- DEADLINE INFO ----------------
+    # (changes with the date: never inside a cached block)
+    latest_deadline = current_deadline()
+    student_info = student_deadline_info(latest_deadline)
+    review_countdown, review_passed = review_info(latest_deadline)
 
     return render(request, 'teacher_dashboard.html', {
         'full_name': teacher.full_name,
         'role': 'Teacher',
+        # evaluated by the template's {% cache %} blocks only when they miss
+        'dashboard': read_from_primary(lambda: teacher_dashboard_data(request, teacher)),
+        'student_deadline_info': student_info,
+        'review_info': review_countdown,
+        'review_passed': review_passed,
+        'search': request.GET.get(SEARCH_PARAM, '').strip(),
+        'fragment_timeout': fragment_timeout(),
+        'fragment_version': fragment_version(teacher_scope(teacher.id)),
+        'fragment_query': request.GET.urlencode(),
+    })
+
+
+def teacher_dashboard_data(request, teacher):
+    """
+    Students, the project page and its duplicate warnings in a fixed number
+    of queries however many students the teacher has: students, their
+    projects (with the student joined in) and the duplicate candidates
+    (with the other side joined in).
+    """
+    assigned_students = list(UserRegistration.objects.filter(
+        role='student',
+        assigned_teacher=teacher,
+        is_verified=True
+    ))
+
+    submitted_projects = teacher_project_page(request, teacher)
+
+    # ---------------- DUPLICATE CHECK ----------------
+    # Read-only: candidates are computed on submit/edit, and the similarity
+    # worker's sweep scores rows that were never scored there.
+    pending_projects = [p for p in submitted_projects if p.status == "Pending"]
+
+    duplicate_warnings = {}
+    candidates = DuplicateCandidate.objects.filter(
+        project__in=pending_projects,
+        score__gte=DUPLICATE_THRESHOLD,
+    ).select_related('other_project__student__assigned_teacher').defer('other_project__embedding')
+
+    for candidate in candidates:
+        other = candidate.other_project
+        duplicate_warnings.setdefault(candidate.project_id, []).append({
+            "other_student": other.student.full_name,
+            "other_title": other.title,
+            "similarity": candidate.score,
+            "guide": other.student.assigned_teacher.full_name if other.student.assigned_teacher else "N/A",
+            "status": other.status
+        })
+
+    return {
         'assigned_students': assigned_students,
         'submitted_projects': submitted_projects,
-        'student_deadline_info': student_deadline_info,
-        'review_info': review_info,
-        'review_passed': review_passed,
         'duplicate_warnings': duplicate_warnings,
-    })
+    }
+
+
+def teacher_project_page(request, teacher):
+    """Newest-first keyset page of the projects of ``teacher``'s students."""
+    return keyset_page(
+        request,
+        Projectsubmission.objects.filter(
+            student__role='student',
+            student__assigned_teacher=teacher,
+            student__is_verified=True,
+        ).select_related('student'),
+        param='projects_after',
+        descending=True,
+        search_fields=('title', 'student__full_name'),
+    )
+
+
+@replica_reads
+@role_required('teacher', forbidden=True)
+def teacher_project_rows(request):
+    """Next page of the teacher's project cards as an HTML fragment (for "Load more")."""
+    page = teacher_project_page(request, request.app_user)
+    return keyset_fragment(request, 'partials/teacher_project_rows.html', {'page': page}, page)
 
 
 # -------------------- APPROVE PROJECT --------------------
 @require_POST
+@role_required('teacher')
 def approve_project(request, project_id):
-    teacher_id = request.session.get('user_id')
-    role = request.session.get('role')
+    teacher = request.app_user
 
-    if not teacher_id or role != 'teacher':
-        messages.error(request, "Unauthorized access.")
-        return redirect('login_page')
-    
-     # 🔒 Enforce teacher deadline
-    latest_deadline = SubmissionDeadline.objects.order_by('-created_at').first()
-    if latest_deadline and latest_deadline.teacher_deadline and \
-    date.today() > latest_deadline.teacher_deadline:
+    # 🔒 Enforce teacher deadline
+    if review_closed(current_deadline()):
         messages.warning(request, "⏰ Review deadline has passed. You can no longer approve projects.")
         return redirect('teacher_dashboard')
 
-    teacher = get_object_or_404(UserRegistration, id=teacher_id)
-    project = get_object_or_404(Projectsubmission, id=project_id)
+    project = get_object_or_404(Projectsubmission.objects.select_related('student'), id=project_id)
 
-    if project.student.assigned_teacher_id != teacher_id:
+    if project.student.assigned_teacher_id != teacher.id:
         messages.error(request, "You are not assigned as the guide for this student.")
         return redirect('teacher_dashboard')
 
     project.status = "Approved"
     project.reviewed_by = teacher
     project.reviewed_at = timezone.now()
-    project.save()
-
-    Projectsubmission.objects.filter(student=project.student, status="Pending").exclude(id=project.id).update(status="Rejected")
+    with transaction.atomic():
+        project.save()
+        Projectsubmission.objects.filter(student=project.student, status="Pending").exclude(id=project.id).update(status="Rejected")
+        refresh_current_submission(project.student_id)
+        transaction.on_commit(partial(sync_approved_project, project))
 
     messages.success(request, f"✅ Project '{project.title}' has been approved successfully!")
     return redirect('teacher_dashboard')
 
 # ------------------ Reject Project-----------------------------
 @require_POST
+@role_required('teacher')
 def reject_project(request, project_id):
-    teacher_id = request.session.get('user_id')
-    role = request.session.get('role')
-
-    if not teacher_id or role != 'teacher':
-        messages.error(request, "Unauthorized access.")
-        return redirect('login_page')
+    teacher = request.app_user
 
     # 🔒 Enforce teacher deadline
-    latest_deadline = SubmissionDeadline.objects.order_by('-created_at').first()
-    if latest_deadline and latest_deadline.teacher_deadline and \
-    date.today() > latest_deadline.teacher_deadline:
+    if review_closed(current_deadline()):
         messages.warning(request, "⏰ Review deadline has passed. You can no longer reject projects.")
         return redirect('teacher_dashboard')
 
-    teacher = get_object_or_404(UserRegistration, id=teacher_id)
-    project = get_object_or_404(Projectsubmission, id=project_id)
+    project = get_object_or_404(Projectsubmission.objects.select_related('student'), id=project_id)
 
     # ✅ Ensure the teacher is assigned to this student
-    if project.student.assigned_teacher_id != teacher_id:
+    if project.student.assigned_teacher_id != teacher.id:
         messages.error(request, "You are not assigned as the guide for this student.")
         return redirect('teacher_dashboard')
 
@@ -564,7 +648,9 @@ def reject_project(request, project_id):
     project.status = "Rejected"
     project.reviewed_by = teacher
     project.reviewed_at = timezone.now()
-    project.save()
+    with transaction.atomic():
+        project.save()
+        transaction.on_commit(partial(sync_approved_project, project))
 
     messages.warning(request, f"❌ Project '{project.title}' has been rejected successfully.")
     return redirect('teacher_dashboard')
@@ -572,15 +658,15 @@ def reject_project(request, project_id):
 
 # -------------------- FEEDBACK SUBMISSION --------------------
 @require_POST
+@role_required('teacher')
 def handle_project_feedback(request):
     project_id = request.POST.get('project_id')
     action = request.POST.get('action')
     feedback = request.POST.get('feedback', '').strip()
 
-    project = get_object_or_404(Projectsubmission, id=project_id)
-    teacher_id = request.session.get('user_id')
+    project = get_object_or_404(Projectsubmission.objects.select_related('student'), id=project_id)
 
-    if project.student.assigned_teacher_id != teacher_id:
+    if project.student.assigned_teacher_id != request.app_user.id:
         messages.error(request, "Unauthorized access.")
         return redirect('teacher_dashboard')
 
@@ -592,35 +678,42 @@ def handle_project_feedback(request):
         messages.warning(request, f"❌ Project '{project.title}' rejected.")
 
     project.feedback = feedback
-    project.save()
+    with transaction.atomic():
+        project.save()
+        transaction.on_commit(partial(sync_approved_project, project))
     return redirect('teacher_dashboard')
 
 
 # -------------------- ADMIN DASHBOARD --------------------
+@replica_reads
+@role_required('admin', message="You must be logged in as admin to view this page.")
 def admin_dashboard(request):
-    user_id = request.session.get('user_id')
-    role = request.session.get('role')
 
-    if not user_id or role != 'admin':
-        messages.error(request, "You must be logged in as admin to view this page.")
-        return redirect('login_page')
-
-    pending_teachers = UserRegistration.objects.filter(
-        role='teacher', is_verified=False, is_deleted=False
-    )
-    pending_students = UserRegistration.objects.filter(
-        role='student', is_verified=False, is_deleted=False
+    # One aggregate for every section size instead of a COUNT (or full scan) each
+    counts = UserRegistration.objects.aggregate(
+        pending_teachers=Count('id', filter=Q(role='teacher', is_verified=False, is_deleted=False)),
+        pending_students=Count('id', filter=Q(role='student', is_verified=False, is_deleted=False)),
+        verified_teachers=Count('id', filter=Q(role='teacher', is_verified=True, is_deleted=False)),
+        verified_students=Count('id', filter=Q(role='student', is_verified=True, is_deleted=False)),
+        deleted_users=Count('id', filter=Q(is_deleted=True)),
     )
-    verified_teachers = UserRegistration.objects.filter(
-        role='teacher', is_verified=True, is_deleted=False
-    )
-    verified_students = UserRegistration.objects.filter(
-        role='student', is_verified=True, is_deleted=False
-    )
-    deleted_users = UserRegistration.objects.filter(is_deleted=True)
+
+    # Teachers are few: load them once and reuse the list for every guide dropdown
+    teachers = list(UserRegistration.objects.filter(role='teacher', is_deleted=False).order_by('full_name'))
+    pending_teachers = [t for t in teachers if not t.is_verified]
+    verified_teachers = [t for t in teachers if t.is_verified]
+
+    # Student and deleted-user sections grow with the institute: one keyset page each
+    pending_students = admin_section_page(request, 'pending_students')
+    verified_students = admin_section_page(request, 'verified_students')
+    deleted_users = admin_section_page(request, 'deleted_users')
 
  # ✅ Fetch approved projects with teacher and student details
-    approved_projects = Projectsubmission.objects.filter(status="Approved").select_related('student', 'reviewed_by')
+    approved_projects = (
+        Projectsubmission.objects.filter(status="Approved")
+        .select_related('student', 'reviewed_by')
+        .defer('embedding')
+    )
 
     # Group projects by teacher
     teacher_project_map = {}
@@ -631,37 +724,95 @@ def admin_dashboard(request):
         teacher_project_map[teacher].append(project)
 
     return render(request, 'admin_dashboard.html', {
+        'counts': counts,
         'pending_teachers': pending_teachers,
         'pending_students': pending_students,
         'verified_teachers': verified_teachers,
         'verified_students': verified_students,
         'deleted_users': deleted_users,
         'teacher_project_map': teacher_project_map,
+        'search': verified_students.search,
     })
 
 
-# -------------------- ASSIGN / REASSIGN TEACHER --------------------
-def assign_teacher(request, student_id):
-    user_id = request.session.get('user_id')
-    role = request.session.get('role')
+# Paginated user lists of the admin pages: filter, newest first?, row template
+ADMIN_USER_SECTIONS = {
+    'pending_students': (
+        Q(role='student', is_verified=False, is_deleted=False), False, 'partials/pending_student_rows.html',
+    ),
+    'verified_students': (
+        Q(role='student', is_verified=True, is_deleted=False), False, 'partials/verified_student_rows.html',
+    ),
+    'deleted_users': (Q(is_deleted=True), True, 'partials/deleted_user_rows.html'),
+    'approved_teachers': (
+        Q(role='teacher', is_verified=True, is_deleted=False), False, 'partials/manage_user_rows.html',
+    ),
+    'approved_students': (
+        Q(role='student', is_verified=True, is_deleted=False), False, 'partials/manage_user_rows.html',
+    ),
+}
+USER_SEARCH_FIELDS = ('full_name', 'email')
+
+
+def admin_section_page(request, section):
+    condition, newest_first, _ = ADMIN_USER_SECTIONS[section]
+    return keyset_page(
+        request,
+        UserRegistration.objects.filter(condition).select_related('assigned_teacher'),
+        param=f'{section}_after',
+        descending=newest_first,
+        search_fields=USER_SEARCH_FIELDS,
+    )
 
-    if not user_id or role != 'admin':
-        messages.error(request, "Unauthorized access.")
-        return redirect('login_page')
 
+@replica_reads
+@role_required('admin', forbidden=True)
+def admin_user_rows(request, section):
+    """Next page of one admin user list as an HTML fragment (for "Load more")."""
+    if section not in ADMIN_USER_SECTIONS:
+        raise Http404("Unknown section")
+
+    page = admin_section_page(request, section)
+    context = {'page': page}
+    if section == 'verified_students':
+        context['verified_teachers'] = UserRegistration.objects.filter(
+            role='teacher', is_verified=True, is_deleted=False
+        ).order_by('full_name')
+    return keyset_fragment(request, ADMIN_USER_SECTIONS[section][2], context, page)
+
+
+def keyset_fragment(request, template, context, page):
+    response = render(request, template, context)
+    response['X-Next-Cursor'] = page.next_cursor if page.has_next else ''
+    return response
+
+
+# -------------------- ASSIGN / REASSIGN TEACHER --------------------
+@role_required('admin')
+def assign_teacher(request, student_id):
     student = get_object_or_404(UserRegistration, id=student_id, role='student',is_deleted=False)
 
     if request.method == "POST":
         teacher_id = request.POST.get('teacher_id')
+        # the admin's choice wins over restoring a deleted previous guide later;
+        # previous_teacher / unassigned_at are MAINTAINED_FIELDS, which save() skips
+        forget_previous = UserRegistration.objects.filter(id=student.id)
         if not teacher_id:
             student.assigned_teacher = None
-            student.save()
+            with transaction.atomic():
+                student.save()
+                forget_previous.update(previous_teacher=None, unassigned_at=None)
             messages.success(request, f"Guide removed from {student.full_name}")
             return redirect('admin_dashboard')
 
-        teacher = get_object_or_404(UserRegistration, id=teacher_id, role='teacher', is_deleted=False)
-        student.assigned_teacher = teacher
-        student.save()
+        with transaction.atomic():
+            # locked like soft_delete_users locks it: never assign a teacher being deleted
+            teacher = get_object_or_404(
+                UserRegistration.objects.select_for_update(), id=teacher_id, role='teacher', is_deleted=False,
+            )
+            student.assigned_teacher = teacher
+            student.save()
+            forget_previous.update(previous_teacher=None, unassigned_at=None)
         messages.success(request, f"Guide assigned: {teacher.full_name} → {student.full_name}")
         return redirect('admin_dashboard')
 
@@ -670,31 +821,23 @@ def assign_teacher(request, student_id):
 
 
 # -------------------- MANAGE USERS --------------------
+@replica_reads
+@role_required('admin', message="You are not authorized to view this page.")
 def manage_users(request):
-    if request.session.get('role') != 'admin':
-        messages.error(request, "You are not authorized to view this page.")
-        return redirect('login_page')
-
-    approved_students = UserRegistration.objects.filter(role='student', is_verified=True, is_deleted=False)
-    approved_teachers = UserRegistration.objects.filter(role='teacher', is_verified=True, is_deleted=False)
+    approved_students = admin_section_page(request, 'approved_students')
+    approved_teachers = admin_section_page(request, 'approved_teachers')
 
-    return render(request, 'admin_manage_users.html', {
+    return render(request, 'admin_manage_user.html', {
         'approved_students': approved_students,
         'approved_teachers': approved_teachers,
         'verified_teachers': approved_teachers,
-        'verified_students': approved_students
+        'verified_students': approved_students,
+        'search': approved_students.search,
     })
 
 
+@role_required('admin', login_message="You must be logged in first.", redirect_to='index')
 def delete_user(request, user_id):
-    if not request.session.get('user_id'):
-        messages.error(request, "You must be logged in first.")
-        return redirect('login_page')
-
-    if request.session.get('role') != 'admin':
-        messages.error(request, "Unauthorized access.")
-        return redirect('index')
-
     user = get_object_or_404(UserRegistration, id=user_id)
 
     # 🚫 If already deleted
@@ -702,45 +845,27 @@ def delete_user(request, user_id):
         messages.info(request, f"{user.full_name} is already deleted.")
         return redirect('admin_dashboard')
 
-    # 🧑‍🏫 If the deleted user is a teacher, unassign them from all students
+    # 🗑️ Soft delete the user; a teacher's students are unassigned in the same transaction
+    _, unassigned = soft_delete_users([user.id])
     if user.role == 'teacher':
-        assigned_students = UserRegistration.objects.filter(assigned_teacher=user)
-        for student in assigned_students:
-            student.assigned_teacher = None
-            student.save()
-        messages.info(request, f"🧑‍🏫 All students previously guided by {user.full_name} have been unassigned.")
-
-    # 🗑️ Soft delete the user
-    user.is_deleted = True
-    user.deleted_at = timezone.now()
-    user.save()
+        messages.info(request, f"🧑‍🏫 {unassigned} student(s) previously guided by {user.full_name} have been unassigned.")
 
     messages.success(request, f"🗑️ {user.full_name} has been soft-deleted successfully.")
     return redirect('admin_dashboard')
+@role_required('admin', login_message="You must be logged in first.", redirect_to='index')
 def restore_user(request, user_id):
-    if not request.session.get('user_id'):
-        messages.error(request, "You must be logged in first.")
-        return redirect('login_page')
-
-    if request.session.get('role') != 'admin':
-        messages.error(request, "Unauthorized access.")
-        return redirect('index')
-
     user = get_object_or_404(UserRegistration, id=user_id)
-    user.is_deleted = False
-    user.save()
+    # ♻️ A teacher gets back the students they guided when deleted
+    restore_users([user.id])
 
     messages.success(request, f"♻️ {user.full_name} has been restored successfully.")
     return redirect('admin_dashboard')
 
 
 # -------------------- SET SUBMISSION DEADLINE --------------------
+@role_required('admin')
 def set_submission_deadline(request):
-    if request.session.get('role') != 'admin':
-        messages.error(request, "Unauthorized access.")
-        return redirect('login_page')
-
-    latest_deadline = SubmissionDeadline.objects.order_by('-created_at').first()
+    latest_deadline = latest_deadline_from_db()
 
     if request.method == 'POST':
         form = SubmissionDeadlineForm(request.POST, instance=latest_deadline)
@@ -834,6 +959,7 @@ def logout_page(request):
 
 
 # -------------------- APPROVE / REJECT USER --------------------
+@role_required('admin')
 def approve_user(request, user_id):
     user = get_object_or_404(UserRegistration, id=user_id)
     user.is_verified = True
@@ -842,6 +968,7 @@ def approve_user(request, user_id):
     return redirect('admin_dashboard')
 
 
+@role_required('admin')
 def reject_user(request, user_id):
     user = get_object_or_404(UserRegistration, id=user_id)
     messages.info(request, f"{user.full_name} has been rejected and removed.")
@@ -849,18 +976,56 @@ def reject_user(request, user_id):
     return redirect('admin_dashboard')
 
 
+# -------------------- BULK USER ACTIONS --------------------
+# reject_users also reports the verified users it left alone
+BULK_USER_ACTIONS = {
+    'approve': (verify_users, messages.success, "✅ {count} user(s) approved.", None),
+    'reject': (
+        reject_users, messages.info, "❌ {count} registration(s) rejected and removed.",
+        "⚠️ {count} verified user(s) skipped: delete them instead of rejecting.",
+    ),
+    'restore': (restore_users, messages.success, "♻️ {count} user(s) restored.", None),
+}
+
+
+@require_POST
+@role_required('admin')
+def bulk_user_action(request):
+    """Approve, reject or restore every ticked user of an admin list in one go."""
+    action = BULK_USER_ACTIONS.get(request.POST.get('action'))
+    user_ids = [int(value) for value in request.POST.getlist('user_ids') if value.isdigit()]
+    if action is None or not user_ids:
+        messages.warning(request, "⚠️ Select at least one user and an action.")
+        return redirect('admin_dashboard')
+
+    apply, notify, message, skipped_message = action
+    count = apply(user_ids)
+    if skipped_message:
+        count, skipped = count
+        if skipped:
+            messages.warning(request, skipped_message.format(count=skipped))
+    notify(request, message.format(count=count))
+    return redirect('admin_dashboard')
+
+
+# -------------------- READINESS (LOAD BALANCER) --------------------
+def readiness(request):
+    if is_warm():
+        return JsonResponse({'status': 'warm'})
+    # servers without gunicorn's post_fork hook warm on the first probe
+    warm_in_background()
+    return JsonResponse({'status': 'cold'}, status=503)
+
+
 # -------------------- ABOUT PAGE --------------------
 def about(request):
     return render(request, 'about.html')
 
 
 # -------------------- PROFILE PAGE --------------------
+@role_required(message=None)
 def profile_page(request):
-    user_id = request.session.get('user_id')
-    if not user_id:
-        return redirect('login_page')
-
-    user = get_object_or_404(UserRegistration, id=user_id)
+    user = request.app_user
     form = EditProfileForm(instance=user)
 
     if request.method == "POST":
@@ -0,0 +1,73 @@
+import logging
+import threading
+import time
+
+from .embeddings import encode
+
+logger = logging.getLogger(__name__)
+
+# Representative texts so the first real batch hits already-initialised kernels
+WARMUP_TEXTS = [
+    "ai based face recognition attendance system python opencv",
+    "online library management portal django postgresql",
+    "iot smart irrigation using soil moisture sensors arduino",
+    "e-commerce recommendation engine collaborative filtering",
+] * 8
+
+_warm = threading.Event()
+_warming = None  # the background warm-up thread of this process, once started
+_warming_lock = threading.Lock()
+
+
+def is_warm():
+    return _warm.is_set()
+
+
+def warm_similarity(build_corpus=True):
+    """
+    Load the SBERT model (or reach the embedding server), run one dummy batch
+    and map the approved corpus, then mark this process warm.
+
+    Returns a dict of step timings in seconds.
+    """
+    from .ann import approved_index
+
+    timings = {}
+    started = time.perf_counter()
+    encode(WARMUP_TEXTS[:1])
+    timings["model"] = time.perf_counter() - started
+
+    step = time.perf_counter()
+    encode(WARMUP_TEXTS)
+    timings["batch"] = time.perf_counter() - step
+
+    if build_corpus:
+        step = time.perf_counter()
+        approved_index()
+        timings["corpus"] = time.perf_counter() - step
+
+    _warm.set()
+    return timings
+
+
+def warm_in_background():
+    """
+    Warm without blocking the caller (gunicorn post_fork, or the first
+    readiness probe under runserver / uvicorn). A warm-up already running in
+    this process is reused; after a failure the next call tries again.
+    """
+    global _warming
+
+    def run():
+        try:
+            timings = warm_similarity()
+            logger.info("Similarity engine warm: %s", timings)
+        except Exception:
+            logger.exception("Similarity warmup failed; worker stays cold")
+
+    with _warming_lock:
+        # a thread started before a fork is not alive in the child
+        if _warming is None or not _warming.is_alive():
+            _warming = threading.Thread(target=run, name="similarity-warmup", daemon=True)
+            _warming.start()
+        return _warming
@@ -49,6 +49,8 @@ MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     "whitenoise.middleware.WhiteNoiseMiddleware",
     'django.contrib.sessions.middleware.SessionMiddleware',
+    'main_app.routers.ReplicaRoutingMiddleware',
+    'main_app.middleware.CurrentUserMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
@@ -80,14 +82,80 @@ WSGI_APPLICATION = 'projectapprovalsystem.wsgi.application'
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
+#
+# DATABASE_URL picks the server (default: the bundled SQLite file).
+# DB_CONN_MAX_AGE keeps a worker's connection open across requests for that
+# many seconds (0, the default, closes it after every request; None never
+# does) and DB_CONN_HEALTH_CHECKS pings a reused connection first, so a
+# restarted server costs one ping instead of an error page. Under
+# GUNICORN_ASGI every request runs in a new thread and cannot reuse them: use
+# DB_POOL there.
+# DB_POOL=True (PostgreSQL only) hands connections out of a psycopg pool of
+# DB_POOL_MIN_SIZE..DB_POOL_MAX_SIZE per worker, waiting at most
+# DB_POOL_TIMEOUT seconds for a free one; Django cannot combine the pool
+# with persistent connections, so it turns DB_CONN_MAX_AGE off.
+# `manage.py bench_connections` compares the three on the configured server.
+
+DB_CONN_MAX_AGE = os.environ.get('DB_CONN_MAX_AGE', '0')
 
 DATABASES = {
     "default": dj_database_url.config(
-        default="sqlite:///db.sqlite3"  
+        default="sqlite:///db.sqlite3",
+        conn_max_age=None if DB_CONN_MAX_AGE == 'None' else int(DB_CONN_MAX_AGE),
+        conn_health_checks=os.environ.get('DB_CONN_HEALTH_CHECKS', 'True') == 'True',
     )
-        
+}
+
+if os.environ.get('DB_POOL', 'False') == 'True' and DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql':
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default'].setdefault('OPTIONS', {})['pool'] = {
+        'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', '2')),
+        'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', '10')),
+        'timeout': float(os.environ.get('DB_POOL_TIMEOUT', '10')),
     }
 
+# Opt-in SQLite profile for running on the bundled file with several workers
+# (SQLITE_TUNED=True). WAL lets readers and one writer work side by side;
+# synchronous=NORMAL only fsyncs at checkpoints (safe under WAL, a power cut
+# may lose the last commits but never corrupts the file); mmap_size and
+# cache_size are bytes / KiB (negative) of page cache; busy_timeout is how
+# long a writer waits for the lock before "database is locked". IMMEDIATE
+# transactions take the write lock up front, so two transactions that both
+# read first can no longer deadlock on upgrading it (which fails at once,
+# whatever the timeout). `manage.py stress_sqlite` compares both profiles.
+SQLITE_TUNING_OPTIONS = {
+    'init_command': ';'.join([
+        'PRAGMA journal_mode=WAL',
+        'PRAGMA synchronous=NORMAL',
+        f"PRAGMA mmap_size={int(os.environ.get('SQLITE_MMAP_SIZE', '268435456'))}",
+        f"PRAGMA cache_size={int(os.environ.get('SQLITE_CACHE_SIZE', '-65536'))}",
+        f"PRAGMA busy_timeout={int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', '15000'))}",
+    ]),
+    'transaction_mode': 'IMMEDIATE',
+}
+
+if os.environ.get('SQLITE_TUNED', 'False') == 'True' and DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3':
+    DATABASES['default'].setdefault('OPTIONS', {}).update(SQLITE_TUNING_OPTIONS)
+
+# Read replicas: DATABASE_REPLICA_URLS (comma-separated) adds replica_1,
+# replica_2, ... Dashboards and status polling read from them (see
+# main_app/routers.py); a client that just wrote reads from the primary for
+# REPLICA_PIN_SECONDS. Locally, a copy of db.sqlite3 works as a stand-in:
+#   cp db.sqlite3 replica.sqlite3 && DATABASE_REPLICA_URLS=sqlite:///replica.sqlite3
+DATABASE_REPLICAS = []
+for number, url in enumerate(filter(None, os.environ.get('DATABASE_REPLICA_URLS', '').split(',')), start=1):
+    alias = f'replica_{number}'
+    DATABASES[alias] = dj_database_url.parse(
+        url.strip(),
+        conn_max_age=DATABASES['default']['CONN_MAX_AGE'],
+        conn_health_checks=DATABASES['default']['CONN_HEALTH_CHECKS'],
+    )
+    DATABASES[alias]['TEST'] = {'MIRROR': 'default'}
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['main_app.routers.PrimaryReplicaRouter']
+REPLICA_PIN_SECONDS = int(os.environ.get('REPLICA_PIN_SECONDS', '5'))
+
 
 
 # Password validation
@@ -137,4 +205,41 @@ MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
 STATIC_URL = '/static/'
 STATICFILES_DIRS = [os.path.join(BASE_DIR, 'static')]
-STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
\ No newline at end of file
+STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
+
+# Similarity engine
+# Approved-project embeddings shared between workers as versioned memmap files
+SIMILARITY_CORPUS_DIR = os.environ.get('SIMILARITY_CORPUS_DIR', os.path.join(BASE_DIR, 'similarity_corpus'))
+SIMILARITY_CORPUS_DTYPE = os.environ.get('SIMILARITY_CORPUS_DTYPE', 'float32')  # or float16
+# Approvals update the corpus as they commit; this often (seconds) it is also
+# checked against the approved rows in the database, for changes made elsewhere
+SIMILARITY_INDEX_RECHECK_SECONDS = int(os.environ.get('SIMILARITY_INDEX_RECHECK_SECONDS', '60'))
+# Optional shared embedding server (manage.py run_embedding_server); workers
+# encode in-process when the socket does not exist
+SIMILARITY_EMBEDDING_SOCKET = os.environ.get('SIMILARITY_EMBEDDING_SOCKET', '')
+# Run the duplicate check of new submissions on the DB-backed job queue
+# (manage.py run_similarity_worker) instead of inside the request
+SIMILARITY_ASYNC = os.environ.get('SIMILARITY_ASYNC') == 'True'
+# Current SubmissionDeadline: seconds kept per process / in the shared cache
+# (a local-memory CACHE_BACKEND is not shared: DEADLINE_LOCAL_TTL applies there)
+DEADLINE_LOCAL_TTL = int(os.environ.get('DEADLINE_LOCAL_TTL', '5'))
+DEADLINE_CACHE_TIMEOUT = int(os.environ.get('DEADLINE_CACHE_TIMEOUT', '300'))
+
+# Cache for the deadline and the dashboard fragments. Local memory suits a
+# single process; with several workers on one host use the file-based
+# backend (CACHE_BACKEND=django.core.cache.backends.filebased.FileBasedCache,
+# CACHE_LOCATION=/var/tmp/projectapprovalsystem-cache) or any shared cache.
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('CACHE_LOCATION', ''),
+    }
+}
+# Seconds a rendered dashboard block is kept; changes replace it sooner
+DASHBOARD_FRAGMENT_TIMEOUT = int(os.environ.get('DASHBOARD_FRAGMENT_TIMEOUT', '600'))
+# ...at most this long with a local-memory CACHE_BACKEND, where a change made
+# in one worker does not replace the other workers' blocks
+DASHBOARD_FRAGMENT_LOCAL_TIMEOUT = int(os.environ.get('DASHBOARD_FRAGMENT_LOCAL_TIMEOUT', '10'))
+# Seconds the signed-in user's row (request.app_user) is kept in the cache;
+# 0 reads it from the database on every request
+APP_USER_CACHE_TTL = int(os.environ.get('APP_USER_CACHE_TTL', '0'))